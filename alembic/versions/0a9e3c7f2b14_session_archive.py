@@ -0,0 +1,78 @@
+"""Archive tables for retention tiering
+
+Revision ID: 0a9e3c7f2b14
+Revises: 1f6b8d3a9c75
+Create Date: 2026-10-18 23:41:07.318264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0a9e3c7f2b14'
+down_revision: Union[str, Sequence[str], None] = '1f6b8d3a9c75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sessions_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('goal', sa.String(), nullable=True),
+    sa.Column('scheduled_duration', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.TIMESTAMP(), nullable=True),
+    sa.Column('end_time', sa.TIMESTAMP(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('pause_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('focus_score', sa.Float(), nullable=True),
+    sa.Column('due_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('focused_seconds', sa.Integer(), nullable=False),
+    sa.Column('paused_seconds', sa.Integer(), nullable=False),
+    sa.Column('state_changed_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('archived_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sessions_archive_owner_created_at_id', 'sessions_archive', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_table('interruptions_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column('pause_time', sa.TIMESTAMP(), nullable=True),
+    sa.Column('resume_time', sa.TIMESTAMP(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_interruptions_archive_session_id_pause_time', 'interruptions_archive', ['session_id', 'pause_time'], unique=False)
+    op.create_index('ix_interruptions_archive_owner_pause_time', 'interruptions_archive', ['owner_id', 'pause_time'], unique=False)
+    op.create_table('session_timeline_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('occurred_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.Column('focused_seconds', sa.Integer(), nullable=False),
+    sa.Column('paused_seconds', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_session_timeline_archive_session_id_id', 'session_timeline_archive', ['session_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_session_timeline_archive_session_id_id', table_name='session_timeline_archive')
+    op.drop_table('session_timeline_archive')
+    op.drop_index('ix_interruptions_archive_owner_pause_time', table_name='interruptions_archive')
+    op.drop_index('ix_interruptions_archive_session_id_pause_time', table_name='interruptions_archive')
+    op.drop_table('interruptions_archive')
+    op.drop_index('ix_sessions_archive_owner_created_at_id', table_name='sessions_archive')
+    op.drop_table('sessions_archive')
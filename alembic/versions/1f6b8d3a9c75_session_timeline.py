@@ -0,0 +1,136 @@
+"""Session timeline and running focus totals
+
+Revision ID: 1f6b8d3a9c75
+Revises: 7d3f9a1c5e20
+Create Date: 2026-10-18 22:14:52.509127
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.timeline import replay
+
+
+revision: str = '1f6b8d3a9c75'
+down_revision: Union[str, Sequence[str], None] = '7d3f9a1c5e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+sessions = sa.table(
+    'sessions',
+    sa.column('id', sa.Integer()), sa.column('owner_id', sa.Integer()), sa.column('status', sa.String()),
+    sa.column('created_at', sa.TIMESTAMP()), sa.column('start_time', sa.TIMESTAMP()), sa.column('end_time', sa.TIMESTAMP()),
+    sa.column('focused_seconds', sa.Integer()), sa.column('paused_seconds', sa.Integer()),
+    sa.column('state_changed_at', sa.TIMESTAMP()),
+)
+interruptions = sa.table(
+    'interruptions',
+    sa.column('session_id', sa.Integer()), sa.column('reason', sa.String()),
+    sa.column('pause_time', sa.TIMESTAMP()), sa.column('resume_time', sa.TIMESTAMP()),
+)
+daily_rollups = sa.table(
+    'daily_rollups',
+    sa.column('owner_id', sa.Integer()), sa.column('day', sa.Date()), sa.column('status', sa.String()),
+    sa.column('focused_seconds', sa.Integer()), sa.column('paused_seconds', sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('focused_seconds', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('sessions', sa.Column('paused_seconds', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('sessions', sa.Column('state_changed_at', sa.TIMESTAMP(), nullable=True))
+    op.add_column('daily_rollups', sa.Column('focused_seconds', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('daily_rollups', sa.Column('paused_seconds', sa.Integer(), server_default='0', nullable=False))
+    timeline = op.create_table('session_timeline',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('occurred_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.Column('focused_seconds', sa.Integer(), nullable=False),
+    sa.Column('paused_seconds', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_session_timeline_session_id_id', 'session_timeline', ['session_id', 'id'], unique=False)
+
+    # Replay each existing session's times and interruptions into its timeline and totals
+    conn = op.get_bind()
+    rollup_totals = defaultdict(lambda: [0, 0])
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            sa.select(
+                sessions.c.id, sessions.c.owner_id, sessions.c.status, sessions.c.created_at,
+                sessions.c.start_time, sessions.c.end_time
+            ).where(sessions.c.id > last_id).order_by(sessions.c.id).limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        paused = defaultdict(list)
+        for row in conn.execute(
+            sa.select(
+                interruptions.c.session_id, interruptions.c.reason, interruptions.c.pause_time, interruptions.c.resume_time
+            ).where(interruptions.c.session_id.in_([row.id for row in batch]))
+        ):
+            paused[row.session_id].append((row.reason, row.pause_time, row.resume_time))
+
+        updates, entries = [], []
+        for row in batch:
+            events, focused_seconds, paused_seconds, changed_at = replay(
+                row.status, row.start_time, row.end_time, paused[row.id]
+            )
+            if not events:
+                continue
+            updates.append({
+                'b_id': row.id, 'b_focused': focused_seconds, 'b_paused': paused_seconds, 'b_changed': changed_at
+            })
+            entries += [dict(event, session_id=row.id) for event in events]
+            if row.end_time is not None:
+                totals = rollup_totals[(row.owner_id, row.created_at.date(), row.status)]
+                totals[0] += focused_seconds
+                totals[1] += paused_seconds
+
+        if updates:
+            conn.execute(
+                sessions.update().where(sessions.c.id == sa.bindparam('b_id')).values(
+                    focused_seconds=sa.bindparam('b_focused'),
+                    paused_seconds=sa.bindparam('b_paused'),
+                    state_changed_at=sa.bindparam('b_changed'),
+                ),
+                updates
+            )
+            op.bulk_insert(timeline, entries)
+
+    if rollup_totals:
+        conn.execute(
+            daily_rollups.update().where(
+                daily_rollups.c.owner_id == sa.bindparam('b_owner'),
+                daily_rollups.c.day == sa.bindparam('b_day'),
+                daily_rollups.c.status == sa.bindparam('b_status'),
+            ).values(focused_seconds=sa.bindparam('b_focused'), paused_seconds=sa.bindparam('b_paused')),
+            [
+                {'b_owner': owner_id, 'b_day': day, 'b_status': status, 'b_focused': focused, 'b_paused': paused}
+                for (owner_id, day, status), (focused, paused) in rollup_totals.items()
+            ]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_session_timeline_session_id_id', table_name='session_timeline')
+    op.drop_table('session_timeline')
+    op.drop_column('daily_rollups', 'paused_seconds')
+    op.drop_column('daily_rollups', 'focused_seconds')
+    op.drop_column('sessions', 'state_changed_at')
+    op.drop_column('sessions', 'paused_seconds')
+    op.drop_column('sessions', 'focused_seconds')
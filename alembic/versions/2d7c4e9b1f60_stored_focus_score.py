@@ -0,0 +1,48 @@
+"""Stored focus score
+
+Revision ID: 2d7c4e9b1f60
+Revises: 8b3e5f0a1c27
+Create Date: 2026-10-18 13:41:09.512846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '2d7c4e9b1f60'
+down_revision: Union[str, Sequence[str], None] = '8b3e5f0a1c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Batch mode rebuilds sessions from reflection, which leaves out unnamed CHECK constraints;
+# restate the status check of the initial revision so a rebuild keeps it
+STATUS_CHECK = "status IN ('scheduled', 'active', 'paused', 'completed', 'interrupted', 'abandoned', 'overdue')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.add_column(sa.Column('focus_score', sa.Float(), nullable=True))
+
+    # Backfill in one statement with the focus score formula as of this revision
+    sessions = sa.table('sessions',
+        sa.column('status', sa.String), sa.column('pause_count', sa.Integer),
+        sa.column('scheduled_duration', sa.Integer), sa.column('focus_score', sa.Float)
+    )
+    completion_ratio = sa.case((sessions.c.status == 'completed', 1.0), else_=0.5)
+    pause_ratio = sa.cast(sa.func.coalesce(sessions.c.pause_count, 0), sa.Float) / sessions.c.scheduled_duration
+    interruption_penalty = sa.case(
+        (sessions.c.scheduled_duration <= 0, 0.0),
+        (pause_ratio > 1.0, 1.0),
+        else_=pause_ratio
+    )
+    score = (1 - interruption_penalty) * completion_ratio * 100
+    op.execute(sessions.update().values(focus_score=sa.func.round(sa.cast(score, sa.Numeric), 2)))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sessions', table_args=(sa.CheckConstraint(STATUS_CHECK),)) as batch_op:
+        batch_op.drop_column('focus_score')
@@ -0,0 +1,42 @@
+"""Session due_at
+
+Revision ID: 3e8a6d1f9b42
+Revises: 9c4e7a2b5d18
+Create Date: 2026-10-18 18:05:52.310846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3e8a6d1f9b42'
+down_revision: Union[str, Sequence[str], None] = '9c4e7a2b5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('due_at', sa.TIMESTAMP(), nullable=True))
+    op.create_index(
+        'ix_sessions_status_due_at', 'sessions', ['status', 'due_at'], unique=False,
+        sqlite_where=sa.text('due_at IS NOT NULL'), postgresql_where=sa.text('due_at IS NOT NULL')
+    )
+    # Live sessions become due at their overrun deadline; paused ones get no shorter
+    # pause timeout here since the pause time is not on the row
+    if op.get_bind().dialect.name == 'sqlite':
+        deadline = "strftime('%Y-%m-%d %H:%M:%f', start_time, '+' || (scheduled_duration * 1.1) || ' minutes')"
+    else:
+        deadline = "start_time + (scheduled_duration * 1.1) * INTERVAL '1 minute'"
+    op.execute(
+        f"UPDATE sessions SET due_at = {deadline} "
+        "WHERE status IN ('active', 'paused') AND start_time IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_status_due_at', table_name='sessions')
+    op.drop_column('sessions', 'due_at')
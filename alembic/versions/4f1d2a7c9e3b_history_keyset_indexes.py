@@ -0,0 +1,29 @@
+"""History keyset indexes
+
+Revision ID: 4f1d2a7c9e3b
+Revises: c39a330d1b90
+Create Date: 2026-10-18 09:12:31.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '4f1d2a7c9e3b'
+down_revision: Union[str, Sequence[str], None] = 'c39a330d1b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sessions_created_at_id', 'sessions', ['created_at', 'id'], unique=False)
+    op.create_index('ix_sessions_status_created_at_id', 'sessions', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_status_created_at_id', table_name='sessions')
+    op.drop_index('ix_sessions_created_at_id', table_name='sessions')
@@ -0,0 +1,129 @@
+"""Users, workspaces and session owners
+
+Revision ID: 5b2d8f4a7e31
+Revises: 3e8a6d1f9b42
+Create Date: 2026-10-18 19:12:40.662013
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5b2d8f4a7e31'
+down_revision: Union[str, Sequence[str], None] = '3e8a6d1f9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Batch mode rebuilds sessions from reflection, which leaves out unnamed CHECK constraints;
+# restate the status check of the initial revision so a rebuild keeps it
+STATUS_CHECK = "status IN ('scheduled', 'active', 'paused', 'completed', 'interrupted', 'abandoned', 'overdue')"
+
+
+def _replace_table(name, columns, primary_key, copy_columns, copy_select):
+    """Recreate a table with a different primary key, copying its rows across"""
+    op.create_table(f'{name}_new', *columns, sa.PrimaryKeyConstraint(*primary_key))
+    op.execute(f"INSERT INTO {name}_new ({', '.join(copy_columns)}) SELECT {copy_select} FROM {name}")
+    op.drop_table(name)
+    op.rename_table(f'{name}_new', name)
+
+
+def _rollup_columns(with_owner):
+    def owner():
+        return [sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False)] if with_owner else []
+
+    return (
+        owner() + [
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('session_count', sa.Integer(), nullable=False),
+            sa.Column('focus_minutes', sa.Integer(), nullable=False),
+            sa.Column('pause_count', sa.Integer(), nullable=False),
+            sa.Column('focus_score_sum', sa.Float(), nullable=False),
+        ],
+        owner() + [
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('reason', sa.String(), nullable=False),
+            sa.Column('interruption_count', sa.Integer(), nullable=False),
+        ]
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    workspaces = op.create_table('workspaces',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    users = op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_workspace_id'), 'users', ['workspace_id'], unique=False)
+    # Existing sessions and rollups belong to the default user
+    op.bulk_insert(workspaces, [{'id': 1, 'name': 'Default'}])
+    op.bulk_insert(users, [{'id': 1, 'workspace_id': 1, 'name': 'default'}])
+
+    op.add_column('sessions', sa.Column('owner_id', sa.Integer(), server_default='1', nullable=False))
+    # SQLite can only add the constraint by rebuilding sessions, which batch mode does
+    with op.batch_alter_table('sessions', table_args=(sa.CheckConstraint(STATUS_CHECK),)) as batch_op:
+        batch_op.create_foreign_key('fk_sessions_owner_id_users', 'users', ['owner_id'], ['id'])
+    op.drop_index('ix_sessions_status_created_at_id', table_name='sessions')
+    op.drop_index('ix_sessions_created_at_id', table_name='sessions')
+    op.create_index('ix_sessions_owner_created_at_id', 'sessions', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_sessions_owner_status_created_at_id', 'sessions', ['owner_id', 'status', 'created_at', 'id'], unique=False
+    )
+
+    status_columns, reason_columns = _rollup_columns(with_owner=True)
+    _replace_table(
+        'daily_rollups', status_columns, ('owner_id', 'day', 'status'),
+        ['owner_id', 'day', 'status', 'session_count', 'focus_minutes', 'pause_count', 'focus_score_sum'],
+        "1, day, status, session_count, focus_minutes, pause_count, focus_score_sum"
+    )
+    _replace_table(
+        'daily_interruption_rollups', reason_columns, ('owner_id', 'day', 'reason'),
+        ['owner_id', 'day', 'reason', 'interruption_count'],
+        "1, day, reason, interruption_count"
+    )
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold every owner's rollups back into installation-wide totals
+    status_columns, reason_columns = _rollup_columns(with_owner=False)
+    op.create_table('daily_rollups_new', *status_columns, sa.PrimaryKeyConstraint('day', 'status'))
+    op.execute(
+        "INSERT INTO daily_rollups_new (day, status, session_count, focus_minutes, pause_count, focus_score_sum) "
+        "SELECT day, status, SUM(session_count), SUM(focus_minutes), SUM(pause_count), SUM(focus_score_sum) "
+        "FROM daily_rollups GROUP BY day, status"
+    )
+    op.drop_table('daily_rollups')
+    op.rename_table('daily_rollups_new', 'daily_rollups')
+    op.create_table('daily_interruption_rollups_new', *reason_columns, sa.PrimaryKeyConstraint('day', 'reason'))
+    op.execute(
+        "INSERT INTO daily_interruption_rollups_new (day, reason, interruption_count) "
+        "SELECT day, reason, SUM(interruption_count) FROM daily_interruption_rollups GROUP BY day, reason"
+    )
+    op.drop_table('daily_interruption_rollups')
+    op.rename_table('daily_interruption_rollups_new', 'daily_interruption_rollups')
+
+    op.drop_index('ix_sessions_owner_status_created_at_id', table_name='sessions')
+    op.drop_index('ix_sessions_owner_created_at_id', table_name='sessions')
+    op.create_index('ix_sessions_created_at_id', 'sessions', ['created_at', 'id'], unique=False)
+    op.create_index('ix_sessions_status_created_at_id', 'sessions', ['status', 'created_at', 'id'], unique=False)
+    with op.batch_alter_table('sessions', table_args=(sa.CheckConstraint(STATUS_CHECK),)) as batch_op:
+        batch_op.drop_constraint('fk_sessions_owner_id_users', type_='foreignkey')
+        batch_op.drop_column('owner_id')
+
+    op.drop_index(op.f('ix_users_workspace_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_table('workspaces')
@@ -0,0 +1,36 @@
+"""Data version counter
+
+Revision ID: 6a1f3c8d2e94
+Revises: 2d7c4e9b1f60
+Create Date: 2026-10-18 14:27:36.084153
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '6a1f3c8d2e94'
+down_revision: Union[str, Sequence[str], None] = '2d7c4e9b1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    data_version = op.create_table('data_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(data_version, [
+        {'id': 1, 'version': 1, 'changed_at': datetime.utcnow().replace(microsecond=0)}
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_version')
@@ -0,0 +1,58 @@
+"""Full-text session search
+
+Revision ID: 7d3f9a1c5e20
+Revises: 5b2d8f4a7e31
+Create Date: 2026-10-18 21:05:37.184220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models import SEARCH_INDEX_DDL
+
+
+revision: str = '7d3f9a1c5e20'
+down_revision: Union[str, Sequence[str], None] = '5b2d8f4a7e31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect not in SEARCH_INDEX_DDL:
+        return
+    for statement in SEARCH_INDEX_DDL[dialect]:
+        op.execute(statement)
+
+    # Index the sessions that already exist
+    if dialect == 'sqlite':
+        op.execute("""
+            INSERT INTO session_search (rowid, title, goal, reasons)
+            SELECT s.id, s.title, coalesce(s.goal, ''), coalesce(
+                (SELECT group_concat(i.reason, ' ') FROM interruptions i WHERE i.session_id = s.id), ''
+            )
+            FROM sessions s
+        """)
+    else:
+        op.execute('SELECT session_search_refresh(id) FROM sessions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in (
+            'session_search_insert', 'session_search_update', 'session_search_delete',
+            'interruption_search_insert', 'interruption_search_update', 'interruption_search_delete',
+        ):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    elif dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS session_search_sessions ON sessions')
+        op.execute('DROP TRIGGER IF EXISTS session_search_interruptions ON interruptions')
+        op.execute('DROP FUNCTION IF EXISTS session_search_sessions()')
+        op.execute('DROP FUNCTION IF EXISTS session_search_interruptions()')
+        op.execute('DROP FUNCTION IF EXISTS session_search_refresh(INTEGER)')
+    op.execute('DROP TABLE IF EXISTS session_search')
@@ -0,0 +1,87 @@
+"""Daily rollups
+
+Revision ID: 8b3e5f0a1c27
+Revises: 4f1d2a7c9e3b
+Create Date: 2026-10-18 10:02:54.107311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '8b3e5f0a1c27'
+down_revision: Union[str, Sequence[str], None] = '4f1d2a7c9e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _focus_score(status, pause_count, scheduled_duration):
+    pause_count = pause_count or 0
+    completion_ratio = 1.0 if status == 'completed' else 0.5
+    interruption_penalty = min(pause_count / scheduled_duration, 1.0) if scheduled_duration > 0 else 0
+    return round(max(0, min(100, (1 - interruption_penalty) * completion_ratio * 100)), 2)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    daily_rollups = op.create_table('daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('focus_minutes', sa.Integer(), nullable=False),
+    sa.Column('pause_count', sa.Integer(), nullable=False),
+    sa.Column('focus_score_sum', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'status')
+    )
+    daily_interruption_rollups = op.create_table('daily_interruption_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column('interruption_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'reason')
+    )
+
+    # Backfill from existing rows
+    sessions = sa.table('sessions',
+        sa.column('id', sa.Integer), sa.column('created_at', sa.TIMESTAMP), sa.column('status', sa.String),
+        sa.column('start_time', sa.TIMESTAMP), sa.column('end_time', sa.TIMESTAMP),
+        sa.column('pause_count', sa.Integer), sa.column('scheduled_duration', sa.Integer)
+    )
+    interruptions = sa.table('interruptions', sa.column('session_id', sa.Integer), sa.column('reason', sa.String))
+    bind = op.get_bind()
+
+    totals = {}
+    for row in bind.execute(sa.select(sessions)):
+        key = (row.created_at.date(), row.status)
+        slot = totals.setdefault(key, [0, 0, 0, 0.0])
+        slot[0] += 1
+        if row.start_time and row.end_time:
+            slot[1] += int((row.end_time - row.start_time).total_seconds() / 60)
+        slot[2] += row.pause_count or 0
+        slot[3] += _focus_score(row.status, row.pause_count, row.scheduled_duration)
+    if totals:
+        op.bulk_insert(daily_rollups, [
+            {'day': day, 'status': status, 'session_count': count, 'focus_minutes': minutes,
+             'pause_count': pauses, 'focus_score_sum': score}
+            for (day, status), (count, minutes, pauses, score) in totals.items()
+        ])
+
+    reasons = {}
+    joined = sa.select(sessions.c.created_at, interruptions.c.reason).select_from(
+        interruptions.join(sessions, interruptions.c.session_id == sessions.c.id)
+    )
+    for created_at, reason in bind.execute(joined):
+        key = (created_at.date(), reason)
+        reasons[key] = reasons.get(key, 0) + 1
+    if reasons:
+        op.bulk_insert(daily_interruption_rollups, [
+            {'day': day, 'reason': reason, 'interruption_count': count}
+            for (day, reason), count in reasons.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_interruption_rollups')
+    op.drop_table('daily_rollups')
@@ -0,0 +1,34 @@
+"""Interruption indexes
+
+Revision ID: 9c4e7a2b5d18
+Revises: 6a1f3c8d2e94
+Create Date: 2026-10-18 16:41:09.527310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9c4e7a2b5d18'
+down_revision: Union[str, Sequence[str], None] = '6a1f3c8d2e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_interruptions_session_id_pause_time', 'interruptions', ['session_id', 'pause_time'], unique=False)
+    op.create_index(
+        'ix_interruptions_open', 'interruptions', ['session_id', 'pause_time'], unique=False,
+        sqlite_where=sa.text('resume_time IS NULL'), postgresql_where=sa.text('resume_time IS NULL')
+    )
+    # Without statistics SQLite walks the whole status index for the weekly report
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interruptions_open', table_name='interruptions')
+    op.drop_index('ix_interruptions_session_id_pause_time', table_name='interruptions')
@@ -0,0 +1,50 @@
+"""Per-owner data versions
+
+Revision ID: b4d1e8f3a6c2
+Revises: 0a9e3c7f2b14
+Create Date: 2026-10-19 10:06:52.241718
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b4d1e8f3a6c2'
+down_revision: Union[str, Sequence[str], None] = '0a9e3c7f2b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('data_versions',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    # Every owner starts past the old shared version, so no ETag issued before the upgrade validates
+    op.execute(
+        "INSERT INTO data_versions (owner_id, version) "
+        "SELECT users.id, coalesce((SELECT version FROM data_version WHERE id = 1), 0) + 1 FROM users"
+    )
+    op.drop_table('data_version')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    data_version = op.create_table('data_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # The sum exceeds every owner's version, so no per-owner ETag validates either
+    total = op.get_bind().execute(sa.text("SELECT coalesce(sum(version), 0) FROM data_versions")).scalar()
+    op.bulk_insert(data_version, [
+        {'id': 1, 'version': total + 1, 'changed_at': datetime.utcnow().replace(microsecond=0)}
+    ])
+    op.drop_table('data_versions')
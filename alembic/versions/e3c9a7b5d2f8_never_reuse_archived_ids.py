@@ -0,0 +1,63 @@
+"""Never reuse interruption and timeline ids
+
+Revision ID: e3c9a7b5d2f8
+Revises: b4d1e8f3a6c2
+Create Date: 2026-10-19 14:27:36.905184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models import SEARCH_INDEX_DDL
+
+
+revision: str = 'e3c9a7b5d2f8'
+down_revision: Union[str, Sequence[str], None] = 'b4d1e8f3a6c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Live tables whose rows are archived with their ids, and the archive table of each
+ARCHIVED_TABLES = (('interruptions', 'interruptions_archive'), ('session_timeline', 'session_timeline_archive'))
+
+
+def _rebuild(autoincrement: bool) -> None:
+    """Recreate the live tables with or without AUTOINCREMENT, restoring the search triggers the rebuild drops"""
+    for table, _ in ARCHIVED_TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+            pass
+    for statement in SEARCH_INDEX_DDL['sqlite']:
+        if ' ON interruptions ' in statement:
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Other databases draw ids from sequences, which never go back
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for table, archive in ARCHIVED_TABLES:
+        # Rows that already took an archived id move past the archive, keeping their order;
+        # negating first keeps every intermediate id unique
+        op.execute(
+            f"UPDATE {table} SET id = -id "
+            f"WHERE EXISTS (SELECT 1 FROM {table} JOIN {archive} USING (id))"
+        )
+        op.execute(f"UPDATE {table} SET id = (SELECT max(id) FROM {archive}) - id WHERE id < 0")
+    _rebuild(True)
+    for table, archive in ARCHIVED_TABLES:
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', "
+            f"max(coalesce((SELECT max(id) FROM {table}), 0), coalesce((SELECT max(id) FROM {archive}), 0))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    _rebuild(False)
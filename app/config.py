@@ -0,0 +1,67 @@
+from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class Settings(BaseSettings):
+    """Runtime configuration, read from environment variables or a .env file"""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    
+    # Database connection
+    database_url: str = "sqlite:///./deep_work.db"
+    
+    # Connection pool (ignored by in-memory SQLite, which uses a single connection)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+    
+    # Per-statement time limit in milliseconds (PostgreSQL only)
+    db_statement_timeout_ms: Optional[int] = None
+    
+    # SQLite tuning, applied to every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+    
+    # Focus score read cache (0 entries disables it)
+    focus_score_cache_size: int = 10000
+    focus_score_cache_ttl: float = 30.0  # seconds; bounds staleness across worker processes
+    
+    # Serialized report bodies, reused until the data version changes or the TTL expires
+    report_cache_max_entries: int = 256
+    report_cache_max_bytes: int = 8 * 1024 * 1024
+    report_cache_ttl: float = 60.0  # seconds; rolling windows move with the clock
+    
+    # Live session updates: replay buffer for reconnecting clients, per-client backlog
+    session_events_history: int = 1000
+    session_events_queue_size: int = 256
+    session_events_keepalive: float = 15.0  # seconds between SSE keepalive comments
+    
+    # Background expiry of sessions left active or paused
+    session_sweep_interval: float = 60.0  # seconds between sweeps; 0 disables the sweeper
+    session_sweep_batch_size: int = 500  # sessions closed per transaction
+    session_pause_timeout: float = 30.0  # minutes a paused session may sit before it is abandoned
+    
+    # Retention: closed sessions older than this move to the archive tables
+    archive_after_days: int = 0  # 0 keeps every session in the live tables
+    archive_interval: float = 3600.0  # seconds between archiving runs
+    archive_batch_size: int = 500  # sessions moved per transaction
+    
+    # Group commit of lifecycle transitions (0 commits each transition on its own)
+    write_batch_window_ms: float = 0.0  # how long the writer waits for more transitions to share a commit
+    write_batch_max_size: int = 256
+    
+    # Background report/export jobs and their on-disk results
+    job_workers: int = 2  # worker processes
+    job_cache_dir: str = "./job_results"
+    job_cache_max_entries: int = 256
+    job_cache_max_bytes: int = 1024 * 1024 * 1024
+    job_history: int = 1000  # jobs remembered for polling, per web process
+    
+    # Observability
+    log_level: str = "INFO"
+    log_json: bool = True
+    metrics_enabled: bool = True
+
+settings = Settings()
@@ -1,14 +1,100 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-import os
+from app.config import Settings, settings
+from app import metrics
 
-# SQLite database URL
-#sample
-DATABASE_URL = "sqlite:///./deep_work.db"
+DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# asyncio drivers for each supported backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def engine_options(url: str, config: Settings = settings) -> dict:
+    """create_engine keyword arguments for a URL under the given settings"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options = {}
+    connect_args = {}
+    
+    if not _is_memory_sqlite(parsed):
+        options.update(
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
+            pool_pre_ping=config.db_pool_pre_ping,
+        )
+    
+    if backend == "sqlite":
+        if parsed.get_driver_name() == "pysqlite":
+            connect_args["check_same_thread"] = False
+    elif backend == "postgresql" and config.db_statement_timeout_ms:
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": str(config.db_statement_timeout_ms)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={config.db_statement_timeout_ms}"
+    
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+def apply_sqlite_pragmas(engine: Engine, config: Settings = settings) -> None:
+    """Tune every new SQLite connection for concurrent reads and writes"""
+    pragmas = [
+        f"PRAGMA journal_mode={config.sqlite_journal_mode}",
+        f"PRAGMA synchronous={config.sqlite_synchronous}",
+        f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}",
+        f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}",
+    ]
+    
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def build_engine(url: str = DATABASE_URL, config: Settings = settings) -> Engine:
+    """Create a configured synchronous engine"""
+    engine = create_engine(url, **engine_options(url, config))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine, config)
+    metrics.instrument_engine(engine, "sync")
+    return engine
+
+def build_async_engine(url: str = DATABASE_URL, config: Settings = settings) -> AsyncEngine:
+    """Create a configured asyncio engine for the same database as url"""
+    async_url = async_database_url(url)
+    engine = create_async_engine(async_url, **engine_options(async_url, config))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine.sync_engine, config)
+    metrics.instrument_engine(engine.sync_engine, "async")
+    return engine
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = build_async_engine()
+# Objects stay loaded after commit so responses never trigger I/O outside the session
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -19,3 +105,7 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency to get an asyncio database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,11 +1,79 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, CheckConstraint, func
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, Date, String, TIMESTAMP, ForeignKey, CheckConstraint, DDL, Index, event, func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+class _SQLiteServerTimestamp(sqlite.DATETIME):
+    """SQLite DATETIME written in CURRENT_TIMESTAMP's text format.
+    
+    Whole-second values bind without a fraction so equality with server-stamped
+    rows holds; values with microseconds keep them, so an exclusive upper bound
+    like 12:00:03.5 still sorts after a row stamped 12:00:03.
+    """
+    
+    # Rendered as TIMESTAMP, the type the migrations create, so autogenerate sees no change
+    __visit_name__ = "TIMESTAMP"
+    
+    def __init__(self):
+        super().__init__(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d")
+    
+    def bind_processor(self, dialect):
+        whole_seconds = super().bind_processor(dialect)
+        
+        def process(value):
+            if isinstance(value, datetime) and value.microsecond:
+                return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+            return whole_seconds(value)
+        return process
+
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; bind parameters must use the
+# same text format or equality/range comparisons on server-stamped columns misbehave.
+ServerTimestamp = TIMESTAMP().with_variant(_SQLiteServerTimestamp(), "sqlite")
+
+def _initial_focus_score(context) -> float:
+    """Focus score of a row being inserted, from its own status and counts"""
+    from app.services.session_service import SessionService
+    
+    params = context.get_current_parameters()
+    return SessionService.compute_focus_score(
+        params.get("status") or 'scheduled', params.get("pause_count"), params["scheduled_duration"]
+    )
+
+# Owner of sessions created without an identity, so a single-user installation needs no setup
+DEFAULT_WORKSPACE_ID = 1
+DEFAULT_USER_ID = 1
+
+class Workspace(Base):
+    """A team whose members' reports can be combined"""
+    __tablename__ = "workspaces"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    created_at = Column(ServerTimestamp, server_default=func.now())
+
+class User(Base):
+    __tablename__ = "users"
+    
+    id = Column(Integer, primary_key=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    created_at = Column(ServerTimestamp, server_default=func.now())
+
+event.listen(Workspace.__table__, "after_create", DDL(
+    f"INSERT INTO workspaces (id, name) VALUES ({DEFAULT_WORKSPACE_ID}, 'Default')"
+))
+event.listen(User.__table__, "after_create", DDL(
+    f"INSERT INTO users (id, workspace_id, name) VALUES ({DEFAULT_USER_ID}, {DEFAULT_WORKSPACE_ID}, 'default')"
+))
+
 class Session(Base):
     __tablename__ = "sessions"
     
     id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(
+        Integer, ForeignKey("users.id"), nullable=False, default=DEFAULT_USER_ID, server_default=str(DEFAULT_USER_ID)
+    )
     title = Column(String, nullable=False)
     goal = Column(String)
     scheduled_duration = Column(Integer, nullable=False)  # in minutes
@@ -15,10 +83,37 @@ class Session(Base):
                    CheckConstraint("status IN ('scheduled', 'active', 'paused', 'completed', 'interrupted', 'abandoned', 'overdue')"),
                    default='scheduled')
     pause_count = Column(Integer, default=0)
-    created_at = Column(TIMESTAMP, server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
+    # Stored so reads skip the formula; maintained by every SessionService transition
+    focus_score = Column(Float, default=_initial_focus_score)
+    # When the sweeper closes a live session nobody completes; NULL unless active or paused
+    due_at = Column(TIMESTAMP)
+    # Running totals advanced by every transition, so true focus time needs no interruption scan;
+    # the segment since state_changed_at is added when the session next changes state
+    focused_seconds = Column(Integer, nullable=False, default=0, server_default="0")
+    paused_seconds = Column(Integer, nullable=False, default=0, server_default="0")
+    state_changed_at = Column(TIMESTAMP)
     
     # Relationship to interruptions
     interruptions = relationship("Interruption", back_populates="session", cascade="all, delete-orphan")
+    timeline = relationship(
+        "TimelineEvent", back_populates="session", cascade="all, delete-orphan", order_by="TimelineEvent.id"
+    )
+    
+    __table_args__ = (
+        # Every read is scoped to one owner: keyset pagination over history,
+        # optionally narrowed by status, and raw report windows
+        Index("ix_sessions_owner_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_sessions_owner_status_created_at_id", "owner_id", "status", "created_at", "id"),
+        # Sweeps read only the expired prefix of the live sessions
+        Index(
+            "ix_sessions_status_due_at", "status", "due_at",
+            sqlite_where=due_at.isnot(None), postgresql_where=due_at.isnot(None)
+        ),
+    )
+    
+    # Fetch server-generated created_at on INSERT so rollups can be keyed before commit
+    __mapper_args__ = {"eager_defaults": True}
 
 class Interruption(Base):
     __tablename__ = "interruptions"
@@ -31,4 +126,211 @@ class Interruption(Base):
     
     # Relationship to session
     session = relationship("Session", back_populates="interruptions")
+    
+    __table_args__ = (
+        # Relationship loads, report joins and per-session lookups in pause order
+        Index("ix_interruptions_session_id_pause_time", "session_id", "pause_time"),
+        # The open interruption resume_session closes: at most one per session
+        Index(
+            "ix_interruptions_open", "session_id", "pause_time",
+            sqlite_where=resume_time.is_(None), postgresql_where=resume_time.is_(None)
+        ),
+        # Archived interruptions keep their ids, so SQLite must never hand one out again
+        {"sqlite_autoincrement": True},
+    )
+
+class TimelineEvent(Base):
+    """One lifecycle transition of a session, appended and never updated"""
+    __tablename__ = "session_timeline"
+    
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # start, pause, resume, complete or expire
+    status = Column(String, nullable=False)  # the session's status after the transition
+    occurred_at = Column(TIMESTAMP, nullable=False)
+    reason = Column(String)  # pauses only
+    # The session's running totals after the transition
+    focused_seconds = Column(Integer, nullable=False)
+    paused_seconds = Column(Integer, nullable=False)
+    
+    session = relationship("Session", back_populates="timeline")
+    
+    __table_args__ = (
+        Index("ix_session_timeline_session_id_id", "session_id", "id"),
+        # Archived events keep their ids, so SQLite must never hand one out again
+        {"sqlite_autoincrement": True},
+    )
+
+# Archive tier: closed sessions past the retention age, moved here with their
+# interruptions and timeline (see app.services.retention). Columns mirror the
+# live tables, ids included; nothing here is ever updated.
+class ArchivedSession(Base):
+    """A closed session moved out of the live table; archived_at records when"""
+    __tablename__ = "sessions_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String, nullable=False)
+    goal = Column(String)
+    scheduled_duration = Column(Integer, nullable=False)
+    start_time = Column(TIMESTAMP)
+    end_time = Column(TIMESTAMP)
+    status = Column(String, nullable=False)
+    pause_count = Column(Integer, default=0)
+    created_at = Column(ServerTimestamp)
+    focus_score = Column(Float)
+    due_at = Column(TIMESTAMP)
+    focused_seconds = Column(Integer, nullable=False, default=0)
+    paused_seconds = Column(Integer, nullable=False, default=0)
+    state_changed_at = Column(TIMESTAMP)
+    archived_at = Column(ServerTimestamp, server_default=func.now())
+    
+    interruptions = relationship("ArchivedInterruption", order_by="ArchivedInterruption.pause_time")
+    
+    __table_args__ = (
+        # History and export pages, and the newest archived row that tells readers whether to look here at all
+        Index("ix_sessions_archive_owner_created_at_id", "owner_id", "created_at", "id"),
+    )
+
+class ArchivedInterruption(Base):
+    """An interruption of an archived session"""
+    __tablename__ = "interruptions_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    session_id = Column(Integer, ForeignKey("sessions_archive.id"), nullable=False)
+    owner_id = Column(Integer, nullable=False)  # the session's, so an owner's latest pause needs no join
+    reason = Column(String, nullable=False)
+    pause_time = Column(TIMESTAMP)
+    resume_time = Column(TIMESTAMP)
+    
+    __table_args__ = (
+        Index("ix_interruptions_archive_session_id_pause_time", "session_id", "pause_time"),
+        Index("ix_interruptions_archive_owner_pause_time", "owner_id", "pause_time"),
+    )
+
+class ArchivedTimelineEvent(Base):
+    """A timeline entry of an archived session"""
+    __tablename__ = "session_timeline_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    session_id = Column(Integer, ForeignKey("sessions_archive.id"), nullable=False)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    occurred_at = Column(TIMESTAMP, nullable=False)
+    reason = Column(String)
+    focused_seconds = Column(Integer, nullable=False)
+    paused_seconds = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_session_timeline_archive_session_id_id", "session_id", "id"),
+    )
+
+class DailyRollup(Base):
+    """Per-owner, per-day, per-status session totals keyed by the day the session was created"""
+    __tablename__ = "daily_rollups"
+    
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    focus_minutes = Column(Integer, nullable=False, default=0)
+    pause_count = Column(Integer, nullable=False, default=0)
+    focus_score_sum = Column(Float, nullable=False, default=0.0)
+    # Focused and paused time of the slot's ended sessions
+    focused_seconds = Column(Integer, nullable=False, default=0, server_default="0")
+    paused_seconds = Column(Integer, nullable=False, default=0, server_default="0")
+
+class DailyInterruptionRollup(Base):
+    """Per-owner, per-day interruption counts by reason, keyed by the owning session's creation day"""
+    __tablename__ = "daily_interruption_rollups"
+    
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    reason = Column(String, primary_key=True)
+    interruption_count = Column(Integer, nullable=False, default=0)
+
+class DataVersion(Base):
+    """Per-owner counter bumped by every write to the owner's sessions; the validator behind ETags and cached reports"""
+    __tablename__ = "data_versions"
+    
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+# Full-text index over session titles, goals and interruption reasons. Triggers
+# keep it in step with every write path, ORM and Core bulk inserts alike.
+# SQLite: an FTS5 table whose rowid is the session id. PostgreSQL: one weighted
+# tsvector per session (title A, goal B, reasons C) behind a GIN index.
+SEARCH_INDEX_DDL = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE session_search USING fts5(title, goal, reasons, tokenize='unicode61', prefix='2 3')",
+        """CREATE TRIGGER session_search_insert AFTER INSERT ON sessions BEGIN
+            INSERT INTO session_search (rowid, title, goal, reasons) VALUES (new.id, new.title, coalesce(new.goal, ''), '');
+        END""",
+        """CREATE TRIGGER session_search_update AFTER UPDATE OF title, goal ON sessions BEGIN
+            UPDATE session_search SET title = new.title, goal = coalesce(new.goal, '') WHERE rowid = new.id;
+        END""",
+        """CREATE TRIGGER session_search_delete AFTER DELETE ON sessions BEGIN
+            DELETE FROM session_search WHERE rowid = old.id;
+        END""",
+        """CREATE TRIGGER interruption_search_insert AFTER INSERT ON interruptions BEGIN
+            UPDATE session_search SET reasons = reasons || ' ' || new.reason WHERE rowid = new.session_id;
+        END""",
+        """CREATE TRIGGER interruption_search_update AFTER UPDATE OF reason, session_id ON interruptions BEGIN
+            UPDATE session_search SET reasons = coalesce(
+                (SELECT group_concat(reason, ' ') FROM interruptions WHERE session_id = old.session_id), ''
+            ) WHERE rowid = old.session_id;
+            UPDATE session_search SET reasons = coalesce(
+                (SELECT group_concat(reason, ' ') FROM interruptions WHERE session_id = new.session_id), ''
+            ) WHERE rowid = new.session_id;
+        END""",
+        """CREATE TRIGGER interruption_search_delete AFTER DELETE ON interruptions BEGIN
+            UPDATE session_search SET reasons = coalesce(
+                (SELECT group_concat(reason, ' ') FROM interruptions WHERE session_id = old.session_id), ''
+            ) WHERE rowid = old.session_id;
+        END""",
+    ),
+    "postgresql": (
+        """CREATE TABLE session_search (
+            session_id INTEGER PRIMARY KEY REFERENCES sessions (id) ON DELETE CASCADE,
+            document TSVECTOR NOT NULL
+        )""",
+        "CREATE INDEX ix_session_search_document ON session_search USING gin (document)",
+        """CREATE OR REPLACE FUNCTION session_search_refresh(target INTEGER) RETURNS void AS $$
+            INSERT INTO session_search (session_id, document)
+            SELECT s.id,
+                setweight(to_tsvector('simple', s.title), 'A')
+                || setweight(to_tsvector('simple', coalesce(s.goal, '')), 'B')
+                || setweight(to_tsvector('simple', coalesce(
+                    (SELECT string_agg(i.reason, ' ') FROM interruptions i WHERE i.session_id = s.id), ''
+                )), 'C')
+            FROM sessions s WHERE s.id = target
+            ON CONFLICT (session_id) DO UPDATE SET document = excluded.document
+        $$ LANGUAGE sql""",
+        """CREATE OR REPLACE FUNCTION session_search_sessions() RETURNS trigger AS $$
+        BEGIN
+            PERFORM session_search_refresh(NEW.id);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        """CREATE OR REPLACE FUNCTION session_search_interruptions() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM session_search_refresh(OLD.session_id);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM session_search_refresh(NEW.session_id);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        """CREATE TRIGGER session_search_sessions AFTER INSERT OR UPDATE OF title, goal ON sessions
+            FOR EACH ROW EXECUTE FUNCTION session_search_sessions()""",
+        """CREATE TRIGGER session_search_interruptions AFTER INSERT OR DELETE OR UPDATE OF reason, session_id ON interruptions
+            FOR EACH ROW EXECUTE FUNCTION session_search_interruptions()""",
+    ),
+}
 
+for _dialect, _statements in SEARCH_INDEX_DDL.items():
+    for _statement in _statements:
+        event.listen(Interruption.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(Session.__table__, "before_drop", DDL("DROP TABLE IF EXISTS session_search"))
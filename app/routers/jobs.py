@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import schemas
+from app.routers.sessions import get_async_database, get_database, get_current_user_id
+from app.services.async_session_service import AsyncSessionService
+from app.services.jobs import Job, manager
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+def _status(job: Job) -> schemas.JobStatus:
+    rows_done, rows_total = manager.progress(job)
+    return schemas.JobStatus(
+        id=job.id,
+        kind=job.kind,
+        state=job.state,
+        cached=job.cached,
+        rows_done=rows_done,
+        rows_total=rows_total,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        result_url=router.url_path_for("get_job_result", job_id=job.id) if job.state == "done" else None
+    )
+
+def _get_job(job_id: str, user_id: int) -> Job:
+    job = manager.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("", response_model=schemas.JobStatus, status_code=202)
+async def submit_job(
+    job_request: schemas.JobRequest,
+    response: Response,
+    db: Session = Depends(get_database),
+    async_db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Run a report or export in a worker process; poll the returned job and download its result_url"""
+    # Workers connect with the sync session's URL; reading it needs no connection
+    database_url = db.get_bind().url.render_as_string(hide_password=False)
+    version = await AsyncSessionService.get_data_version(async_db, user_id)
+    try:
+        job = manager.submit(database_url, version, job_request, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError:
+        raise HTTPException(status_code=501, detail=f"{job_request.format} export requires pyarrow")
+    
+    response.headers["Location"] = router.url_path_for("get_job", job_id=job.id)
+    return _status(job)
+
+@router.get("/{job_id}", response_model=schemas.JobStatus)
+async def get_job(job_id: str, user_id: int = Depends(get_current_user_id)):
+    """State and progress of a job"""
+    return _status(_get_job(job_id, user_id))
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, user_id: int = Depends(get_current_user_id)):
+    """Download a finished job's report or export"""
+    job = _get_job(job_id, user_id)
+    if job.state != "done":
+        detail = f"Job failed: {job.error}" if job.state == "failed" else f"Job is {job.state}"
+        raise HTTPException(status_code=409, detail=detail)
+    
+    path = manager.result_path(job)
+    if path is None:
+        raise HTTPException(status_code=410, detail="Job result has been evicted; submit the job again")
+    return FileResponse(path, media_type=job.media_type, filename=job.filename)
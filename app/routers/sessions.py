@@ -1,12 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import Annotated, AsyncIterator, Awaitable, Callable, Hashable, List, Literal, Optional, Tuple
+import json
+import logging
 from app import database, schemas
+from app.models import DEFAULT_USER_ID
+from app.config import settings
+from app.serialization import FastJSONResponse
 from app.services.session_service import SessionService
-import io
-import csv
+from app.services.async_session_service import AsyncSessionService
+from app.services.export_service import ExportService
+from app.services.bulk_service import BulkService, IMPORT_CHUNK_SIZE
+from app.services.response_cache import reports as report_cache
+from app.services.session_events import hub as session_event_hub
+from app.services.user_service import UserService
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
+logger = logging.getLogger("app.sessions")
+
+# History page size bounds
+HISTORY_DEFAULT_LIMIT = 100
+HISTORY_MAX_LIMIT = 1000
+
+# Search page size bounds
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Analytics cover this many days back when no window is given
+ANALYTICS_DEFAULT_DAYS = 365
 
 def get_database():
     """Dependency to get database session"""
@@ -16,60 +41,163 @@ def get_database():
     finally:
         db.close()
 
+def get_async_session_factory() -> async_sessionmaker:
+    """Dependency to get the asyncio session factory, for lookups that must not hold a connection"""
+    return database.AsyncSessionLocal
+
+async def get_async_database(session_factory: async_sessionmaker = Depends(get_async_session_factory)):
+    """Dependency to get an asyncio database session"""
+    async with session_factory() as db:
+        yield db
+
+async def get_current_user_id(
+    x_user_id: Optional[int] = Header(None),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+) -> int:
+    """The acting user, from X-User-Id; requests without the header act as the default user.
+    
+    The header is trusted as-is: deployments with several users must put the
+    API behind a gateway that authenticates callers and sets it. The lookup
+    uses its own short session: yield dependencies live until the response
+    ends, which for the event stream is when the client disconnects.
+    """
+    if x_user_id is None or x_user_id == DEFAULT_USER_ID:
+        return DEFAULT_USER_ID
+    async with session_factory() as db:
+        user = await db.run_sync(UserService.get_user, x_user_id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Unknown user")
+    return x_user_id
+
 @router.post("/", response_model=schemas.SessionResponse, status_code=201)
 async def create_session(
     session: schemas.SessionCreate,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
 ):
     """Schedule a new work session"""
     try:
-        new_session = SessionService.create_session(db, session)
+        new_session = await AsyncSessionService.create_session(db, session, user_id)
         return new_session
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk", response_model=schemas.BulkImportResult)
+async def bulk_import(
+    request: Request,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Import sessions with historical times and interruptions.
+    
+    Accepts a JSON array of SessionImport objects, or one object per line with
+    Content-Type: application/x-ndjson. Invalid items are reported by index and
+    do not stop the rest of the import.
+    """
+    inserted = 0
+    errors = []
+    chunk = []
+    
+    async for index, raw in _iter_import_payload(request):
+        try:
+            chunk.append((index, BulkService.parse_import_item(raw)))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+        
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            count, chunk_errors = await AsyncSessionService.import_sessions(db, chunk, user_id)
+            inserted += count
+            errors += chunk_errors
+            chunk = []
+    
+    count, chunk_errors = await AsyncSessionService.import_sessions(db, chunk, user_id)
+    inserted += count
+    errors += chunk_errors
+    
+    return {"inserted": inserted, "errors": sorted(errors, key=lambda error: error["index"])}
+
+async def _iter_import_payload(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """Yield (index, raw item) from a JSON array body or an NDJSON stream"""
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        index = 0
+        pending = b""
+        async for data in request.stream():
+            pending += data
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if pending.strip():
+            yield index, pending
+        return
+    
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for index, item in enumerate(items):
+        yield index, item
+
+@router.post("/bulk/transition", response_model=schemas.BatchTransitionResult)
+async def bulk_transition(
+    batch: schemas.BatchTransitionRequest,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Start, pause, resume or complete many sessions at once"""
+    return await AsyncSessionService.transition_sessions(
+        db, batch.action, batch.session_ids, batch.reason, owner_id=user_id
+    )
+
 @router.patch("/{session_id}/start", response_model=schemas.SessionResponse)
 async def start_session(
     session_id: int,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
 ):
     """Start a scheduled session"""
     try:
-        print(f"Start request received for session {session_id}")
-        session = SessionService.start_session(db, session_id)
-        print(f"Session {session_id} started successfully. Status: {session.status}")
+        session = await AsyncSessionService.start_session(db, session_id, user_id)
+        logger.info("session_started", extra={"session_id": session_id, "status": session.status})
         return session
     except ValueError as e:
-        print(f"Error starting session {session_id}: {str(e)}")
+        logger.info("session_start_rejected", extra={"session_id": session_id, "error": str(e)})
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.patch("/{session_id}/pause", response_model=schemas.SessionResponse)
 async def pause_session(
     session_id: int,
     pause_request: schemas.PauseRequest,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
 ):
     """Pause an active session"""
     try:
-        print(f"Pause request received for session {session_id} with reason: {pause_request.reason}")
-        session = SessionService.pause_session(db, session_id, pause_request.reason)
-        print(f"Session {session_id} paused successfully. New status: {session.status}, Pause count: {session.pause_count}")
+        session = await AsyncSessionService.pause_session(db, session_id, pause_request.reason, user_id)
+        logger.info("session_paused", extra={
+            "session_id": session_id, "reason": pause_request.reason,
+            "status": session.status, "pause_count": session.pause_count
+        })
         return session
     except ValueError as e:
-        print(f"Error pausing session {session_id}: {str(e)}")
+        logger.info("session_pause_rejected", extra={"session_id": session_id, "error": str(e)})
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Unexpected error pausing session {session_id}: {str(e)}")
+        logger.exception("session_pause_failed", extra={"session_id": session_id})
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.patch("/{session_id}/resume", response_model=schemas.SessionResponse)
 async def resume_session(
     session_id: int,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
 ):
     """Resume a paused session"""
     try:
-        session = SessionService.resume_session(db, session_id)
+        session = await AsyncSessionService.resume_session(db, session_id, user_id)
         return session
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -77,53 +205,400 @@ async def resume_session(
 @router.patch("/{session_id}/complete", response_model=schemas.SessionResponse)
 async def complete_session(
     session_id: int,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
 ):
     """Mark a session as completed"""
     try:
-        session = SessionService.complete_session(db, session_id)
+        session = await AsyncSessionService.complete_session(db, session_id, user_id)
         return session
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/events")
+async def session_events(
+    last_event_id: Optional[str] = Header(None),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Server-Sent Events stream of committed changes to the user's sessions.
+    
+    Events: 'created' (full row), 'updated' (status, pause_count, start/end time,
+    focus_score), 'imported' and 'resync' (refetch history). Reconnecting
+    clients send Last-Event-ID and receive the events they missed.
+    """
+    try:
+        last_seen = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_seen = None
+    subscription = session_event_hub.subscribe(last_seen, owner_id=user_id)
+    
+    return StreamingResponse(
+        _sse_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _sse_stream(subscription) -> AsyncIterator[bytes]:
+    """Encode hub items as SSE frames; StreamingResponse cancels this when the client goes away"""
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            item = await subscription.get(timeout=settings.session_events_keepalive)
+            if item is None:
+                yield b": keepalive\n\n"
+                continue
+            sequence, payload = item
+            yield f"id: {sequence}\nevent: {payload['type']}\ndata: {json.dumps(payload)}\n\n".encode()
+    finally:
+        session_event_hub.unsubscribe(subscription)
+
 @router.get("/history", response_model=List[schemas.SessionHistory])
-async def get_history(db: Session = Depends(get_database)):
-    """Get all sessions with stats"""
-    history = SessionService.get_session_history(db)
-    return history
+async def get_history(
+    request: Request,
+    limit: int = Query(HISTORY_DEFAULT_LIMIT, ge=1, le=HISTORY_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    status: Optional[List[str]] = Query(None),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Get one page of sessions with stats, newest first.
+    
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    Answers If-None-Match with 304 while no session changed.
+    """
+    version = await AsyncSessionService.get_data_version(db, user_id)
+    etag = _version_etag(version, user_id)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=_validator_headers(etag))
+    
+    try:
+        history, next_cursor = await AsyncSessionService.get_session_history_rows(
+            db, limit=limit, cursor=cursor, statuses=status, start=start, end=end, owner_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Rows come straight from the database in schema order, so skip per-row validation
+    headers = _validator_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(history, headers=headers)
+
+@router.get("/search", response_model=List[schemas.SearchHit])
+async def search_sessions(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Find sessions by words in their title, goal or interruption reasons, best match first.
+    
+    Every word must match the start of a word in the session. The cursor for
+    the next page is returned in the X-Next-Cursor header.
+    """
+    version = await AsyncSessionService.get_data_version(db, user_id)
+    etag = _version_etag(version, user_id)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=_validator_headers(etag))
+    
+    try:
+        hits, next_cursor = await AsyncSessionService.search_sessions(
+            db, q, limit=limit, cursor=cursor, owner_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = _validator_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(hits, headers=headers)
 
 @router.get("/report/weekly")
-async def get_weekly_report(db: Session = Depends(get_database)):
+async def get_weekly_report(
+    request: Request,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
     """Get weekly productivity report with focus score"""
-    report = SessionService.get_weekly_report(db)
-    return report
+    return await _cached_json(
+        request, await AsyncSessionService.get_data_version(db, user_id), ("weekly", user_id),
+        lambda: AsyncSessionService.get_weekly_report(db, user_id)
+    )
 
-@router.get("/export/csv")
-async def export_csv(db: Session = Depends(get_database)):
-    """Export all sessions to CSV"""
-    history = SessionService.get_session_history(db)
+@router.get("/report", response_model=schemas.RangeReport)
+async def get_range_report(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    days: Optional[int] = Query(None, ge=1, le=3660),
+    period: Optional[Literal["week", "month", "quarter", "year"]] = None,
+    bucket: Literal["day", "week", "month"] = "day",
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Report over a custom range, a rolling window of days, or the current week/month/quarter/year"""
+    try:
+        window_start, window_end = SessionService.report_window(start=start, end=end, days=days, period=period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=[
-        'id', 'title', 'goal', 'scheduled_duration', 'actual_duration',
-        'status', 'pause_count', 'start_time', 'end_time', 'created_at'
-    ])
-    writer.writeheader()
+    async def compute():
+        report = await AsyncSessionService.get_range_report(db, window_start, window_end, bucket=bucket, owner_id=user_id)
+        return schemas.RangeReport.model_validate(report)
     
-    for session in history:
-        writer.writerow(session)
+    version = await AsyncSessionService.get_data_version(db, user_id)
+    return await _cached_json(request, version, ("range", user_id, start, end, days, period, bucket), compute)
+
+@router.get("/report/team", response_model=schemas.TeamReport)
+async def get_team_report(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    days: Optional[int] = Query(None, ge=1, le=3660),
+    period: Optional[Literal["week", "month", "quarter", "year"]] = None,
+    bucket: Literal["day", "week", "month"] = "day",
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """The range report over every member of the user's workspace, with per-member totals"""
+    try:
+        window_start, window_end = SessionService.report_window(start=start, end=end, days=days, period=period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    output.seek(0)
-    return {
-        "csv_data": output.getvalue()
-    }
+    async def compute():
+        report = await AsyncSessionService.get_team_report(db, window_start, window_end, bucket=bucket, owner_id=user_id)
+        return schemas.TeamReport.model_validate(report)
+    
+    version = await AsyncSessionService.get_team_data_version(db, user_id)
+    return await _cached_json(request, version, ("team", user_id, start, end, days, period, bucket), compute)
+
+def _analytics_window(window: schemas.AnalyticsWindow) -> Tuple[datetime, datetime]:
+    """Resolve an analytics window, the last ANALYTICS_DEFAULT_DAYS days unless one is given"""
+    days = window.days
+    if window.start is None and days is None and window.period is None:
+        days = ANALYTICS_DEFAULT_DAYS
+    try:
+        return SessionService.report_window(start=window.start, end=window.end, days=days, period=window.period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _cached_analytics(
+    request: Request,
+    db: AsyncSession,
+    user_id: int,
+    key: Hashable,
+    compute: Callable[[], Awaitable[object]]
+) -> Response:
+    """_cached_json over user_id's data version for the analytics, which need pyarrow"""
+    try:
+        return await _cached_json(request, await AsyncSessionService.get_data_version(db, user_id), key, compute)
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Analytics require pyarrow")
+
+@router.get("/analytics/focus-scores", response_model=schemas.FocusScoreDistribution)
+async def get_focus_score_distribution(
+    request: Request,
+    window: Annotated[schemas.AnalyticsWindow, Query()],
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Histogram of the focus scores of sessions that ended, in bins of 10"""
+    start, end = _analytics_window(window)
+    
+    async def compute():
+        report = await AsyncSessionService.get_focus_score_distribution(db, start, end, user_id)
+        return schemas.FocusScoreDistribution.model_validate(report)
+    
+    return await _cached_analytics(request, db, user_id, ("focus-scores", user_id, *window.model_dump().values()), compute)
+
+@router.get("/analytics/percentiles", response_model=schemas.SessionPercentiles)
+async def get_percentiles(
+    request: Request,
+    window: Annotated[schemas.AnalyticsWindow, Query()],
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Percentiles of focus score, focused and paused minutes and pauses per ended session"""
+    start, end = _analytics_window(window)
+    
+    async def compute():
+        report = await AsyncSessionService.get_percentiles(db, start, end, user_id)
+        return schemas.SessionPercentiles.model_validate(report)
+    
+    return await _cached_analytics(request, db, user_id, ("percentiles", user_id, *window.model_dump().values()), compute)
+
+@router.get("/analytics/heatmap", response_model=schemas.HourlyHeatmap)
+async def get_hourly_heatmap(
+    request: Request,
+    window: Annotated[schemas.AnalyticsWindow, Query()],
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Sessions started and minutes focused per weekday and hour (UTC)"""
+    start, end = _analytics_window(window)
+    
+    async def compute():
+        report = await AsyncSessionService.get_hourly_heatmap(db, start, end, user_id)
+        return schemas.HourlyHeatmap.model_validate(report)
+    
+    return await _cached_analytics(request, db, user_id, ("heatmap", user_id, *window.model_dump().values()), compute)
+
+@router.get("/analytics/streaks", response_model=schemas.FocusStreaks)
+async def get_streaks(
+    request: Request,
+    window: Annotated[schemas.AnalyticsWindow, Query()],
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Current and longest runs of consecutive days with a completed session"""
+    start, end = _analytics_window(window)
+    
+    async def compute():
+        report = await AsyncSessionService.get_streaks(db, start, end, user_id)
+        return schemas.FocusStreaks.model_validate(report)
+    
+    return await _cached_analytics(request, db, user_id, ("streaks", user_id, *window.model_dump().values()), compute)
+
+@router.get("/analytics/interruptions", response_model=schemas.InterruptionTrends)
+async def get_interruption_trends(
+    request: Request,
+    params: Annotated[schemas.InterruptionTrendsRequest, Query()],
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Interruptions per week or month for the most frequent reasons"""
+    start, end = _analytics_window(params)
+    
+    async def compute():
+        report = await AsyncSessionService.get_interruption_trends(db, start, end, params.bucket, params.top, user_id)
+        return schemas.InterruptionTrends.model_validate(report)
+    
+    return await _cached_analytics(request, db, user_id, ("interruptions", user_id, *params.model_dump().values()), compute)
+
+async def _cached_json(
+    request: Request,
+    version: int,
+    key: Hashable,
+    compute: Callable[[], Awaitable[object]]
+) -> Response:
+    """Serve a JSON body from the report cache for the given data version, computing it on a miss"""
+    entry = report_cache.get(key, version)
+    if entry is None:
+        body = JSONResponse(jsonable_encoder(await compute())).body
+        entry = report_cache.put(key, version, body)
+    
+    headers = _validator_headers(entry.etag)
+    if _not_modified(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+def _version_etag(version: int, user_id: int) -> str:
+    return f'W/"{version}-{user_id}"'
+
+def _validator_headers(etag: str) -> dict:
+    """ETag, with clients told to revalidate before reusing their copy.
+    
+    No Last-Modified: several writes can land within one second, so only the
+    data version tells responses apart.
+    """
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "X-User-Id"}
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+@router.get("/export")
+async def export_sessions(
+    request: Request,
+    params: Annotated[schemas.ExportRequest, Query()],
+    db: Session = Depends(get_database),
+    async_db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Stream sessions or interruptions as CSV, NDJSON, Arrow IPC or Parquet"""
+    return await _export_response(request, db, async_db, params, user_id)
+
+@router.get("/export/csv")
+async def export_csv(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[List[str]] = Query(None),
+    gzip: bool = False,
+    db: Session = Depends(get_database),
+    async_db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Stream sessions as CSV, optionally gzip-compressed"""
+    return await _export_response(
+        request, db, async_db, schemas.ExportRequest(start=start, end=end, status=status, gzip=gzip), user_id
+    )
+
+async def _export_response(
+    request: Request, db: Session, async_db: AsyncSession, params: schemas.ExportRequest, user_id: int
+) -> Response:
+    """Stream an export from the sync session; the data version is read through the async one"""
+    version = await AsyncSessionService.get_data_version(async_db, user_id)
+    etag = _version_etag(version, user_id)
+    headers = _validator_headers(etag)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    # Rows are read lazily, as StreamingResponse pulls chunks in its worker thread
+    try:
+        chunks, media_type, filename = ExportService.open_export(db, params, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError:
+        raise HTTPException(status_code=501, detail=f"{params.format} export requires pyarrow")
+    
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
 
 @router.get("/{session_id}/focus-score")
-async def get_focus_score(session_id: int, db: Session = Depends(get_database)):
+async def get_focus_score(
+    session_id: int,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
     """Get focus score for a specific session"""
-    score = SessionService.calculate_focus_score(db, session_id)
+    score = await AsyncSessionService.calculate_focus_score(db, session_id, user_id)
     return {"session_id": session_id, "focus_score": score}
 
+@router.get("/{session_id}/timeline", response_model=schemas.SessionTimeline)
+async def get_session_timeline(
+    session_id: int,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Every start, pause, resume and completion of a session, with running focused and paused seconds"""
+    timeline = await AsyncSessionService.get_session_timeline(db, session_id, user_id)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return timeline
+
+@router.get("/{session_id:int}", response_model=schemas.SessionDetail)
+async def get_session(
+    session_id: int,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Get one session with its interruptions"""
+    session = await AsyncSessionService.get_session_detail(db, session_id, user_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
 @router.options("/", response_class=Response)
 async def options_sessions():
     """Handle CORS preflight requests for /sessions/"""
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas
+from app.routers.sessions import get_async_database, get_current_user_id
+from app.services.user_service import UserService
+
+router = APIRouter(tags=["users"])
+
+@router.post("/workspaces", response_model=schemas.WorkspaceResponse, status_code=201)
+async def create_workspace(
+    workspace: schemas.WorkspaceCreate,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Create a workspace whose members share team reports; administrator only"""
+    try:
+        return await db.run_sync(UserService.create_workspace, workspace, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+@router.post("/users", response_model=schemas.UserResponse, status_code=201)
+async def create_user(
+    user: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_database),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Add a user to the caller's workspace (any workspace for the administrator); send its id as X-User-Id to act as that user"""
+    try:
+        return await db.run_sync(UserService.create_user, user, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/users/me", response_model=schemas.UserResponse)
+async def get_me(db: AsyncSession = Depends(get_async_database), user_id: int = Depends(get_current_user_id)):
+    """The user the request acts as"""
+    return await db.run_sync(UserService.get_user, user_id)
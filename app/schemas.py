@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Annotated, Optional, List, Literal, Union
+from datetime import date, datetime
 
 # Session Schemas
 class SessionBase(BaseModel):
@@ -20,10 +20,15 @@ class SessionResponse(SessionBase):
     status: str
     pause_count: int
     created_at: datetime
+    focused_seconds: int = 0  # running totals, up to the last transition
+    paused_seconds: int = 0
 
 class SessionHistory(SessionResponse):
     actual_duration: Optional[int] = None  # in minutes
 
+class SearchHit(SessionHistory):
+    score: float  # relevance, higher is better
+
 # Interruption Schemas
 class InterruptionCreate(BaseModel):
     reason: str
@@ -36,6 +41,27 @@ class InterruptionResponse(BaseModel):
     pause_time: datetime
     resume_time: Optional[datetime]
 
+class TimelineEntry(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    kind: Literal['start', 'pause', 'resume', 'complete', 'expire']
+    status: str
+    occurred_at: datetime
+    reason: Optional[str] = None
+    focused_seconds: int
+    paused_seconds: int
+
+class SessionTimeline(BaseModel):
+    session_id: int
+    status: str
+    focused_seconds: int  # including the segment in progress
+    paused_seconds: int
+    events: List[TimelineEntry]
+
+class SessionDetail(SessionResponse):
+    focus_score: Optional[float] = None
+    interruptions: List[InterruptionResponse] = []
+
 # Pause Request
 class PauseRequest(BaseModel):
     reason: str
@@ -54,11 +80,202 @@ class WeeklyReport(BaseModel):
     week_start: datetime
     total_sessions: int
     total_focus_time: int  # minutes
+    total_focused_time: int  # minutes, excluding pauses
+    total_paused_time: int  # minutes
+    average_focus_score: float
+    top_interruption_reason: Optional[str]
+    focus_breakdown: dict
+
+# Bulk Import
+class InterruptionImport(BaseModel):
+    reason: str
+    pause_time: datetime
+    resume_time: Optional[datetime] = None
+
+class SessionImport(SessionCreate):
+    status: Literal['scheduled', 'active', 'paused', 'completed', 'interrupted', 'abandoned', 'overdue'] = 'scheduled'
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    pause_count: Optional[int] = Field(None, ge=0, description="Defaults to the number of interruptions")
+    interruptions: List[InterruptionImport] = []
+    
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.end_time and not self.start_time:
+            raise ValueError("end_time requires start_time")
+        if self.start_time and self.end_time and self.end_time < self.start_time:
+            raise ValueError("end_time is before start_time")
+        if self.end_time and self.status in ('scheduled', 'active', 'paused'):
+            raise ValueError(f"a {self.status} session cannot have an end_time")
+        if self.start_time and self.status == 'scheduled':
+            raise ValueError("a scheduled session cannot have a start_time")
+        return self
+
+class BulkItemError(BaseModel):
+    index: int
+    session_id: Optional[int] = None
+    error: str
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    errors: List[BulkItemError]
+
+class BatchTransitionRequest(BaseModel):
+    action: Literal["start", "pause", "resume", "complete"]
+    session_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    reason: Optional[str] = None  # required for pause
+    
+    @model_validator(mode="after")
+    def check_reason(self):
+        if self.action == "pause" and not self.reason:
+            raise ValueError("reason is required to pause sessions")
+        return self
+
+class BatchTransitionResult(BaseModel):
+    updated: List[int]
+    errors: List[BulkItemError]
+
+# Range Report
+class ReportTotals(BaseModel):
+    total_sessions: int
+    total_focus_time: int  # minutes from start to end, pauses included
+    total_focused_time: int  # minutes, excluding pauses
+    total_paused_time: int  # minutes
+    total_pauses: int
     average_focus_score: float
     top_interruption_reason: Optional[str]
     focus_breakdown: dict
 
-# CSV Export
+class ReportBucket(ReportTotals):
+    bucket_start: date
+
+class RangeReport(ReportTotals):
+    start: datetime
+    end: datetime
+    bucket: Literal["day", "week", "month"]
+    buckets: List[ReportBucket]
+
+class MemberTotals(ReportTotals):
+    user_id: int
+    name: str
+
+class TeamReport(RangeReport):
+    workspace_id: int
+    members: List[MemberTotals]
+
+# Export
 class ExportRequest(BaseModel):
-    format: str = "csv"
+    format: Literal["csv", "ndjson", "arrow", "parquet"] = "csv"
+    dataset: Literal["sessions", "interruptions"] = "sessions"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    status: Optional[List[str]] = None
+    gzip: bool = False
+
+# Background jobs
+class ReportJob(BaseModel):
+    kind: Literal["report"]
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    days: Optional[int] = Field(None, ge=1, le=3660)
+    period: Optional[Literal["week", "month", "quarter", "year"]] = None
+    bucket: Literal["day", "week", "month"] = "day"
 
+class ExportJob(ExportRequest):
+    kind: Literal["export"]
+
+JobRequest = Annotated[Union[ReportJob, ExportJob], Field(discriminator="kind")]
+
+class JobStatus(BaseModel):
+    id: str
+    kind: Literal["report", "export"]
+    state: Literal["queued", "running", "done", "failed"]
+    cached: bool  # answered from a stored result without running
+    rows_done: Optional[int] = None  # exports only, while running
+    rows_total: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    result_url: Optional[str] = None  # set once the job is done
+
+# Analytics
+class AnalyticsWindow(BaseModel):
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    days: Optional[int] = Field(None, ge=1, le=3660)
+    period: Optional[Literal["week", "month", "quarter", "year"]] = None
+
+class InterruptionTrendsRequest(AnalyticsWindow):
+    bucket: Literal["week", "month"] = "month"
+    top: int = Field(10, ge=1, le=100)
+
+class AnalyticsRange(BaseModel):
+    start: datetime
+    end: datetime
+
+class FocusScoreBin(BaseModel):
+    lower: int
+    upper: int
+    count: int
+
+class FocusScoreDistribution(AnalyticsRange):
+    count: int
+    mean: float
+    stddev: float
+    bins: List[FocusScoreBin]
+
+class SessionPercentiles(AnalyticsRange):
+    count: int
+    percentiles: List[int]
+    focus_score: List[Optional[float]]
+    focused_minutes: List[Optional[float]]
+    paused_minutes: List[Optional[float]]
+    pause_count: List[Optional[float]]
+
+class HourlyHeatmap(AnalyticsRange):
+    sessions: List[List[int]]  # [weekday, Monday first][hour]
+    focused_minutes: List[List[int]]
+
+class FocusStreaks(AnalyticsRange):
+    active_days: int
+    current: int
+    longest: int
+    longest_start: Optional[date]
+    longest_end: Optional[date]
+
+class ReasonCount(BaseModel):
+    reason: str
+    count: int
+
+class InterruptionTrendBucket(BaseModel):
+    bucket_start: date
+    total: int
+    counts: dict
+
+class InterruptionTrends(AnalyticsRange):
+    bucket: Literal["week", "month"]
+    total: int
+    reasons: List[ReasonCount]
+    buckets: List[InterruptionTrendBucket]
+
+
+# Users and workspaces
+class WorkspaceCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+
+class WorkspaceResponse(WorkspaceCreate):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    created_at: datetime
+
+class UserCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    workspace_id: int
+
+class UserResponse(UserCreate):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    created_at: datetime
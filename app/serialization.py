@@ -0,0 +1,42 @@
+"""Fast JSON encoding for large responses.
+
+Uses orjson when it is installed and falls back to the standard library, so
+the output is the same either way: compact JSON with naive datetimes written
+as isoformat() strings, like FastAPI's default encoder.
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Encode trusted data (dicts, lists, dataclasses, scalars, datetimes) to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+def dumps_line(content: Any) -> bytes:
+    """dumps() followed by a newline, for NDJSON"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_APPEND_NEWLINE)
+    return dumps(content) + b"\n"
+
+class FastJSONResponse(Response):
+    """JSON response for data already shaped by the service layer: no per-row validation"""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
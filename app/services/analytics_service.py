@@ -0,0 +1,320 @@
+"""Long-range productivity statistics computed over columnar data.
+
+Each statistic selects only the columns it needs for one user's window into
+an Arrow table (the load_* functions), then computes with pyarrow.compute
+kernels instead of a Python loop per row (the functions named after the
+statistic). As for the columnar exports, pyarrow is imported lazily: without
+it these methods raise ImportError.
+
+Windows select sessions by created_at (interruptions by pause_time), like the
+range reports, and read the archive tier too when the window reaches back to
+it. Days, weeks and hours are UTC.
+"""
+from datetime import date, datetime, timedelta
+from typing import List
+from sqlalchemy import String, join, select, type_coerce
+from sqlalchemy.orm import Session
+from app.models import Session as SessionModel, Interruption, ArchivedInterruption, DEFAULT_USER_ID
+from app.services import expressions, retention
+from app.services.session_service import as_utc_naive
+
+# Rows fetched per query partition and Arrow record batch
+LOAD_BATCH_SIZE = 50000
+
+# Focus scores run from 0 to 100; a score of exactly 100 falls in the last bin
+FOCUS_SCORE_BIN_WIDTH = 10
+FOCUS_SCORE_BINS = 100 // FOCUS_SCORE_BIN_WIDTH
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+def _load_table(db: Session, fields: List[tuple], *conditions, source=SessionModel):
+    """Select (name, column, Arrow type) fields from source where conditions hold, into an Arrow table.
+
+    Rows are read a partition at a time through the Core connection, skipping
+    ORM row processing. SQLite stores timestamps as ISO text: those columns are
+    fetched as text and parsed by Arrow, instead of one datetime per row.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    text_timestamps = db.get_bind().dialect.name == "sqlite"
+    columns, fetched, parsed = [], [], []
+    for name, column, arrow_type in fields:
+        if text_timestamps and pa.types.is_timestamp(arrow_type):
+            columns.append(type_coerce(column, String))
+            fetched.append((name, pa.string()))
+        else:
+            columns.append(column)
+            fetched.append((name, arrow_type))
+        parsed.append((name, arrow_type))
+
+    statement = select(*columns).select_from(source).where(*conditions)
+    schema = pa.schema(fetched)
+    batches = []
+    result = db.connection().execute(statement.execution_options(yield_per=LOAD_BATCH_SIZE))
+    for partition in result.partitions():
+        batches.append(pa.record_batch(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*partition), schema)], schema=schema
+        ))
+    table = pa.Table.from_batches(batches, schema=schema)
+    return pa.table([pc.cast(table[name], arrow_type) for name, arrow_type in parsed], schema=pa.schema(parsed))
+
+def _window(source, start: datetime, end: datetime, owner_id: int) -> tuple:
+    """Conditions selecting owner_id's sessions created in [start, end) from source, live or archived"""
+    return source.owner_id == owner_id, source.created_at >= start, source.created_at < end
+
+def _load_sessions(db: Session, start: datetime, end: datetime, owner_id: int, fields, *conditions):
+    """_load_table over every tier the window reaches; fields and conditions are functions of the session model"""
+    import pyarrow as pa
+
+    return pa.concat_tables([
+        _load_table(
+            db, fields(source), *_window(source, start, end, owner_id), *(condition(source) for condition in conditions),
+            source=source
+        )
+        for source, _ in retention.session_tiers(db, owner_id, start)
+    ])
+
+def _grouped_counts(keys, values=None) -> dict:
+    """{key: (count, sum of values)} over parallel Arrow arrays"""
+    import pyarrow as pa
+
+    table = pa.table({"key": keys, "value": values if values is not None else pa.nulls(len(keys), pa.int64())})
+    grouped = table.group_by("key").aggregate([("key", "count"), ("value", "sum")])
+    return {
+        key: (count, total or 0)
+        for key, count, total in zip(
+            grouped["key"].to_pylist(), grouped["key_count"].to_pylist(), grouped["value_sum"].to_pylist()
+        )
+    }
+
+def load_ended_sessions(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID):
+    """Focus score, focused and paused seconds and pauses of the window's sessions that ended"""
+    import pyarrow as pa
+
+    return _load_sessions(
+        db, start, end, owner_id,
+        lambda source: [
+            ("focus_score", source.focus_score, pa.float64()),
+            ("focused_seconds", source.focused_seconds, pa.int64()),
+            ("paused_seconds", source.paused_seconds, pa.int64()),
+            ("pause_count", source.pause_count, pa.int64())
+        ],
+        lambda source: source.end_time.isnot(None)
+    )
+
+def load_started_sessions(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID):
+    """Start time and focused seconds (counted once ended, as in the rollups) of the window's started sessions"""
+    import pyarrow as pa
+
+    return _load_sessions(
+        db, start, end, owner_id,
+        lambda source: [
+            ("start_time", source.start_time, pa.timestamp("us")),
+            ("focused_seconds", expressions.ended_seconds(source.end_time, source.focused_seconds), pa.int64())
+        ],
+        lambda source: source.start_time.isnot(None)
+    )
+
+def load_completed_sessions(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID):
+    """Creation times of the window's completed sessions"""
+    import pyarrow as pa
+
+    return _load_sessions(
+        db, start, end, owner_id,
+        lambda source: [("created_at", source.created_at, pa.timestamp("us"))],
+        lambda source: source.status == 'completed'
+    )
+
+def load_interruptions(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID):
+    """Pause time and reason of owner_id's interruptions paused in [start, end)"""
+    import pyarrow as pa
+
+    tiers = [(join(Interruption, SessionModel, Interruption.session_id == SessionModel.id), Interruption, SessionModel)]
+    if retention.interruptions_span_archive(db, owner_id, start):
+        # Archived interruptions carry their owner
+        tiers.append((ArchivedInterruption, ArchivedInterruption, ArchivedInterruption))
+    return pa.concat_tables([
+        _load_table(
+            db,
+            [("pause_time", interruptions.pause_time, pa.timestamp("us")), ("reason", interruptions.reason, pa.string())],
+            owned.owner_id == owner_id,
+            interruptions.pause_time >= start,
+            interruptions.pause_time < end,
+            source=source
+        )
+        for source, interruptions, owned in tiers
+    ])
+
+def focus_score_distribution(table) -> dict:
+    """Histogram in bins of FOCUS_SCORE_BIN_WIDTH, mean and standard deviation of focus_score"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    scores = table["focus_score"].combine_chunks().drop_null()
+    bins = pc.cast(pc.floor(pc.divide(scores, FOCUS_SCORE_BIN_WIDTH)), pa.int64())
+    counts = _grouped_counts(pc.min_element_wise(pc.max_element_wise(bins, 0), FOCUS_SCORE_BINS - 1))
+    return {
+        "count": len(scores),
+        "mean": round(pc.mean(scores).as_py() or 0, 2),
+        "stddev": round(pc.stddev(scores).as_py() or 0, 2),
+        "bins": [
+            {
+                "lower": index * FOCUS_SCORE_BIN_WIDTH,
+                "upper": (index + 1) * FOCUS_SCORE_BIN_WIDTH,
+                "count": counts.get(index, (0, 0))[0]
+            }
+            for index in range(FOCUS_SCORE_BINS)
+        ]
+    }
+
+def percentiles(table) -> dict:
+    """PERCENTILES of focus score, focused and paused minutes and pause count"""
+    import pyarrow.compute as pc
+
+    quantiles = [percentile / 100 for percentile in PERCENTILES]
+
+    def percentiles_of(values, scale=1):
+        if len(values) == 0:
+            return [None] * len(PERCENTILES)
+        # Linear interpolation between closest ranks, as numpy.percentile does by default
+        return [
+            round(value / scale, 2) for value in pc.quantile(values, q=quantiles, interpolation="linear").to_pylist()
+        ]
+
+    return {
+        "count": table.num_rows,
+        "percentiles": list(PERCENTILES),
+        "focus_score": percentiles_of(table["focus_score"]),
+        "focused_minutes": percentiles_of(table["focused_seconds"], 60),
+        "paused_minutes": percentiles_of(table["paused_seconds"], 60),
+        "pause_count": percentiles_of(table["pause_count"])
+    }
+
+def hourly_heatmap(table) -> dict:
+    """Sessions and focused minutes per weekday (Monday first) and hour of start_time"""
+    import pyarrow.compute as pc
+
+    started = table["start_time"]
+    cells = pc.add(pc.multiply(pc.day_of_week(started), 24), pc.hour(started))
+    totals = _grouped_counts(cells.combine_chunks(), table["focused_seconds"].combine_chunks())
+    return {
+        "sessions": [[totals.get(day * 24 + hour, (0, 0))[0] for hour in range(24)] for day in range(7)],
+        "focused_minutes": [[totals.get(day * 24 + hour, (0, 0))[1] // 60 for hour in range(24)] for day in range(7)]
+    }
+
+def streaks(table, end: datetime) -> dict:
+    """Runs of consecutive days in created_at; the current run must reach end's last day or the day before"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # Days as ordinal numbers, so consecutive days differ by one
+    days = pc.unique(pc.cast(pc.cast(table["created_at"], pa.date32()), pa.int32()).combine_chunks())
+    days = pc.take(days, pc.sort_indices(days))
+    result = {"active_days": len(days), "current": 0, "longest": 0, "longest_start": None, "longest_end": None}
+    if not len(days):
+        return result
+
+    breaks = pc.fill_null(pc.not_equal(pc.pairwise_diff(days), 1), True)
+    run_starts = pc.indices_nonzero(breaks)
+    run_ends = pa.concat_arrays([run_starts[1:], pa.array([len(days)], run_starts.type)])
+    lengths = pc.subtract(run_ends, run_starts)
+
+    epoch = date(1970, 1, 1)
+    longest = pc.index(lengths, pc.max(lengths)).as_py()
+    first_day = epoch + timedelta(days=days[run_starts[longest].as_py()].as_py())
+    last_day = (end - timedelta(microseconds=1)).date()
+    latest_day = epoch + timedelta(days=days[-1].as_py())
+    result.update(
+        longest=lengths[longest].as_py(),
+        longest_start=first_day,
+        longest_end=first_day + timedelta(days=lengths[longest].as_py() - 1),
+        current=lengths[-1].as_py() if latest_day >= last_day - timedelta(days=1) else 0
+    )
+    return result
+
+def interruption_trends(table, bucket: str = "month", top: int = 10) -> dict:
+    """Interruptions per week or month of pause_time; per-reason counts for the top most frequent reasons"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    bucket_starts = pc.cast(pc.floor_temporal(table["pause_time"], unit=bucket, week_starts_monday=True), pa.date32())
+    totals = _grouped_counts(table["reason"].combine_chunks())
+    reasons = sorted(totals, key=lambda reason: (-totals[reason][0], reason))[:top]
+    per_bucket = _grouped_counts(bucket_starts.combine_chunks())
+
+    kept = pa.table({"bucket_start": bucket_starts, "reason": table["reason"]}).filter(
+        pc.is_in(table["reason"], value_set=pa.array(reasons, pa.string()))
+    )
+    grouped = kept.group_by(["bucket_start", "reason"]).aggregate([("reason", "count")])
+    counts = {}
+    for bucket_start, reason, count in zip(
+        grouped["bucket_start"].to_pylist(), grouped["reason"].to_pylist(), grouped["reason_count"].to_pylist()
+    ):
+        counts.setdefault(bucket_start, {})[reason] = count
+
+    return {
+        "bucket": bucket,
+        "total": table.num_rows,
+        "reasons": [{"reason": reason, "count": totals[reason][0]} for reason in reasons],
+        "buckets": [
+            {"bucket_start": bucket_start, "total": per_bucket[bucket_start][0], "counts": counts.get(bucket_start, {})}
+            for bucket_start in sorted(per_bucket)
+        ]
+    }
+
+class AnalyticsService:
+
+    @staticmethod
+    def get_focus_score_distribution(
+        db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Histogram and summary of the focus scores of sessions that ended"""
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        table = load_ended_sessions(db, start, end, owner_id)
+        return {"start": start, "end": end, **focus_score_distribution(table)}
+
+    @staticmethod
+    def get_percentiles(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Percentiles of focus score, focused and paused minutes and pauses, over sessions that ended"""
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        table = load_ended_sessions(db, start, end, owner_id)
+        return {"start": start, "end": end, **percentiles(table)}
+
+    @staticmethod
+    def get_hourly_heatmap(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Sessions started and minutes focused per weekday (Monday first) and hour of their start"""
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        table = load_started_sessions(db, start, end, owner_id)
+        return {"start": start, "end": end, **hourly_heatmap(table)}
+
+    @staticmethod
+    def get_streaks(db: Session, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Runs of consecutive days with at least one completed session.
+
+        Streaks are cut at the window's edges. The current streak is the run
+        that reaches the window's last day, or the day before it so that a
+        streak is not broken until its day has passed.
+        """
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        table = load_completed_sessions(db, start, end, owner_id)
+        return {"start": start, "end": end, **streaks(table, end)}
+
+    @staticmethod
+    def get_interruption_trends(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        bucket: str = "month",
+        top: int = 10,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Interruptions per reason per week or month, for the top most frequent reasons.
+
+        Interruptions with other reasons are counted in each bucket's total only.
+        """
+        if bucket not in ("week", "month"):
+            raise ValueError(f"Unknown bucket: {bucket}")
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        table = load_interruptions(db, start, end, owner_id)
+        return {"start": start, "end": end, **interruption_trends(table, bucket, top)}
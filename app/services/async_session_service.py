@@ -0,0 +1,191 @@
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Session as SessionModel, DEFAULT_USER_ID
+from app.services.session_service import SessionService
+from app.services.analytics_service import AnalyticsService
+from app.services.bulk_service import BulkService
+from app.services import group_commit
+from app.services.read_models import SearchHit, SessionRow
+from app.services.search_service import SearchService
+from app import schemas
+
+class AsyncSessionService:
+    """Asyncio entry points for SessionService.
+    
+    Each method runs the synchronous implementation through AsyncSession.run_sync:
+    the business rules stay in one place while every query goes through the async
+    driver, so awaiting them never blocks the event loop. With write batching
+    enabled, lifecycle transitions go through the group-commit writer instead.
+    """
+    
+    @staticmethod
+    async def _transition(db: AsyncSession, method: Callable, *args, **kwargs) -> SessionModel:
+        if settings.write_batch_window_ms > 0:
+            committer = group_commit.committer_for(
+                db, settings.write_batch_window_ms / 1000, settings.write_batch_max_size
+            )
+            return await committer.submit(method, *args, **kwargs)
+        return await db.run_sync(method, *args, **kwargs)
+    
+    @staticmethod
+    async def create_session(
+        db: AsyncSession, session_data: schemas.SessionCreate, owner_id: int = DEFAULT_USER_ID
+    ) -> SessionModel:
+        """Create a new scheduled session"""
+        return await db.run_sync(SessionService.create_session, session_data, owner_id)
+    
+    @staticmethod
+    async def start_session(db: AsyncSession, session_id: int, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
+        """Start a scheduled session"""
+        return await AsyncSessionService._transition(db, SessionService.start_session, session_id, owner_id=owner_id)
+    
+    @staticmethod
+    async def pause_session(db: AsyncSession, session_id: int, reason: str, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
+        """Pause an active session"""
+        return await AsyncSessionService._transition(
+            db, SessionService.pause_session, session_id, reason, owner_id=owner_id
+        )
+    
+    @staticmethod
+    async def resume_session(db: AsyncSession, session_id: int, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
+        """Resume a paused session"""
+        return await AsyncSessionService._transition(db, SessionService.resume_session, session_id, owner_id=owner_id)
+    
+    @staticmethod
+    async def complete_session(db: AsyncSession, session_id: int, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
+        """Complete a session"""
+        return await AsyncSessionService._transition(db, SessionService.complete_session, session_id, owner_id=owner_id)
+    
+    @staticmethod
+    async def get_session_history_page(
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[list, Optional[str]]:
+        """Get one keyset page of history and the cursor for the next page"""
+        return await db.run_sync(
+            SessionService.get_session_history_page,
+            limit=limit, cursor=cursor, statuses=statuses, start=start, end=end, owner_id=owner_id
+        )
+    
+    @staticmethod
+    async def get_session_history_rows(
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[List[SessionRow], Optional[str]]:
+        """One history page as read-model rows"""
+        return await db.run_sync(
+            SessionService.get_session_history_rows,
+            limit=limit, cursor=cursor, statuses=statuses, start=start, end=end, owner_id=owner_id
+        )
+    
+    @staticmethod
+    async def search_sessions(
+        db: AsyncSession,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[List[SearchHit], Optional[str]]:
+        """One page of ranked search hits and the cursor for the next page"""
+        return await db.run_sync(SearchService.search_sessions, query, limit=limit, cursor=cursor, owner_id=owner_id)
+    
+    @staticmethod
+    async def get_session_detail(db: AsyncSession, session_id: int, owner_id: int = DEFAULT_USER_ID) -> Optional[SessionModel]:
+        """A session with its interruptions"""
+        return await db.run_sync(SessionService.get_session_detail, session_id, owner_id)
+    
+    @staticmethod
+    async def get_session_timeline(db: AsyncSession, session_id: int, owner_id: int = DEFAULT_USER_ID) -> Optional[dict]:
+        """A session's transitions with live running totals"""
+        return await db.run_sync(SessionService.get_session_timeline, session_id, owner_id)
+    
+    @staticmethod
+    async def get_data_version(db: AsyncSession, owner_id: int = DEFAULT_USER_ID) -> int:
+        """Committed data version of owner_id's sessions"""
+        return await db.run_sync(SessionService.get_data_version, owner_id)
+    
+    @staticmethod
+    async def get_team_data_version(db: AsyncSession, owner_id: int = DEFAULT_USER_ID) -> int:
+        """Combined data version of owner_id's workspace"""
+        return await db.run_sync(SessionService.get_team_data_version, owner_id)
+    
+    @staticmethod
+    async def calculate_focus_score(db: AsyncSession, session_id: int, owner_id: int = DEFAULT_USER_ID) -> float:
+        """Calculate focus score for a session"""
+        return await db.run_sync(SessionService.calculate_focus_score, session_id, owner_id)
+    
+    @staticmethod
+    async def get_weekly_report(db: AsyncSession, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Generate weekly productivity report"""
+        return await db.run_sync(SessionService.get_weekly_report, owner_id)
+    
+    @staticmethod
+    async def get_range_report(
+        db: AsyncSession, start: datetime, end: datetime, bucket: str = "day", owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Productivity report over [start, end) grouped into buckets"""
+        return await db.run_sync(SessionService.get_range_report, start, end, bucket, owner_id)
+    
+    @staticmethod
+    async def get_team_report(
+        db: AsyncSession, start: datetime, end: datetime, bucket: str = "day", owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Range report over the user's whole workspace"""
+        return await db.run_sync(SessionService.get_team_report, start, end, bucket, owner_id)
+    
+    @staticmethod
+    async def get_focus_score_distribution(
+        db: AsyncSession, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Focus score histogram over [start, end)"""
+        return await db.run_sync(AnalyticsService.get_focus_score_distribution, start, end, owner_id)
+    
+    @staticmethod
+    async def get_percentiles(db: AsyncSession, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Percentiles of per-session statistics over [start, end)"""
+        return await db.run_sync(AnalyticsService.get_percentiles, start, end, owner_id)
+    
+    @staticmethod
+    async def get_hourly_heatmap(db: AsyncSession, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Sessions and focused minutes per weekday and hour over [start, end)"""
+        return await db.run_sync(AnalyticsService.get_hourly_heatmap, start, end, owner_id)
+    
+    @staticmethod
+    async def get_streaks(db: AsyncSession, start: datetime, end: datetime, owner_id: int = DEFAULT_USER_ID) -> dict:
+        """Runs of days with a completed session over [start, end)"""
+        return await db.run_sync(AnalyticsService.get_streaks, start, end, owner_id)
+    
+    @staticmethod
+    async def get_interruption_trends(
+        db: AsyncSession, start: datetime, end: datetime, bucket: str = "month", top: int = 10,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Interruptions per reason per week or month over [start, end)"""
+        return await db.run_sync(AnalyticsService.get_interruption_trends, start, end, bucket, top, owner_id)
+    
+    @staticmethod
+    async def import_sessions(
+        db: AsyncSession, items: List[Tuple[int, schemas.SessionImport]], owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[int, List[dict]]:
+        """Insert a chunk of imported sessions in one transaction"""
+        return await db.run_sync(BulkService.import_sessions, items, owner_id)
+    
+    @staticmethod
+    async def transition_sessions(
+        db: AsyncSession, action: str, session_ids: List[int], reason: Optional[str] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Apply one lifecycle action to many sessions"""
+        return await db.run_sync(BulkService.transition_sessions, action, session_ids, reason, owner_id=owner_id)
@@ -0,0 +1,186 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models import Session as SessionModel, Interruption, DEFAULT_USER_ID
+from app.services import data_version, rollups, session_events, timeline
+from app.services.session_service import SessionService, as_utc_naive
+from app import schemas
+
+# Sessions inserted per transaction and transitions applied per commit
+IMPORT_CHUNK_SIZE = 1000
+TRANSITION_CHUNK_SIZE = 500
+
+def describe_validation_error(error: ValidationError) -> str:
+    """One-line summary of a pydantic validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'body'}: {err['msg']}" for err in error.errors()
+    )
+
+class BulkService:
+
+    @staticmethod
+    def parse_import_item(raw) -> schemas.SessionImport:
+        """Validate one imported session given as a dict or a JSON document"""
+        try:
+            if isinstance(raw, (str, bytes)):
+                return schemas.SessionImport.model_validate_json(raw)
+            return schemas.SessionImport.model_validate(raw)
+        except ValidationError as e:
+            raise ValueError(describe_validation_error(e))
+
+    @staticmethod
+    def import_sessions(
+        db: Session, items: List[Tuple[int, schemas.SessionImport]], owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[int, List[dict]]:
+        """Insert a chunk of sessions and their interruptions in one transaction.
+
+        items pairs each session with its position in the request. If the chunk
+        is rejected by the database, rows are retried one by one so the result
+        names exactly which items failed. Returns (inserted, errors).
+        """
+        if not items:
+            return 0, []
+        try:
+            inserted = BulkService._insert_sessions(db, [item for _, item in items], owner_id)
+            db.commit()
+            return inserted, []
+        except SQLAlchemyError as e:
+            db.rollback()
+            if len(items) == 1:
+                return 0, [{"index": items[0][0], "error": str(getattr(e, "orig", None) or e)}]
+
+        inserted, errors = 0, []
+        for item in items:
+            count, item_errors = BulkService.import_sessions(db, [item], owner_id)
+            inserted += count
+            errors += item_errors
+        return inserted, errors
+
+    @staticmethod
+    def _insert_sessions(db: Session, items: List[schemas.SessionImport], owner_id: int) -> int:
+        now = datetime.utcnow().replace(microsecond=0)
+        # Rebuild each session's timeline and running totals from its historical times
+        replays = [
+            timeline.replay(
+                item.status, as_utc_naive(item.start_time), as_utc_naive(item.end_time),
+                [(i.reason, as_utc_naive(i.pause_time), as_utc_naive(i.resume_time)) for i in item.interruptions]
+            )
+            for item in items
+        ]
+        rows = [
+            {
+                "owner_id": owner_id,
+                "title": item.title,
+                "goal": item.goal,
+                "scheduled_duration": item.scheduled_duration,
+                "status": item.status,
+                "start_time": as_utc_naive(item.start_time),
+                "end_time": as_utc_naive(item.end_time),
+                "pause_count": item.pause_count if item.pause_count is not None else len(item.interruptions),
+                "created_at": as_utc_naive(item.created_at) or now,
+                "due_at": SessionService.compute_due_at(
+                    item.status, as_utc_naive(item.start_time), item.scheduled_duration,
+                    max(
+                        (as_utc_naive(i.pause_time) for i in item.interruptions if i.resume_time is None),
+                        default=None
+                    )
+                ),
+                "focused_seconds": focused,
+                "paused_seconds": paused,
+                "state_changed_at": changed_at,
+            }
+            for item, (_, focused, paused, changed_at) in zip(items, replays)
+        ]
+
+        # Core inserts skip ORM bookkeeping: one multi-row INSERT per batch, ids in parameter order
+        sessions_table = SessionModel.__table__
+        ids = db.execute(
+            sessions_table.insert().returning(sessions_table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+
+        interruption_rows = [
+            {
+                "session_id": session_id,
+                "reason": interruption.reason,
+                "pause_time": as_utc_naive(interruption.pause_time),
+                "resume_time": as_utc_naive(interruption.resume_time),
+            }
+            for session_id, item in zip(ids, items)
+            for interruption in item.interruptions
+        ]
+        if interruption_rows:
+            db.execute(Interruption.__table__.insert(), interruption_rows)
+        timeline.record(db, (
+            dict(entry, session_id=session_id)
+            for session_id, (entries, _, _, _) in zip(ids, replays)
+            for entry in entries
+        ))
+
+        rollups.record_bulk(
+            db,
+            (
+                rollups.make_contribution(
+                    owner_id, row["created_at"], row["status"], row["start_time"], row["end_time"],
+                    row["pause_count"], row["scheduled_duration"], row["focused_seconds"], row["paused_seconds"]
+                )
+                for row in rows
+            ),
+            (
+                (owner_id, row["created_at"].date(), interruption.reason)
+                for row, item in zip(rows, items)
+                for interruption in item.interruptions
+            )
+        )
+        data_version.bump(db, owner_id)
+        # Imports can be large: tell listeners to refetch instead of sending every row
+        session_events.record(db, {"type": "imported", "owner_id": owner_id, "count": len(ids)})
+        return len(ids)
+
+    @staticmethod
+    def transition_sessions(
+        db: Session,
+        action: str,
+        session_ids: List[int],
+        reason: Optional[str] = None,
+        chunk_size: int = TRANSITION_CHUNK_SIZE,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Apply one lifecycle action to many of owner_id's sessions, committing once per chunk"""
+        transitions = {
+            "start": lambda session_id: SessionService.start_session(db, session_id, commit=False, owner_id=owner_id),
+            "pause": lambda session_id: SessionService.pause_session(
+                db, session_id, reason, commit=False, owner_id=owner_id
+            ),
+            "resume": lambda session_id: SessionService.resume_session(db, session_id, commit=False, owner_id=owner_id),
+            "complete": lambda session_id: SessionService.complete_session(
+                db, session_id, commit=False, owner_id=owner_id
+            ),
+        }
+        if action not in transitions:
+            raise ValueError(f"Unknown action: {action}")
+        apply = transitions[action]
+
+        updated, errors = [], []
+        indexed = list(enumerate(session_ids))
+        for offset in range(0, len(indexed), chunk_size):
+            chunk = indexed[offset:offset + chunk_size]
+            done, rejected = [], []
+            try:
+                for index, session_id in chunk:
+                    try:
+                        apply(session_id)
+                        done.append(session_id)
+                    except ValueError as e:
+                        rejected.append({"index": index, "session_id": session_id, "error": str(e)})
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                message = str(getattr(e, "orig", None) or e)
+                errors += [{"index": index, "session_id": session_id, "error": message} for index, session_id in chunk]
+                continue
+            updated += done
+            errors += rejected
+
+        return {"updated": updated, "errors": errors}
@@ -0,0 +1,47 @@
+"""Per-owner change counters used to validate cached reads.
+
+Every SessionService/BulkService write calls bump() inside its transaction
+for the owners whose sessions it changed, so a counter moves exactly when
+that owner's committed data does, for every worker process. Writers for
+different owners never touch the same row and so never wait on each other.
+Reading a version touches the counter table only, never the sessions table;
+a team's version is the sum of its members' counters.
+"""
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import DataVersion
+from app.services import expressions
+
+def bump(db: Session, *owner_ids: int) -> None:
+    """Advance each owner's counter once per transaction"""
+    bumped = db.info.setdefault("data_version_bumped", set())
+    dialect = db.get_bind().dialect.name
+    # Ascending order, so writers that touch several owners lock their rows in the same order
+    for owner_id in sorted(set(owner_ids) - bumped):
+        if dialect in ("sqlite", "postgresql"):
+            upsert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            db.execute(upsert(DataVersion).values(owner_id=owner_id, version=1).on_conflict_do_update(
+                index_elements=[DataVersion.owner_id], set_={"version": DataVersion.version + 1}
+            ))
+        else:
+            result = db.execute(
+                update(DataVersion).where(DataVersion.owner_id == owner_id).values(version=DataVersion.version + 1)
+            )
+            if result.rowcount == 0:
+                db.execute(insert(DataVersion).values(owner_id=owner_id, version=1))
+        bumped.add(owner_id)
+
+def current(db: Session, owners) -> int:
+    """Committed version of one owner, or the sum over the ids a select returns (0 before any write)"""
+    return db.execute(
+        select(func.coalesce(func.sum(DataVersion.version), 0)).where(expressions.owned_by(DataVersion.owner_id, owners))
+    ).scalar()
+
+@event.listens_for(Session, "after_commit")
+def _reset_after_commit(db: Session) -> None:
+    db.info.pop("data_version_bumped", None)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_after_rollback(db: Session, previous_transaction) -> None:
+    db.info.pop("data_version_bumped", None)
@@ -0,0 +1,351 @@
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
+import csv
+import io
+import zlib
+from sqlalchemy.orm import Session
+from app.models import Session as SessionModel, Interruption, ArchivedSession, ArchivedInterruption, DEFAULT_USER_ID
+from app import serialization
+from app.services import expressions, retention
+from app.services.session_service import as_utc_naive
+from app import schemas
+
+# Rows fetched per server-side batch and bytes buffered per yielded chunk
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Rows per Arrow record batch / Parquet row group
+COLUMNAR_BATCH_SIZE = 50000
+
+SESSION_EXPORT_FIELDS = [
+    'id', 'title', 'goal', 'scheduled_duration', 'actual_duration',
+    'status', 'pause_count', 'start_time', 'end_time', 'created_at', 'focused_seconds', 'paused_seconds'
+]
+
+INTERRUPTION_EXPORT_FIELDS = ['id', 'session_id', 'reason', 'pause_time', 'resume_time']
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+FILE_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "arrow": "arrows", "parquet": "parquet"}
+
+def _arrow_schema(dataset: str):
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("us")
+    if dataset == "interruptions":
+        return pa.schema([
+            ("id", pa.int64()), ("session_id", pa.int64()), ("reason", pa.string()),
+            ("pause_time", timestamp), ("resume_time", timestamp)
+        ])
+    return pa.schema([
+        ("id", pa.int64()), ("title", pa.string()), ("goal", pa.string()),
+        ("scheduled_duration", pa.int64()), ("actual_duration", pa.int64()),
+        ("status", pa.string()), ("pause_count", pa.int64()),
+        ("start_time", timestamp), ("end_time", timestamp), ("created_at", timestamp),
+        ("focused_seconds", pa.int64()), ("paused_seconds", pa.int64())
+    ])
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+class ExportService:
+
+    @staticmethod
+    def _session_query(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[List[str]] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ):
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        queries = []
+        for source, _ in retention.session_tiers(db, owner_id, start):
+            query = db.query(
+                source.id,
+                source.title,
+                source.goal,
+                source.scheduled_duration,
+                expressions.duration_minutes(source.start_time, source.end_time),
+                source.status,
+                source.pause_count,
+                source.start_time,
+                source.end_time,
+                source.created_at,
+                source.focused_seconds,
+                source.paused_seconds
+            ).filter(source.owner_id == owner_id)
+
+            if statuses:
+                query = query.filter(source.status.in_(statuses))
+            if start:
+                query = query.filter(source.created_at >= start)
+            if end:
+                query = query.filter(source.created_at < end)
+            queries.append(query)
+        # Ordering by the live columns applies to the union as a whole
+        return queries[0].union_all(*queries[1:]) if len(queries) > 1 else queries[0]
+
+    @staticmethod
+    def iter_session_rows(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[List[str]] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Iterator[tuple]:
+        """Yield owner_id's session rows in SESSION_EXPORT_FIELDS order, newest first, without loading them all"""
+        query = ExportService._session_query(db, start, end, statuses, owner_id)
+        query = query.order_by(SessionModel.created_at.desc(), SessionModel.id.desc())
+
+        # Stream from a server-side cursor one batch at a time
+        for row in query.execution_options(yield_per=batch_size):
+            yield tuple(row)
+
+    @staticmethod
+    def _interruption_query(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[List[str]] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ):
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        tiers = [(SessionModel, Interruption)]
+        if retention.interruptions_span_archive(db, owner_id, start):
+            tiers.append((ArchivedSession, ArchivedInterruption))
+
+        queries = []
+        for source, interruptions in tiers:
+            query = db.query(
+                interruptions.id,
+                interruptions.session_id,
+                interruptions.reason,
+                interruptions.pause_time,
+                interruptions.resume_time
+            ).join(source, interruptions.session_id == source.id).filter(source.owner_id == owner_id)
+
+            if statuses:
+                query = query.filter(source.status.in_(statuses))
+            if start:
+                query = query.filter(interruptions.pause_time >= start)
+            if end:
+                query = query.filter(interruptions.pause_time < end)
+            queries.append(query)
+        return queries[0].union_all(*queries[1:]) if len(queries) > 1 else queries[0]
+
+    @staticmethod
+    def iter_interruption_rows(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[List[str]] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Iterator[tuple]:
+        """Yield interruption rows of owner_id's sessions in INTERRUPTION_EXPORT_FIELDS order.
+
+        start/end bound the pause time; statuses filter by the owning session's status.
+        """
+        query = ExportService._interruption_query(db, start, end, statuses, owner_id)
+        for row in query.order_by(Interruption.id).execution_options(yield_per=batch_size):
+            yield tuple(row)
+
+    @staticmethod
+    def count_rows(db: Session, request: schemas.ExportRequest, owner_id: int = DEFAULT_USER_ID) -> int:
+        """Number of rows the export will contain"""
+        build = (
+            ExportService._interruption_query if request.dataset == "interruptions" else ExportService._session_query
+        )
+        return build(db, request.start, request.end, request.status, owner_id).order_by(None).count()
+
+    @staticmethod
+    def validate(request: schemas.ExportRequest) -> None:
+        """Raise ValueError or ImportError for an export that cannot be produced"""
+        if request.gzip and request.format not in ("csv", "ndjson"):
+            raise ValueError(f"gzip is only supported for csv and ndjson, not {request.format}")
+        if request.format in ("arrow", "parquet"):
+            import pyarrow  # noqa: F401  fail before the response starts
+
+    @staticmethod
+    def describe(request: schemas.ExportRequest) -> Tuple[str, str]:
+        """Media type and download filename of an export"""
+        filename = f"{request.dataset}.{FILE_EXTENSIONS[request.format]}"
+        if request.gzip:
+            return "application/gzip", filename + ".gz"
+        return MEDIA_TYPES[request.format], filename
+
+    @staticmethod
+    def open_export(
+        db: Session,
+        request: schemas.ExportRequest,
+        owner_id: int = DEFAULT_USER_ID,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Tuple[Iterator[bytes], str, str]:
+        """Validate an export request and return (chunks, media type, filename).
+
+        progress, if given, is called with the number of rows read so far after
+        every EXPORT_BATCH_SIZE rows and once at the end. Raises ValueError for
+        unsupported combinations and ImportError when the columnar formats are
+        requested without pyarrow installed.
+        """
+        ExportService.validate(request)
+
+        if request.dataset == "interruptions":
+            fields = INTERRUPTION_EXPORT_FIELDS
+            rows = ExportService.iter_interruption_rows(
+                db, start=request.start, end=request.end, statuses=request.status, owner_id=owner_id
+            )
+        else:
+            fields = SESSION_EXPORT_FIELDS
+            rows = ExportService.iter_session_rows(
+                db, start=request.start, end=request.end, statuses=request.status, owner_id=owner_id
+            )
+        if progress is not None:
+            rows = ExportService._counted(rows, progress)
+
+        if request.format == "ndjson":
+            chunks = ExportService._ndjson_chunks(fields, rows)
+        elif request.format == "arrow":
+            chunks = ExportService._arrow_chunks(request.dataset, rows)
+        elif request.format == "parquet":
+            chunks = ExportService._parquet_chunks(request.dataset, rows)
+        else:
+            chunks = ExportService._csv_chunks(fields, rows)
+
+        if request.gzip:
+            chunks = ExportService._gzip_chunks(chunks)
+        media_type, filename = ExportService.describe(request)
+        return chunks, media_type, filename
+
+    @staticmethod
+    def _counted(rows: Iterator[tuple], progress: Callable[[int], None]) -> Iterator[tuple]:
+        count = 0
+        for row in rows:
+            yield row
+            count += 1
+            if count % EXPORT_BATCH_SIZE == 0:
+                progress(count)
+        progress(count)
+
+    @staticmethod
+    def stream_csv(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[List[str]] = None,
+        compress: bool = False,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Iterator[bytes]:
+        """Encode the session export as CSV chunks, optionally gzip-compressed"""
+        chunks, _, _ = ExportService.open_export(db, schemas.ExportRequest(
+            format="csv", start=start, end=end, status=statuses, gzip=compress
+        ), owner_id)
+        return chunks
+
+    @staticmethod
+    def _csv_chunks(fieldnames: List[str], rows: Iterator[tuple]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fieldnames)
+
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def _ndjson_chunks(fieldnames: List[str], rows: Iterator[tuple]) -> Iterator[bytes]:
+        lines = []
+        size = 0
+        for row in rows:
+            line = serialization.dumps_line(dict(zip(fieldnames, row)))
+            lines.append(line)
+            size += len(line)
+            if size >= EXPORT_CHUNK_SIZE:
+                yield b"".join(lines)
+                lines = []
+                size = 0
+
+        if lines:
+            yield b"".join(lines)
+
+    @staticmethod
+    def _record_batches(dataset: str, rows: Iterator[tuple]):
+        """Group rows into Arrow record batches of COLUMNAR_BATCH_SIZE"""
+        import pyarrow as pa
+
+        schema = _arrow_schema(dataset)
+        while True:
+            batch = list(islice(rows, COLUMNAR_BATCH_SIZE))
+            if not batch:
+                return
+            columns = list(zip(*batch))
+            yield pa.record_batch(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            )
+
+    @staticmethod
+    def _arrow_chunks(dataset: str, rows: Iterator[tuple]) -> Iterator[bytes]:
+        import pyarrow as pa
+
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, _arrow_schema(dataset)) as writer:
+            for batch in ExportService._record_batches(dataset, rows):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    @staticmethod
+    def _parquet_chunks(dataset: str, rows: Iterator[tuple]) -> Iterator[bytes]:
+        import pyarrow.parquet as pq
+
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, _arrow_schema(dataset)) as writer:
+            for batch in ExportService._record_batches(dataset, rows):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    @staticmethod
+    def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
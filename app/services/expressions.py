@@ -0,0 +1,128 @@
+"""SQL building blocks shared by set-based queries.
+
+Each expression mirrors a Python rule in SessionService so aggregates can be
+computed by the database in one statement instead of row by row.
+"""
+from sqlalchemy import TIMESTAMP, Float, Integer, Numeric, case, cast, func, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+class minutes_between(FunctionElement):
+    """Fractional minutes elapsed from the first timestamp to the second"""
+    type = Float()
+    inherit_cache = True
+    name = "minutes_between"
+
+@compiles(minutes_between, "sqlite")
+def _minutes_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    # julianday() carries ~40us of float error; snap to SQLite's millisecond resolution
+    # so whole-minute spans don't truncate to one minute less
+    return "(ROUND((julianday(%s) - julianday(%s)) * 86400000.0) / 60000.0)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw)
+    )
+
+@compiles(minutes_between)
+def _minutes_between_default(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "(EXTRACT(EPOCH FROM (%s - %s)) / 60.0)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw)
+    )
+
+class seconds_between(FunctionElement):
+    """Whole seconds elapsed from the first timestamp to the second, rounded to the nearest"""
+    type = Integer()
+    inherit_cache = True
+    name = "seconds_between"
+
+@compiles(seconds_between, "sqlite")
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "CAST(ROUND((julianday(%s) - julianday(%s)) * 86400.0) AS INTEGER)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw)
+    )
+
+@compiles(seconds_between)
+def _seconds_between_default(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "CAST(ROUND(EXTRACT(EPOCH FROM (%s - %s))) AS INTEGER)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw)
+    )
+
+class add_minutes(FunctionElement):
+    """Timestamp plus a possibly fractional number of minutes"""
+    type = TIMESTAMP()
+    inherit_cache = True
+    name = "add_minutes"
+
+@compiles(add_minutes, "sqlite")
+def _add_minutes_sqlite(element, compiler, **kw):
+    timestamp, minutes = list(element.clauses)
+    # %f keeps milliseconds, in the same text layout SQLAlchemy stores and parses
+    return "strftime('%%Y-%%m-%%d %%H:%%M:%%f', %s, '+' || (%s) || ' minutes')" % (
+        compiler.process(timestamp, **kw), compiler.process(minutes, **kw)
+    )
+
+@compiles(add_minutes)
+def _add_minutes_default(element, compiler, **kw):
+    timestamp, minutes = list(element.clauses)
+    return "(%s + (%s) * INTERVAL '1 minute')" % (compiler.process(timestamp, **kw), compiler.process(minutes, **kw))
+
+class truncate_int(FunctionElement):
+    """Drop the fractional part of a non-negative number, like Python's int()"""
+    type = Integer()
+    inherit_cache = True
+    name = "truncate_int"
+
+@compiles(truncate_int, "sqlite")
+def _truncate_int_sqlite(element, compiler, **kw):
+    return "CAST(%s AS INTEGER)" % compiler.process(list(element.clauses)[0], **kw)
+
+@compiles(truncate_int)
+def _truncate_int_default(element, compiler, **kw):
+    return "CAST(TRUNC(%s) AS INTEGER)" % compiler.process(list(element.clauses)[0], **kw)
+
+def duration_minutes(start_time, end_time):
+    """Whole minutes between start and end, NULL while either is unset"""
+    return case(
+        (start_time.isnot(None) & end_time.isnot(None), truncate_int(minutes_between(start_time, end_time))),
+        else_=None
+    )
+
+def ended_seconds(end_time, seconds):
+    """A running total as the rollups count it: only once the session has ended, 0 before"""
+    return case((end_time.isnot(None), seconds), else_=0)
+
+def focus_score(status, pause_count, scheduled_duration):
+    """SQL form of SessionService.calculate_focus_score, rounded to 2 places"""
+    completion_ratio = case((status == 'completed', 1.0), else_=0.5)
+    
+    pause_ratio = cast(func.coalesce(pause_count, 0), Float) / scheduled_duration
+    interruption_penalty = case(
+        (scheduled_duration <= 0, 0.0),
+        (pause_ratio > 1.0, 1.0),
+        else_=pause_ratio
+    )
+    
+    score = (1 - interruption_penalty) * completion_ratio * 100
+    return func.round(cast(score, Numeric), 2, type_=Float)
+
+def overrun_deadline(start_time, scheduled_duration):
+    """When a session started at start_time passes 110% of its schedule and becomes overdue"""
+    return add_minutes(start_time, scheduled_duration * 1.1)
+
+def earliest(first, second):
+    """The earlier of two non-null timestamps"""
+    return case((first < second, first), else_=second)
+
+def completion_status(start_time, scheduled_duration, now, otherwise):
+    """Status a session gets when it ends at now: 'overdue' past 110% of its schedule, else otherwise"""
+    elapsed = minutes_between(start_time, literal(now, TIMESTAMP()))
+    return case(
+        (start_time.isnot(None) & (elapsed > scheduled_duration * 1.1), 'overdue'),
+        else_=otherwise
+    )
+
+def owned_by(column, owners):
+    """Restrict an owner column to one user id, or to the ids a select returns"""
+    return column == owners if isinstance(owners, int) else column.in_(owners)
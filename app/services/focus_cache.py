@@ -0,0 +1,84 @@
+"""Bounded in-process cache of stored focus scores.
+
+Scores only change through SessionService transitions, which invalidate the
+session's entry both immediately and again once their transaction commits. A
+read that started before an invalidation never stores its (possibly stale)
+result, and entries expire after a TTL so other worker processes, whose
+invalidations this process never sees, cannot serve a stale score for long.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import settings
+
+class FocusScoreCache:
+    """LRU map of session id to focus score"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def generation(self) -> int:
+        """Token to pass to put(); any invalidation in between makes the put a no-op"""
+        return self._generation
+    
+    def get(self, session_id: int, owner_id: Optional[int] = None) -> Optional[float]:
+        """Cached score, or None if missing, expired or (when owner_id is given) owned by someone else"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            score, owner, expires = entry
+            if expires < time.monotonic():
+                del self._entries[session_id]
+                return None
+            if owner_id is not None and owner != owner_id:
+                return None
+            self._entries.move_to_end(session_id)
+            return score
+    
+    def put(self, session_id: int, score: float, generation: int, owner_id: Optional[int] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[session_id] = (score, owner_id, time.monotonic() + self.ttl)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, session_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(session_id, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+focus_scores = FocusScoreCache(settings.focus_score_cache_size, settings.focus_score_cache_ttl)
+
+def invalidate(db: Session, session_id: int) -> None:
+    """Drop a session's cached score now and again when db's transaction commits"""
+    focus_scores.invalidate(session_id)
+    db.info.setdefault("focus_score_invalidations", set()).add(session_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(db: Session) -> None:
+    for session_id in db.info.pop("focus_score_invalidations", ()):
+        focus_scores.invalidate(session_id)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back(db: Session, previous_transaction) -> None:
+    db.info.pop("focus_score_invalidations", None)
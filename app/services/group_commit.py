@@ -0,0 +1,135 @@
+"""Group commit of session lifecycle transitions.
+
+Every transition normally commits on its own, so on SQLite each click pays
+for a write transaction and the database write lock is handed from request
+to request. With write batching enabled, transitions are queued for one
+writer per engine instead. The writer collects what arrives within a short
+window, applies it in order in a single transaction and commits once.
+
+Each transition still gets its own outcome. One that is rejected (a
+ValueError, e.g. pausing a completed session) writes nothing, like a rejected
+item of a batch transition, and the rest of the batch commits. A database
+error fails the whole batch and every caller in it sees that error.
+Side effects recorded in the session (data version, events, cache
+invalidation) fire once, after the shared commit.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from app import metrics
+from app.models import Session as SessionModel
+
+logger = logging.getLogger("app.group_commit")
+
+BATCH_SIZE = metrics.REGISTRY.register(metrics.Histogram(
+    "write_batch_size", "Transitions committed together by the group-commit writer",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+))
+
+# Queued call: (method, args, kwargs, future)
+Pending = Tuple[Callable, tuple, dict, asyncio.Future]
+
+def _snapshot(db_session: SessionModel) -> SessionModel:
+    """Detached copy of a row as its own transition left it; later transitions in the batch may change the original"""
+    return SessionModel(**{attr.key: getattr(db_session, attr.key) for attr in inspect(SessionModel).column_attrs})
+
+class GroupCommitter:
+    """Single writer that applies queued transitions in shared transactions"""
+    
+    def __init__(self, session_factory: Callable[[], AsyncSession], window: float, max_batch: int):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "asyncio.Queue[Pending]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def submit(self, method: Callable, *args, **kwargs) -> SessionModel:
+        """Queue method(db, *args, commit=False, **kwargs) and wait for the batch holding it to commit"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((method, args, kwargs, future))
+        return await future
+    
+    async def run(self) -> None:
+        """Apply batches until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._apply(batch)
+    
+    async def close(self) -> None:
+        """Stop the writer; transitions still queued fail with CancelledError"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            self._queue.get_nowait()[3].cancel()
+    
+    async def _apply(self, batch: List[Pending]) -> None:
+        BATCH_SIZE.observe(len(batch))
+        try:
+            async with self.session_factory() as db:
+                outcomes = await db.run_sync(self._apply_sync, batch)
+        except Exception as e:
+            logger.exception("write_batch_failed", extra={"batch_size": len(batch)})
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (*_, future), (result, error) in zip(batch, outcomes):
+            if future.done():
+                continue  # the caller went away; its transition has committed regardless
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    @staticmethod
+    def _apply_sync(db: Session, batch: List[Pending]) -> List[Tuple[Optional[SessionModel], Optional[Exception]]]:
+        outcomes = []
+        for method, args, kwargs, _ in batch:
+            try:
+                outcomes.append((_snapshot(method(db, *args, commit=False, **kwargs)), None))
+            except ValueError as e:
+                outcomes.append((None, e))
+        db.commit()
+        return outcomes
+
+# One writer per engine: the application's, or a test's
+_committers: Dict[AsyncEngine, GroupCommitter] = {}
+
+def committer_for(db: AsyncSession, window: float, max_batch: int) -> GroupCommitter:
+    """The writer for the engine db is bound to, created on first use"""
+    committer = _committers.get(db.bind)
+    if committer is None:
+        factory = async_sessionmaker(db.bind, autoflush=False, expire_on_commit=False)
+        committer = _committers[db.bind] = GroupCommitter(factory, window, max_batch)
+    return committer
+
+async def shutdown() -> None:
+    """Stop every writer"""
+    committers = list(_committers.values())
+    _committers.clear()
+    for committer in committers:
+        await committer.close()
@@ -0,0 +1,290 @@
+"""Reports and exports computed in worker processes.
+
+A submitted job runs in a process pool, so a year-long report or a large
+export neither holds a request open nor competes with the web process for
+the GIL. Each worker process builds its own engine from the submitting
+request's database URL; nothing but the job's parameters crosses the process
+boundary, and the result is written to a file.
+
+Results live in a bounded directory keyed by the job's parameters, its owner,
+the database and the data version at submission. Submitting a job whose
+result is already on disk answers immediately, and a submission identical to
+a job still running joins that job. Any write bumps the data version, so a
+stale result is never served; old results age out least recently used first.
+
+Workers report progress through a small file beside the result. The job
+registry itself lives in the process that accepted the submission: with
+several web workers the cached results are shared, but polling a job must
+reach the worker that accepted it.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from app import metrics, schemas, serialization
+from app.config import settings
+from app.database import build_engine
+from app.services.export_service import ExportService
+from app.services.session_service import SessionService
+
+logger = logging.getLogger("app.jobs")
+
+JOBS_FINISHED = metrics.REGISTRY.register(metrics.Counter(
+    "jobs_finished_total", "Background report and export jobs, by kind and outcome", ("kind", "outcome")
+))
+
+# Engines of the worker process, one per database URL
+_engines: Dict[str, Engine] = {}
+
+def _engine(database_url: str) -> Engine:
+    engine = _engines.get(database_url)
+    if engine is None:
+        engine = _engines[database_url] = build_engine(database_url)
+    return engine
+
+def _write_progress(path: str, done: int, total: Optional[int]) -> None:
+    """Publish progress atomically so a poll never reads a half-written file"""
+    partial = path + ".tmp"
+    with open(partial, "w") as out:
+        json.dump([done, total], out)
+    os.replace(partial, path)
+
+def read_progress(path: str) -> Optional[Tuple[int, Optional[int]]]:
+    """(rows done, rows total) last published for a running job, None before it starts"""
+    try:
+        with open(path) as progress:
+            done, total = json.load(progress)
+    except (OSError, ValueError):
+        return None
+    return done, total
+
+def run_job(database_url: str, kind: str, params: dict, owner_id: int, path: str, progress_path: str) -> int:
+    """Worker-process entry point: write one job's result to path and return its size in bytes"""
+    db = sessionmaker(autoflush=False, bind=_engine(database_url))()
+    partial = path + ".partial"
+    try:
+        _write_progress(progress_path, 0, None)
+        with open(partial, "wb") as out:
+            if kind == "report":
+                start, end = datetime.fromisoformat(params["start"]), datetime.fromisoformat(params["end"])
+                report = SessionService.get_range_report(db, start, end, bucket=params["bucket"], owner_id=owner_id)
+                out.write(serialization.dumps(jsonable_encoder(schemas.RangeReport.model_validate(report))))
+            else:
+                request = schemas.ExportRequest.model_validate(params)
+                total = ExportService.count_rows(db, request, owner_id)
+                _write_progress(progress_path, 0, total)
+                chunks, _, _ = ExportService.open_export(
+                    db, request, owner_id, progress=lambda done: _write_progress(progress_path, done, total)
+                )
+                for chunk in chunks:
+                    out.write(chunk)
+        os.replace(partial, path)
+        return os.path.getsize(path)
+    finally:
+        db.close()
+        for leftover in (partial, progress_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+class ResultCache:
+    """Directory of job results bounded by entries and bytes; a file's mtime marks its last use"""
+    
+    def __init__(self, directory: str, max_entries: int, max_bytes: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(database_url: str, kind: str, params: dict, owner_id: int, version: int) -> str:
+        """Stable name for the result of these parameters at this data version"""
+        material = json.dumps([database_url, kind, params, owner_id, version], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode()).hexdigest()[:32]
+    
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+    
+    def get(self, name: str) -> Optional[str]:
+        """Path of a stored result, marked as just used, or None"""
+        path = self.path(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+    
+    def prune(self) -> int:
+        """Remove the least recently used results until both bounds hold; returns the number removed"""
+        with self._lock:
+            results = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(".result"):
+                    stat = entry.stat()
+                    results.append((stat.st_mtime, stat.st_size, entry.path))
+            results.sort()
+            total = sum(size for _, size, _ in results)
+            removed = 0
+            while results and (len(results) > self.max_entries or total > self.max_bytes):
+                _, size, path = results.pop(0)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            return removed
+
+class Job:
+    """One submission, as tracked by the process that accepted it"""
+    
+    def __init__(self, kind: str, params: dict, owner_id: int, name: str, media_type: str, filename: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.owner_id = owner_id
+        self.name = name
+        self.media_type = media_type
+        self.filename = filename
+        self.state = "queued"
+        self.cached = False
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.future: Optional[Future] = None
+
+class JobManager:
+    """Submits jobs to a lazily started process pool and remembers the latest job_history of them"""
+    
+    def __init__(self, cache: ResultCache, workers: int, history: int):
+        self.cache = cache
+        self.workers = workers
+        self.history = history
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: Dict[str, Job] = {}  # result name -> queued or running job
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def submit(
+        self, database_url: str, version: int, request: schemas.JobRequest, owner_id: int, now: Optional[datetime] = None
+    ) -> Job:
+        """Start a job, or answer it from the cache, or join an identical job in progress.
+        
+        Raises ValueError for parameters the job could never run with and
+        ImportError for columnar exports without pyarrow.
+        """
+        kind, params, media_type, filename = self._describe(request, now)
+        name = self.cache.key(database_url, kind, params, owner_id, version) + ".result"
+        
+        with self._lock:
+            pending = self._pending.get(name)
+            if pending is not None:
+                return pending
+            
+            job = Job(kind, params, owner_id, name, media_type, filename)
+            if self.cache.get(name) is not None:
+                job.state, job.cached, job.finished_at = "done", True, job.created_at
+                JOBS_FINISHED.inc(kind=kind, outcome="cached")
+            else:
+                os.makedirs(self.cache.directory, exist_ok=True)
+                job.future = self._executor().submit(
+                    run_job, database_url, kind, params, owner_id,
+                    self.cache.path(name), self.cache.path(job.id + ".progress")
+                )
+                self._pending[name] = job
+            self._remember(job)
+        
+        if job.future is not None:
+            job.future.add_done_callback(lambda future: self._finished(job, future))
+        return job
+    
+    def get(self, job_id: str, owner_id: int) -> Optional[Job]:
+        """A job of owner_id's, or None if it is unknown, forgotten or someone else's"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.owner_id != owner_id:
+            return None
+        return job
+    
+    def progress(self, job: Job) -> Tuple[Optional[int], Optional[int]]:
+        """(rows done, rows total) of a job; a queued job that has published progress is running"""
+        if job.state not in ("queued", "running"):
+            return None, None
+        published = read_progress(self.cache.path(job.id + ".progress"))
+        if published is None:
+            return None, None
+        job.state = "running"
+        return published
+    
+    def result_path(self, job: Job) -> Optional[str]:
+        """Path of a finished job's result, None once it has been evicted"""
+        return self.cache.get(job.name)
+    
+    def shutdown(self) -> None:
+        """Stop the pool, cancelling jobs that have not started; a later submission starts a new pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+            self._pending.clear()
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        # Spawned workers start clean instead of inheriting the web process's connections and threads
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+    
+    def _describe(self, request: schemas.JobRequest, now: Optional[datetime]) -> Tuple[str, dict, str, str]:
+        """Normalized parameters, media type and filename of a job request"""
+        if isinstance(request, schemas.ExportJob):
+            export = schemas.ExportRequest.model_validate(request.model_dump(exclude={"kind"}))
+            ExportService.validate(export)
+            media_type, filename = ExportService.describe(export)
+            return "export", export.model_dump(mode="json"), media_type, filename
+        
+        # Rolling windows are fixed at submission, to the minute, so resubmissions share a result
+        now = (now or datetime.utcnow()).replace(second=0, microsecond=0)
+        start, end = SessionService.report_window(request.start, request.end, request.days, request.period, now=now)
+        params = {"start": start.isoformat(), "end": end.isoformat(), "bucket": request.bucket}
+        filename = f"report-{start.date()}-{end.date()}.json"
+        return "report", params, "application/json", filename
+    
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        # Forget the oldest finished jobs beyond the history bound; running jobs are always kept
+        excess = len(self._jobs) - self.history
+        for old in [old for old in self._jobs.values() if old.finished_at is not None][:max(0, excess)]:
+            del self._jobs[old.id]
+    
+    def _finished(self, job: Job, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(job.name, None)
+        job.finished_at = datetime.utcnow()
+        if future.cancelled():
+            job.state, job.error = "failed", "cancelled"
+        elif future.exception() is not None:
+            job.state, job.error = "failed", str(future.exception()) or type(future.exception()).__name__
+            logger.error("job_failed", extra={"job_id": job.id, "kind": job.kind, "error": job.error})
+        else:
+            job.state = "done"
+            self.cache.prune()
+        JOBS_FINISHED.inc(kind=job.kind, outcome=job.state)
+
+manager = JobManager(
+    ResultCache(settings.job_cache_dir, settings.job_cache_max_entries, settings.job_cache_max_bytes),
+    settings.job_workers,
+    settings.job_history
+)
@@ -0,0 +1,54 @@
+"""Plain row types for read paths.
+
+List endpoints select just the columns they return and wrap each row in a
+__slots__ dataclass: no identity map, no change tracking, no per-instance
+__dict__, and orjson serializes them natively.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional
+from app.models import Session as SessionModel
+from app.services import expressions
+
+@dataclass(slots=True, frozen=True)
+class SessionRow:
+    """One history entry, in the shape of schemas.SessionHistory"""
+    id: int
+    title: str
+    goal: Optional[str]
+    scheduled_duration: int
+    start_time: Optional[datetime]
+    end_time: Optional[datetime]
+    status: str
+    pause_count: int
+    created_at: datetime
+    actual_duration: Optional[int]
+    focused_seconds: int
+    paused_seconds: int
+    
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in SESSION_ROW_FIELDS}
+
+SESSION_ROW_FIELDS = tuple(field.name for field in fields(SessionRow))
+
+def session_row_columns(source=SessionModel) -> tuple:
+    """Columns of source (the live sessions or their archive) in SESSION_ROW_FIELDS order"""
+    return (
+        source.id, source.title, source.goal, source.scheduled_duration,
+        source.start_time, source.end_time, source.status, source.pause_count,
+        source.created_at,
+        expressions.duration_minutes(source.start_time, source.end_time).label("actual_duration"),
+        source.focused_seconds, source.paused_seconds
+    )
+
+SESSION_ROW_COLUMNS = session_row_columns()
+
+@dataclass(slots=True, frozen=True)
+class SearchHit(SessionRow):
+    """One search result: a history entry and its relevance, higher is better"""
+    score: float
+    
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in SEARCH_HIT_FIELDS}
+
+SEARCH_HIT_FIELDS = tuple(field.name for field in fields(SearchHit))
@@ -0,0 +1,69 @@
+"""Serialized response bodies cached per data version.
+
+Entries are keyed by the request they answer and are valid only for the data
+version they were computed at; the TTL additionally bounds reports whose
+window moves with the clock. Total size is bounded by entries and bytes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Hashable, Optional
+from app.config import settings
+
+CachedBody = namedtuple("CachedBody", ["body", "etag", "version", "expires"])
+
+class ResponseCache:
+    """LRU of (key, version) -> serialized body and its ETag"""
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def etag(version: int, body: bytes) -> str:
+        """Strong validator for exactly this body"""
+        return f'"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+    
+    def get(self, key: Hashable, version: int) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or entry.expires < time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key: Hashable, version: int, body: bytes) -> CachedBody:
+        """Store a body and return its entry; bodies over the byte bound are returned uncached"""
+        entry = CachedBody(body, self.etag(version, body), version, time.monotonic() + self.ttl)
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+        return entry
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+reports = ResponseCache(settings.report_cache_max_entries, settings.report_cache_max_bytes, settings.report_cache_ttl)
@@ -0,0 +1,147 @@
+"""Retention tiering: closed sessions past the retention age move to archive tables.
+
+The archiver moves a session together with its interruptions and timeline
+from the live tables into sessions_archive, interruptions_archive and
+session_timeline_archive, one bounded batch per transaction. Only sessions
+that can no longer change are eligible. Rollups are left as they are, so
+reports over any range stay correct without touching the archive.
+
+Readers add the archive tier only when a range reaches back to it. Each owner's
+newest archived created_at (or pause time) is one index lookup; a window that
+starts after it never reads the archive. Search and the live-session paths
+cover the live tables only.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app import metrics
+from app.models import (
+    Session as SessionModel, Interruption, TimelineEvent, ArchivedSession, ArchivedInterruption, ArchivedTimelineEvent
+)
+from app.services import data_version, expressions
+
+logger = logging.getLogger("app.retention")
+
+SESSIONS_ARCHIVED = metrics.REGISTRY.register(metrics.Counter(
+    "sessions_archived_total", "Sessions moved to the archive tables"
+))
+ARCHIVE_DURATION = metrics.REGISTRY.register(metrics.Histogram(
+    "session_archive_duration_seconds", "Time taken by one archiving run"
+))
+
+# Statuses no transition leaves. Abandoned sessions can still be resumed, so
+# archiving one ends that possibility; only sessions past the retention age qualify.
+ARCHIVABLE_STATUSES = ('completed', 'interrupted', 'abandoned', 'overdue')
+
+# Session columns copied to the archive: all of them; archived_at is stamped on insert
+ARCHIVED_SESSION_COLUMNS = [column.name for column in ArchivedSession.__table__.columns if column.name != "archived_at"]
+
+def archived_until(db: Session, owners) -> Optional[datetime]:
+    """Newest created_at among the owners' archived sessions; None if nothing of theirs is archived"""
+    return db.execute(
+        select(func.max(ArchivedSession.created_at)).where(expressions.owned_by(ArchivedSession.owner_id, owners))
+    ).scalar()
+
+def sessions_span_archive(db: Session, owners, start: Optional[datetime]) -> bool:
+    """Whether sessions created from start on may include archived ones"""
+    horizon = archived_until(db, owners)
+    return horizon is not None and (start is None or start <= horizon)
+
+def interruptions_span_archive(db: Session, owner_id: int, start: Optional[datetime]) -> bool:
+    """Whether interruptions paused from start on may include archived ones"""
+    horizon = db.execute(
+        select(func.max(ArchivedInterruption.pause_time)).where(ArchivedInterruption.owner_id == owner_id)
+    ).scalar()
+    return horizon is not None and (start is None or start <= horizon)
+
+def session_tiers(db: Session, owners, start: Optional[datetime]) -> List[Tuple[type, type]]:
+    """(sessions, interruptions) models to read for sessions created from start on: live first"""
+    tiers = [(SessionModel, Interruption)]
+    if sessions_span_archive(db, owners, start):
+        tiers.append((ArchivedSession, ArchivedInterruption))
+    return tiers
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move up to batch_size closed sessions created before cutoff into the archive; the caller commits.
+
+    Candidates are found in id order, which reaches old sessions first without
+    an index on created_at. The session with the highest id always stays, so
+    SQLite never hands an archived id to a new session.
+    """
+    candidates = select(SessionModel.id).where(
+        SessionModel.status.in_(ARCHIVABLE_STATUSES),
+        SessionModel.created_at < cutoff,
+        SessionModel.id < select(func.max(SessionModel.id)).scalar_subquery()
+    ).order_by(SessionModel.id).limit(batch_size).with_for_update()
+    ids = db.execute(candidates).scalars().all()
+    if not ids:
+        return 0
+
+    # Each DELETE re-checks the status, so a session resumed since it was selected stays;
+    # on SQLite the first DELETE takes the write lock, so nothing changes after it
+    still_closed = select(SessionModel.id).where(
+        SessionModel.id.in_(ids), SessionModel.status.in_(ARCHIVABLE_STATUSES)
+    )
+    events = db.execute(
+        delete(TimelineEvent).where(TimelineEvent.session_id.in_(still_closed))
+        .returning(*TimelineEvent.__table__.columns).execution_options(synchronize_session=False)
+    ).mappings().all()
+    interruptions = db.execute(
+        delete(Interruption).where(Interruption.session_id.in_(still_closed))
+        .returning(*Interruption.__table__.columns).execution_options(synchronize_session=False)
+    ).mappings().all()
+    sessions = db.execute(
+        delete(SessionModel).where(SessionModel.id.in_(still_closed))
+        .returning(*(SessionModel.__table__.c[name] for name in ARCHIVED_SESSION_COLUMNS))
+        .execution_options(synchronize_session=False)
+    ).mappings().all()
+    if not sessions:
+        return 0
+
+    owners = {row["id"]: row["owner_id"] for row in sessions}
+    db.execute(insert(ArchivedSession), [dict(row) for row in sessions])
+    if interruptions:
+        db.execute(insert(ArchivedInterruption), [
+            dict(row, owner_id=owners[row["session_id"]]) for row in interruptions
+        ])
+    if events:
+        db.execute(insert(ArchivedTimelineEvent), [dict(row) for row in events])
+    data_version.bump(db, *owners.values())
+    return len(sessions)
+
+def archive_sessions(db: Session, cutoff: datetime, batch_size: int = 500) -> int:
+    """Archive every eligible session created before cutoff, committing each batch; returns the number moved"""
+    archived = 0
+    while True:
+        moved = archive_batch(db, cutoff, batch_size)
+        db.commit()
+        archived += moved
+        if moved < batch_size:
+            return archived
+
+def archive_once(session_factory: Callable[[], Session], max_age: timedelta, batch_size: int) -> int:
+    """Archive sessions older than max_age using a fresh database session"""
+    db = session_factory()
+    try:
+        return archive_sessions(db, datetime.utcnow() - max_age, batch_size)
+    finally:
+        db.close()
+
+async def run(session_factory: Callable[[], Session], interval: float, max_age: timedelta, batch_size: int) -> None:
+    """Archive immediately, then every interval seconds until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        try:
+            archived = await asyncio.to_thread(archive_once, session_factory, max_age, batch_size)
+        except Exception:
+            logger.exception("session_archive_failed")
+        else:
+            ARCHIVE_DURATION.observe(loop.time() - started)
+            SESSIONS_ARCHIVED.inc(archived)
+            if archived:
+                logger.info("sessions_archived", extra={"archived": archived})
+        await asyncio.sleep(interval)
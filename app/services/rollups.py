@@ -0,0 +1,167 @@
+"""Incremental maintenance of the daily rollup tables.
+
+Every session contributes one (owner, day, status) slot to ``daily_rollups``.
+A state transition moves the session's contribution from its old slot to its
+new one, so the rollups always equal an aggregate over the raw rows without
+rescanning them. Team reports add up the slots of every member.
+"""
+import itertools
+from collections import Counter, namedtuple
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import DailyRollup, DailyInterruptionRollup
+
+# What a single session adds to its (owner, day, status) rollup slot
+Contribution = namedtuple("Contribution", [
+    "owner_id", "day", "status", "focus_minutes", "pause_count", "focus_score", "focused_seconds", "paused_seconds"
+])
+
+def focus_minutes(start_time: Optional[datetime], end_time: Optional[datetime]) -> int:
+    """Whole minutes between start and end, 0 while either is unset"""
+    if start_time and end_time:
+        return int((end_time - start_time).total_seconds() / 60)
+    return 0
+
+def make_contribution(
+    owner_id, created_at, status, start_time, end_time, pause_count, scheduled_duration,
+    focused_seconds=0, paused_seconds=0
+) -> Contribution:
+    """Rollup contribution of a session with the given column values.
+    
+    Like focus_minutes, focused and paused time count once the session has ended.
+    """
+    from app.services.session_service import SessionService
+
+    return Contribution(
+        owner_id=owner_id,
+        day=created_at.date(),
+        status=status,
+        focus_minutes=focus_minutes(start_time, end_time),
+        pause_count=pause_count or 0,
+        focus_score=SessionService.compute_focus_score(status, pause_count, scheduled_duration),
+        focused_seconds=(focused_seconds or 0) if end_time else 0,
+        paused_seconds=(paused_seconds or 0) if end_time else 0
+    )
+
+def contribution(session) -> Contribution:
+    """Snapshot a session's current rollup contribution"""
+    return make_contribution(
+        session.owner_id, session.created_at, session.status, session.start_time, session.end_time,
+        session.pause_count, session.scheduled_duration, session.focused_seconds, session.paused_seconds
+    )
+
+def _increment(db: Session, model, key: Dict, deltas: Dict) -> None:
+    """Add deltas to the row identified by key, creating it if missing"""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(model).values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: getattr(model, name) + stmt.excluded[name] for name in deltas}
+        )
+        db.execute(stmt)
+        return
+
+    conditions = [getattr(model, name) == value for name, value in key.items()]
+    result = db.execute(
+        update(model).where(*conditions).values(
+            **{name: getattr(model, name) + value for name, value in deltas.items()}
+        )
+    )
+    if result.rowcount == 0:
+        db.add(model(**key, **deltas))
+        db.flush()
+
+def _apply(db: Session, item: Contribution, sign: int) -> None:
+    _increment(db, DailyRollup, {"owner_id": item.owner_id, "day": item.day, "status": item.status}, {
+        "session_count": sign,
+        "focus_minutes": sign * item.focus_minutes,
+        "pause_count": sign * item.pause_count,
+        "focus_score_sum": sign * item.focus_score,
+        "focused_seconds": sign * item.focused_seconds,
+        "paused_seconds": sign * item.paused_seconds,
+    })
+
+def record_change(db: Session, before: Optional[Contribution], after: Optional[Contribution]) -> None:
+    """Move a session's contribution from its old slot to its new one"""
+    if before == after:
+        return
+    if before is not None:
+        _apply(db, before, -1)
+    if after is not None:
+        _apply(db, after, 1)
+
+def record_interruption(db: Session, owner_id: int, day, reason: str, count: int = 1) -> None:
+    """Count interruptions against the owning session's owner and creation day"""
+    _increment(
+        db, DailyInterruptionRollup, {"owner_id": owner_id, "day": day, "reason": reason}, {"interruption_count": count}
+    )
+
+def _add_to_totals(totals: Dict, item: Contribution, sign: int) -> None:
+    slot = totals.setdefault((item.owner_id, item.day, item.status), [0, 0, 0, 0.0, 0, 0])
+    slot[0] += sign
+    slot[1] += sign * item.focus_minutes
+    slot[2] += sign * item.pause_count
+    slot[3] += sign * item.focus_score
+    slot[4] += sign * item.focused_seconds
+    slot[5] += sign * item.paused_seconds
+
+def _apply_totals(db: Session, totals: Dict) -> None:
+    for (owner_id, day, status), (count, minutes, pauses, score, focused, paused) in totals.items():
+        if count == minutes == pauses == focused == paused == 0 and score == 0:
+            continue
+        _increment(db, DailyRollup, {"owner_id": owner_id, "day": day, "status": status}, {
+            "session_count": count, "focus_minutes": minutes, "pause_count": pauses, "focus_score_sum": score,
+            "focused_seconds": focused, "paused_seconds": paused
+        })
+
+def record_bulk(db: Session, items: Iterable[Contribution], reasons: Iterable[Tuple[int, date, str]]) -> None:
+    """Add many new sessions and interruptions with one upsert per touched slot"""
+    totals = {}
+    for item in items:
+        _add_to_totals(totals, item, 1)
+    _apply_totals(db, totals)
+
+    for (owner_id, day, reason), count in Counter(reasons).items():
+        record_interruption(db, owner_id, day, reason, count)
+
+def record_changes(db: Session, changes: Iterable[Tuple[Contribution, Contribution]]) -> None:
+    """Move many sessions between slots with one upsert per slot whose totals change"""
+    totals = {}
+    for before, after in changes:
+        _add_to_totals(totals, before, -1)
+        _add_to_totals(totals, after, 1)
+    _apply_totals(db, totals)
+
+def rebuild(db: Session) -> None:
+    """Recompute every rollup from the raw tables, archived sessions included"""
+    from app.models import Session as SessionModel, Interruption, ArchivedSession, ArchivedInterruption
+
+    db.query(DailyRollup).delete()
+    db.query(DailyInterruptionRollup).delete()
+
+    def tier_rows(source, source_interruptions):
+        sessions = db.query(
+            source.owner_id, source.created_at, source.status, source.start_time, source.end_time,
+            source.pause_count, source.scheduled_duration, source.focused_seconds, source.paused_seconds
+        ).execution_options(yield_per=1000)
+        interruptions = db.query(source.owner_id, source.created_at, source_interruptions.reason).join(
+            source_interruptions, source_interruptions.session_id == source.id
+        ).execution_options(yield_per=1000)
+        return sessions, interruptions
+
+    live_sessions, live_interruptions = tier_rows(SessionModel, Interruption)
+    archived_sessions, archived_interruptions = tier_rows(ArchivedSession, ArchivedInterruption)
+    sessions = itertools.chain(live_sessions, archived_sessions)
+    interruptions = itertools.chain(live_interruptions, archived_interruptions)
+
+    record_bulk(
+        db,
+        (make_contribution(*row) for row in sessions),
+        ((owner_id, created_at.date(), reason) for owner_id, created_at, reason in interruptions)
+    )
+    db.flush()
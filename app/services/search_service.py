@@ -0,0 +1,110 @@
+"""Ranked full-text search over the session_search index.
+
+The index itself is defined with the models (SEARCH_INDEX_DDL) and kept in
+sync by triggers. Queries are reduced to plain words: every word must match,
+as a prefix, the session's title, goal or one of its interruption reasons.
+Titles weigh most, then goals, then reasons.
+"""
+import base64
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, Integer, and_, column, func, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+from app.models import Session as SessionModel, DEFAULT_USER_ID
+from app.services.read_models import SESSION_ROW_COLUMNS, SearchHit
+
+# Words beyond this are ignored, keeping pathological queries cheap
+MAX_SEARCH_TERMS = 8
+
+# bm25 weights of the FTS5 columns (title, goal, reasons)
+SQLITE_COLUMN_WEIGHTS = (10.0, 4.0, 1.0)
+
+_WORD = re.compile(r"\w+")
+
+def search_terms(query: str) -> List[str]:
+    """The words of a free-text query; punctuation and search operators are dropped"""
+    return _WORD.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+def encode_search_cursor(score: float, session_id: int) -> str:
+    """Build an opaque cursor pointing just past the given hit"""
+    raw = f"{score!r}|{session_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """Parse a cursor produced by encode_search_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        score, session_id = raw.rsplit("|", 1)
+        return float(score), int(session_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+def _sqlite_match(terms: List[str]):
+    """FTS5 join, match condition and score: the negated bm25, so higher is better"""
+    index = table("session_search", column("rowid", Integer))
+    match = " ".join(f'"{term}"*' for term in terms)
+    return (
+        index,
+        SessionModel.id == index.c.rowid,
+        literal_column("session_search").op("MATCH")(match),
+        -func.bm25(literal_column("session_search"), *SQLITE_COLUMN_WEIGHTS, type_=Float)
+    )
+
+def _postgresql_match(terms: List[str]):
+    """tsvector join, match condition and ts_rank score"""
+    index = table("session_search", column("session_id", Integer), column("document"))
+    query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    return (
+        index,
+        SessionModel.id == index.c.session_id,
+        index.c.document.op("@@")(query),
+        func.ts_rank(index.c.document, query, type_=Float)
+    )
+
+class SearchService:
+    
+    @staticmethod
+    def search_sessions(
+        db: Session,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[List[SearchHit], Optional[str]]:
+        """One page of owner_id's sessions matching query, best first, and the next page's cursor.
+        
+        Pages seek past the last hit's (score, id). Scores depend on the whole
+        index, so writes between pages can shift a hit across a page boundary.
+        """
+        terms = search_terms(query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+        
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            index, join, match, score = _sqlite_match(terms)
+        elif dialect == "postgresql":
+            index, join, match, score = _postgresql_match(terms)
+        else:
+            raise ValueError(f"Search is not supported on {dialect}")
+        
+        statement = select(*SESSION_ROW_COLUMNS, score.label("score")).select_from(index).join(
+            SessionModel, join
+        ).where(match, SessionModel.owner_id == owner_id)
+        
+        if cursor:
+            cursor_score, cursor_id = decode_search_cursor(cursor)
+            statement = statement.where(or_(
+                score < cursor_score,
+                and_(score == cursor_score, SessionModel.id < cursor_id)
+            ))
+        
+        rows = db.execute(statement.order_by(score.desc(), SessionModel.id.desc()).limit(limit + 1)).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_search_cursor(last.score, last.id)
+        
+        return [SearchHit(*row) for row in rows], next_cursor
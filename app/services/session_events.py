@@ -0,0 +1,144 @@
+"""In-process pub/sub of committed session changes.
+
+Writes record compact deltas on the database session; they are published to
+the hub only when that transaction commits, so subscribers never see changes
+that were rolled back. Each subscriber gets a bounded queue: one that falls
+behind is sent a single 'resync' event instead of an ever-growing backlog.
+
+Events carry the owner_id of the sessions they describe, and a subscription
+only receives its own user's events (plus ownerless ones such as 'resync').
+
+The hub lives in one process. With several workers, each worker's
+subscribers only see changes made through that worker.
+"""
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import settings
+
+# (sequence number, event) pairs; the sequence number is the SSE event id
+Item = Tuple[int, dict]
+
+DELTA_FIELDS = ("status", "pause_count", "start_time", "end_time", "focus_score")
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def session_delta(db_session, kind: str = "updated") -> dict:
+    """Compact change notice for one session; 'created' events carry the full row"""
+    delta = {"type": kind, "id": db_session.id, "owner_id": db_session.owner_id}
+    fields = DELTA_FIELDS
+    if kind == "created":
+        fields = ("title", "goal", "scheduled_duration", "created_at") + DELTA_FIELDS
+    for name in fields:
+        delta[name] = _isoformat(getattr(db_session, name))
+    return delta
+
+class Subscription:
+    """One listener's queue, fed from any thread and drained on its event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int, owner_id: Optional[int] = None):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.owner_id = owner_id
+        self.closed = False
+
+    def wants(self, item: Item) -> bool:
+        """Whether the item concerns this subscriber's user (every item when unscoped)"""
+        owner = item[1].get("owner_id")
+        return self.owner_id is None or owner is None or owner == self.owner_id
+
+    def deliver(self, item: Item) -> None:
+        if not self.wants(item):
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:  # loop already closed
+            self.closed = True
+
+    def _put(self, item: Item) -> None:
+        if self._queue.full():
+            # Too far behind: replace the backlog with one request to refetch
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            item = (item[0], {"type": "resync"})
+        self._queue.put_nowait(item)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Item]:
+        """Next item, or None if nothing arrived within timeout seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class SessionEventHub:
+    """Fan-out of session deltas to every subscriber, with a short replay buffer"""
+
+    def __init__(self, history_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self._sequence = 0
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+
+    def publish(self, events: List[dict]) -> None:
+        with self._lock:
+            items = []
+            for payload in events:
+                self._sequence += 1
+                items.append((self._sequence, payload))
+            self._history.extend(items)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            for item in items:
+                subscription.deliver(item)
+            if subscription.closed:
+                self.unsubscribe(subscription)
+
+    def subscribe(self, last_event_id: Optional[int] = None, owner_id: Optional[int] = None) -> Subscription:
+        """Register a listener on the running loop, replaying events after last_event_id.
+
+        If the requested events have already left the replay buffer, the
+        listener starts with a 'resync' event.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size, owner_id)
+        with self._lock:
+            if last_event_id is not None and last_event_id < self._sequence:
+                oldest = self._history[0][0] if self._history else self._sequence + 1
+                if last_event_id + 1 < oldest:
+                    subscription._put((self._sequence, {"type": "resync"}))
+                else:
+                    for item in self._history:
+                        if item[0] > last_event_id and subscription.wants(item):
+                            subscription._put(item)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+hub = SessionEventHub(settings.session_events_history, settings.session_events_queue_size)
+
+def record(db: Session, payload: dict) -> None:
+    """Queue an event for publication when db's transaction commits"""
+    db.info.setdefault("pending_session_events", []).append(payload)
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(db: Session) -> None:
+    pending = db.info.pop("pending_session_events", None)
+    if pending:
+        hub.publish(pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(db: Session, previous_transaction) -> None:
+    db.info.pop("pending_session_events", None)
@@ -1,223 +1,818 @@
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from app.models import Session as SessionModel, Interruption
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
+import base64
+from sqlalchemy import TIMESTAMP, and_, case, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.sql.expression import ClauseElement
+from sqlalchemy.orm import Session, selectinload
+from app.models import (
+    Session as SessionModel, Interruption, DailyRollup, DailyInterruptionRollup, TimelineEvent, User,
+    ArchivedSession, ArchivedTimelineEvent, DEFAULT_USER_ID
+)
+from app.services import data_version, expressions, focus_cache, retention, rollups, session_events, timeline
+from app.services.read_models import SessionRow, session_row_columns
+from app.config import settings
 from app import schemas
 
+# Sessions paused more than this many times become 'interrupted'
+MAX_PAUSES = 3
+
+# Accepted report groupings and calendar-to-date periods
+REPORT_BUCKETS = ("day", "week", "month")
+REPORT_PERIODS = ("week", "month", "quarter", "year")
+
+def as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize client datetimes to the naive UTC values stored in the database"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the day/week/month bucket containing day"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+def top_reason(counts: Counter) -> Optional[str]:
+    """Most frequent interruption reason; ties go to the alphabetically first, as daily rollups keep no pause order"""
+    return min(counts, key=lambda reason: (-counts[reason], reason)) if counts else None
+
+def encode_history_cursor(created_at: datetime, session_id: int) -> str:
+    """Build an opaque keyset cursor pointing just past the given row"""
+    raw = f"{created_at.isoformat()}|{session_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Parse a cursor produced by encode_history_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, session_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(session_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
 class SessionService:
     
     @staticmethod
-    def create_session(db: Session, session_data: schemas.SessionCreate) -> SessionModel:
+    def create_session(db: Session, session_data: schemas.SessionCreate, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
         """Create a new scheduled session"""
-        db_session = SessionModel(**session_data.model_dump())
+        db_session = SessionModel(**session_data.model_dump(), owner_id=owner_id)
         db.add(db_session)
+        db.flush()
+        rollups.record_change(db, None, rollups.contribution(db_session))
+        data_version.bump(db, owner_id)
+        session_events.record(db, session_events.session_delta(db_session, "created"))
         db.commit()
         db.refresh(db_session)
         return db_session
     
     @staticmethod
-    def start_session(db: Session, session_id: int) -> SessionModel:
+    def start_session(db: Session, session_id: int, commit: bool = True, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
         """Start a scheduled session"""
-        db_session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-        if not db_session:
-            raise ValueError("Session not found")
-        
-        if db_session.status != 'scheduled':
-            raise ValueError(f"Cannot start session with status: {db_session.status}")
+        now = datetime.utcnow()
+        db_session = SessionService._guarded_update(db, session_id, ['scheduled'], {
+            "status": 'active',
+            "start_time": now,
+            "state_changed_at": now,
+            "due_at": expressions.overrun_deadline(literal(now, TIMESTAMP()), SessionModel.scheduled_duration)
+        }, owner_id=owner_id)
+        if db_session is None:
+            raise SessionService._transition_error(db, session_id, owner_id, "start")
         
-        db_session.status = 'active'
-        db_session.start_time = datetime.utcnow()
-        db.commit()
-        db.refresh(db_session)
-        return db_session
+        before = SessionService._previous_contribution(db_session, 'scheduled', start_time=None)
+        rollups.record_change(db, before, rollups.contribution(db_session))
+        timeline.record(db, [timeline.entry(db_session, "start", now)])
+        return SessionService._finish(db, db_session, commit)
     
     @staticmethod
-    def pause_session(db: Session, session_id: int, reason: str) -> SessionModel:
+    def pause_session(
+        db: Session, session_id: int, reason: str, commit: bool = True, owner_id: int = DEFAULT_USER_ID
+    ) -> SessionModel:
         """Pause an active session"""
-        db_session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-        if not db_session:
-            raise ValueError("Session not found")
-        
-        if db_session.status != 'active':
-            raise ValueError(f"Cannot pause session with status: {db_session.status}")
+        now = datetime.utcnow()
+        # Count the pause and apply the pause limit in the same statement
+        new_pause_count = func.coalesce(SessionModel.pause_count, 0) + 1
+        # A paused session is abandoned once the pause timeout passes, unless it goes overdue first
+        abandon_at = literal(now + timedelta(minutes=settings.session_pause_timeout), TIMESTAMP())
+        db_session = SessionService._guarded_update(db, session_id, ['active'], {
+            **SessionService._accrue('active', now),
+            "pause_count": new_pause_count,
+            "status": case((new_pause_count > MAX_PAUSES, 'interrupted'), else_='paused'),
+            "due_at": case(
+                (new_pause_count > MAX_PAUSES, None),
+                else_=expressions.earliest(
+                    expressions.overrun_deadline(SessionModel.start_time, SessionModel.scheduled_duration), abandon_at
+                )
+            )
+        }, owner_id=owner_id)
+        if db_session is None:
+            raise SessionService._transition_error(db, session_id, owner_id, "pause")
         
         # Create interruption record
-        interruption = Interruption(
+        db.execute(insert(Interruption).values(
             session_id=session_id,
             reason=reason,
-            pause_time=datetime.utcnow()
-        )
-        db.add(interruption)
-        
-        # Update session
-        db_session.status = 'paused'
-        db_session.pause_count += 1
+            pause_time=now
+        ))
         
-        # Check if exceeded 3 pauses
-        if db_session.pause_count > 3:
-            db_session.status = 'interrupted'
-        
-        db.commit()
-        db.refresh(db_session)
-        return db_session
+        before = SessionService._previous_contribution(
+            db_session, 'active', pause_count=db_session.pause_count - 1
+        )
+        rollups.record_change(db, before, rollups.contribution(db_session))
+        rollups.record_interruption(db, owner_id, before.day, reason)
+        timeline.record(db, [timeline.entry(db_session, "pause", now, reason)])
+        return SessionService._finish(db, db_session, commit)
     
     @staticmethod
-    def resume_session(db: Session, session_id: int) -> SessionModel:
+    def resume_session(db: Session, session_id: int, commit: bool = True, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
         """Resume a paused session"""
-        db_session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-        if not db_session:
-            raise ValueError("Session not found")
+        now = datetime.utcnow()
+        due_at = expressions.overrun_deadline(SessionModel.start_time, SessionModel.scheduled_duration)
+        db_session = SessionService._guarded_update(
+            db, session_id, ['paused'], {**SessionService._accrue('paused', now), "status": 'active', "due_at": due_at},
+            owner_id=owner_id
+        )
+        before = None
         
-        if db_session.status not in ['paused', 'abandoned']:
-            raise ValueError(f"Cannot resume session with status: {db_session.status}")
+        if db_session is None:
+            # Abandoned sessions may be resumed too; they are live again, so their end time is cleared
+            current = db.query(SessionModel.status, SessionModel.end_time, SessionModel.paused_seconds).filter(
+                SessionModel.id == session_id, SessionModel.owner_id == owner_id
+            ).first()
+            if current is not None and current.status == 'abandoned':
+                db_session = SessionService._guarded_update(
+                    db, session_id, ['abandoned'],
+                    {**SessionService._accrue('abandoned', now), "status": 'active', "end_time": None, "due_at": due_at},
+                    SessionModel.end_time.is_(None) if current.end_time is None else SessionModel.end_time == current.end_time,
+                    owner_id=owner_id
+                )
+            if db_session is None:
+                raise SessionService._transition_error(db, session_id, owner_id, "resume")
+            before = SessionService._previous_contribution(
+                db_session, 'abandoned', end_time=current.end_time, paused_seconds=current.paused_seconds
+            )
+        else:
+            before = SessionService._previous_contribution(db_session, 'paused')
         
         # Update the most recent interruption with resume time
-        interruption = db.query(Interruption).filter(
+        open_interruption = select(Interruption.id).where(
             Interruption.session_id == session_id,
             Interruption.resume_time.is_(None)
-        ).order_by(Interruption.pause_time.desc()).first()
-        
-        if interruption:
-            interruption.resume_time = datetime.utcnow()
+        ).order_by(Interruption.pause_time.desc()).limit(1).scalar_subquery()
+        db.execute(update(Interruption).where(Interruption.id == open_interruption).values(resume_time=now))
         
-        # Change status back to active
-        db_session.status = 'active'
-        db.commit()
-        db.refresh(db_session)
-        return db_session
+        rollups.record_change(db, before, rollups.contribution(db_session))
+        timeline.record(db, [timeline.entry(db_session, "resume", now)])
+        return SessionService._finish(db, db_session, commit)
     
     @staticmethod
-    def complete_session(db: Session, session_id: int) -> SessionModel:
+    def complete_session(db: Session, session_id: int, commit: bool = True, owner_id: int = DEFAULT_USER_ID) -> SessionModel:
         """Complete a session"""
-        db_session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-        if not db_session:
-            raise ValueError("Session not found")
-        
-        if db_session.status not in ['active', 'paused']:
-            raise ValueError(f"Cannot complete session with status: {db_session.status}")
-        
         now = datetime.utcnow()
-        db_session.end_time = now
         
-        # Check for abandoned sessions (paused but never resumed)
-        initial_status = db_session.status
-        if initial_status == 'paused':
-            db_session.status = 'abandoned'
+        # Active sessions complete normally and paused ones are abandoned, unless either
+        # exceeded the scheduled duration by more than 10%, which makes them overdue
+        for initial_status, outcome in (('active', 'completed'), ('paused', 'abandoned')):
+            db_session = SessionService._guarded_update(db, session_id, [initial_status], {
+                **SessionService._accrue(initial_status, now),
+                "end_time": now,
+                "due_at": None,
+                "status": expressions.completion_status(
+                    SessionModel.start_time, SessionModel.scheduled_duration, now, outcome
+                )
+            }, owner_id=owner_id)
+            if db_session is not None:
+                break
         else:
-            db_session.status = 'completed'
+            raise SessionService._transition_error(db, session_id, owner_id, "complete")
         
-        # Check if overdue (exceeded scheduled duration by more than 10%)
-        if db_session.start_time:
-            actual_duration = (now - db_session.start_time).total_seconds() / 60
-            max_acceptable = db_session.scheduled_duration * 1.1
-            
-            if actual_duration > max_acceptable:
-                db_session.status = 'overdue'
+        before = SessionService._previous_contribution(db_session, initial_status, end_time=None)
+        rollups.record_change(db, before, rollups.contribution(db_session))
+        timeline.record(db, [timeline.entry(db_session, "complete", now)])
+        return SessionService._finish(db, db_session, commit)
+    
+    @staticmethod
+    def expire_sessions(db: Session, now: Optional[datetime] = None, batch_size: int = 500) -> Counter:
+        """Close every active or paused session whose due_at has passed, as complete_session would.
         
-        db.commit()
-        db.refresh(db_session)
-        return db_session
+        Each batch is one UPDATE over at most batch_size rows found through the
+        due_at index, committed on its own, so a sweep costs O(expired) and never
+        holds a long write lock. Returns the number of sessions per new status.
+        """
+        now = now or datetime.utcnow()
+        expired = Counter()
+        for initial_status, outcome in (('active', 'completed'), ('paused', 'abandoned')):
+            while True:
+                rows = SessionService._expire_batch(db, initial_status, outcome, now, batch_size)
+                db.commit()
+                expired.update(row.status for row in rows)
+                if len(rows) < batch_size:
+                    break
+        return expired
     
     @staticmethod
-    def get_session_history(db: Session) -> list:
-        """Get all sessions with calculated stats"""
-        sessions = db.query(SessionModel).order_by(SessionModel.created_at.desc()).all()
-        
-        history = []
-        for session in sessions:
-            session_dict = {
-                "id": session.id,
-                "title": session.title,
-                "goal": session.goal,
-                "scheduled_duration": session.scheduled_duration,
-                "start_time": session.start_time,
-                "end_time": session.end_time,
-                "status": session.status,
-                "pause_count": session.pause_count,
-                "created_at": session.created_at,
-                "actual_duration": None
-            }
-            
-            # Calculate actual duration if completed
-            if session.start_time and session.end_time:
-                duration = (session.end_time - session.start_time).total_seconds() / 60
-                session_dict["actual_duration"] = int(duration)
-            
-            history.append(session_dict)
+    def _expire_batch(db: Session, initial_status: str, outcome: str, now: datetime, batch_size: int) -> list:
+        due = select(SessionModel.id).where(
+            SessionModel.status == initial_status,
+            SessionModel.due_at <= now
+        ).order_by(SessionModel.due_at).limit(batch_size)
+        status = expressions.completion_status(SessionModel.start_time, SessionModel.scheduled_duration, now, outcome)
+        
+        # Re-checking the status keeps a concurrent complete/resume from being overwritten
+        stmt = update(SessionModel).where(
+            SessionModel.id.in_(due.scalar_subquery()),
+            SessionModel.status == initial_status
+        ).values(
+            **SessionService._accrue(initial_status, now),
+            status=status,
+            end_time=now,
+            due_at=None,
+            focus_score=expressions.focus_score(status, SessionModel.pause_count, SessionModel.scheduled_duration)
+        ).returning(
+            SessionModel.id, SessionModel.owner_id, SessionModel.created_at, SessionModel.status, SessionModel.start_time,
+            SessionModel.end_time, SessionModel.pause_count, SessionModel.scheduled_duration, SessionModel.focus_score,
+            SessionModel.focused_seconds, SessionModel.paused_seconds
+        ).execution_options(synchronize_session=False)
+        rows = db.execute(stmt).all()
+        if not rows:
+            return rows
+        
+        rollups.record_changes(db, (
+            (
+                rollups.make_contribution(
+                    row.owner_id, row.created_at, initial_status, row.start_time, None, row.pause_count, row.scheduled_duration
+                ),
+                rollups.make_contribution(
+                    row.owner_id, row.created_at, row.status, row.start_time, row.end_time, row.pause_count,
+                    row.scheduled_duration, row.focused_seconds, row.paused_seconds
+                )
+            )
+            for row in rows
+        ))
+        for row in rows:
+            focus_cache.invalidate(db, row.id)
+            session_events.record(db, session_events.session_delta(row))
+        timeline.record(db, (timeline.entry(row, "expire", now) for row in rows))
+        data_version.bump(db, *(row.owner_id for row in rows))
+        return rows
+    
+    @staticmethod
+    def _guarded_update(
+        db: Session, session_id: int, allowed_statuses: List[str], values: dict, *conditions, owner_id: int
+    ) -> Optional[SessionModel]:
+        """Apply values in one UPDATE ... RETURNING, only while owner_id's session has an allowed status.
+        
+        The stored focus score is recomputed from the new values in the same
+        statement. Returns the updated row, or None when no row matched.
+        """
+        def new_value(name):
+            if name not in values:
+                return getattr(SessionModel, name)
+            return values[name] if isinstance(values[name], ClauseElement) else literal(values[name])
         
+        values = dict(values, focus_score=expressions.focus_score(
+            new_value("status"), new_value("pause_count"), SessionModel.scheduled_duration
+        ))
+        stmt = update(SessionModel).where(
+            SessionModel.id == session_id,
+            SessionModel.owner_id == owner_id,
+            SessionModel.status.in_(allowed_statuses),
+            *conditions
+        ).values(**values).returning(SessionModel).execution_options(synchronize_session=False, populate_existing=True)
+        db_session = db.scalars(stmt).first()
+        if db_session is not None:
+            focus_cache.invalidate(db, session_id)
+            data_version.bump(db, owner_id)
+            session_events.record(db, session_events.session_delta(db_session))
+        return db_session
+    
+    @staticmethod
+    def _accrue(state: str, now: datetime) -> dict:
+        """UPDATE values adding the time spent in state since the last transition to its running total"""
+        column = SessionModel.focused_seconds if state == 'active' else SessionModel.paused_seconds
+        elapsed = expressions.seconds_between(SessionModel.state_changed_at, literal(now, TIMESTAMP()))
+        return {column.key: column + func.coalesce(elapsed, 0), "state_changed_at": now}
+    
+    @staticmethod
+    def _transition_error(db: Session, session_id: int, owner_id: int, action: str) -> ValueError:
+        """Explain why a guarded transition matched no row; other users' sessions are not found"""
+        current = db.query(SessionModel.status).filter(
+            SessionModel.id == session_id, SessionModel.owner_id == owner_id
+        ).first()
+        if current is None:
+            return ValueError("Session not found")
+        return ValueError(f"Cannot {action} session with status: {current.status}")
+    
+    @staticmethod
+    def _previous_contribution(db_session: SessionModel, status: str, **overrides) -> rollups.Contribution:
+        """Rollup contribution of the row before a transition, from its returned state and the replaced values"""
+        previous = {
+            "owner_id": db_session.owner_id,
+            "created_at": db_session.created_at,
+            "status": status,
+            "start_time": db_session.start_time,
+            "end_time": db_session.end_time,
+            "pause_count": db_session.pause_count,
+            "scheduled_duration": db_session.scheduled_duration,
+            "focused_seconds": db_session.focused_seconds,
+            "paused_seconds": db_session.paused_seconds,
+        }
+        previous.update(overrides)
+        return rollups.make_contribution(**previous)
+    
+    @staticmethod
+    def _finish(db: Session, db_session: SessionModel, commit: bool) -> SessionModel:
+        """Commit unless the caller owns the transaction"""
+        if commit:
+            db.commit()
+        return db_session
+    
+    @staticmethod
+    def get_session_history(
+        db: Session,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> list:
+        """Get sessions with calculated stats, newest first"""
+        history, _ = SessionService.get_session_history_page(
+            db, limit=limit, cursor=cursor, statuses=statuses, start=start, end=end
+        )
         return history
     
     @staticmethod
-    def calculate_focus_score(db: Session, session_id: int) -> float:
-        """Calculate focus score for a session"""
-        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-        if not session:
+    def get_session_history_page(
+        db: Session,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[list, Optional[str]]:
+        """Get one keyset page of history and the cursor for the next page (None when exhausted)"""
+        rows, next_cursor = SessionService.get_session_history_rows(
+            db, limit=limit, cursor=cursor, statuses=statuses, start=start, end=end, owner_id=owner_id
+        )
+        return [row.as_dict() for row in rows], next_cursor
+    
+    @staticmethod
+    def get_session_history_rows(
+        db: Session,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        owner_id: int = DEFAULT_USER_ID
+    ) -> Tuple[List[SessionRow], Optional[str]]:
+        """One history page as read-model rows: only the returned columns, no ORM objects"""
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        query = SessionService._history_query(SessionModel, limit, cursor, statuses, start, end, owner_id)
+        
+        # Archived sessions join in only when the range reaches back to them; each tier
+        # contributes its own first page and the merged pages are ordered once more
+        if retention.sessions_span_archive(db, owner_id, start):
+            archived = SessionService._history_query(ArchivedSession, limit, cursor, statuses, start, end, owner_id)
+            pages = union_all(query.subquery().select(), archived.subquery().select()).subquery()
+            query = select(pages).order_by(pages.c.created_at.desc(), pages.c.id.desc())
+            if limit is not None:
+                query = query.limit(limit + 1)
+        rows = db.execute(query).all()
+        
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_history_cursor(last.created_at, last.id)
+        
+        return [SessionRow(*row) for row in rows], next_cursor
+    
+    @staticmethod
+    def _history_query(
+        source, limit: Optional[int], cursor: Optional[str], statuses: Optional[List[str]],
+        start: Optional[datetime], end: Optional[datetime], owner_id: int
+    ):
+        """History page query over one tier: the live sessions or the archive"""
+        query = select(*session_row_columns(source)).where(source.owner_id == owner_id)
+        
+        if statuses:
+            query = query.where(source.status.in_(statuses))
+        if start:
+            query = query.where(source.created_at >= start)
+        if end:
+            query = query.where(source.created_at < end)
+        
+        # Seek past the last row of the previous page instead of using OFFSET
+        if cursor:
+            cursor_created_at, cursor_id = decode_history_cursor(cursor)
+            query = query.where(or_(
+                source.created_at < cursor_created_at,
+                and_(source.created_at == cursor_created_at, source.id < cursor_id)
+            ))
+        
+        query = query.order_by(source.created_at.desc(), source.id.desc())
+        
+        # Fetch one extra row to learn whether another page exists
+        if limit is not None:
+            query = query.limit(limit + 1)
+        return query
+    
+    @staticmethod
+    def get_session_detail(db: Session, session_id: int, owner_id: int = DEFAULT_USER_ID) -> Optional[SessionModel]:
+        """A session with its interruptions, loaded in two queries rather than lazily; archived sessions too"""
+        for source in (SessionModel, ArchivedSession):
+            found = db.scalars(
+                select(source).options(selectinload(source.interruptions)).where(
+                    source.id == session_id, source.owner_id == owner_id
+                )
+            ).first()
+            if found is not None:
+                return found
+        return None
+    
+    @staticmethod
+    def get_session_timeline(
+        db: Session, session_id: int, owner_id: int = DEFAULT_USER_ID, now: Optional[datetime] = None
+    ) -> Optional[dict]:
+        """A session's transitions in order, with totals that include the segment in progress"""
+        for source, events_source in ((SessionModel, TimelineEvent), (ArchivedSession, ArchivedTimelineEvent)):
+            current = db.query(
+                source.status, source.focused_seconds, source.paused_seconds, source.state_changed_at
+            ).filter(source.id == session_id, source.owner_id == owner_id).first()
+            if current is not None:
+                break
+        else:
+            return None
+        
+        events = db.scalars(
+            select(events_source).where(events_source.session_id == session_id).order_by(events_source.id)
+        ).all()
+        # Archived sessions can no longer be resumed, so their stored totals are final
+        if source is ArchivedSession:
+            now = current.state_changed_at
+        focused, paused = timeline.live_totals(
+            current.status, current.focused_seconds, current.paused_seconds, current.state_changed_at,
+            now or datetime.utcnow()
+        )
+        return {
+            "session_id": session_id,
+            "status": current.status,
+            "focused_seconds": focused,
+            "paused_seconds": paused,
+            "events": events,
+        }
+    
+    @staticmethod
+    def get_data_version(db: Session, owner_id: int = DEFAULT_USER_ID) -> int:
+        """Committed data version of owner_id's sessions, for conditional requests and cached responses"""
+        return data_version.current(db, owner_id)
+    
+    @staticmethod
+    def get_team_data_version(db: Session, owner_id: int = DEFAULT_USER_ID) -> int:
+        """Combined data version of everyone in owner_id's workspace"""
+        workspace = select(User.workspace_id).where(User.id == owner_id).scalar_subquery()
+        return data_version.current(db, select(User.id).where(User.workspace_id == workspace))
+    
+    @staticmethod
+    def calculate_focus_score(db: Session, session_id: int, owner_id: int = DEFAULT_USER_ID) -> float:
+        """Focus score of a session, from the cache or the stored column"""
+        cached = focus_cache.focus_scores.get(session_id, owner_id)
+        if cached is not None:
+            return cached
+        
+        generation = focus_cache.focus_scores.generation()
+        row = db.query(SessionModel.focus_score).filter(
+            SessionModel.id == session_id, SessionModel.owner_id == owner_id
+        ).first() or db.query(ArchivedSession.focus_score).filter(
+            ArchivedSession.id == session_id, ArchivedSession.owner_id == owner_id
+        ).first()
+        if not row:
             return 0.0
         
+        focus_cache.focus_scores.put(session_id, row.focus_score, generation, owner_id)
+        return row.focus_score
+    
+    @staticmethod
+    def compute_due_at(
+        status: str, start_time: Optional[datetime], scheduled_duration: int, paused_at: Optional[datetime] = None
+    ) -> Optional[datetime]:
+        """Python form of the due_at each transition stores: when the sweeper may close the session"""
+        if status not in ('active', 'paused') or start_time is None:
+            return None
+        due_at = start_time + timedelta(minutes=scheduled_duration * 1.1)
+        if status == 'paused' and paused_at is not None:
+            due_at = min(due_at, paused_at + timedelta(minutes=settings.session_pause_timeout))
+        return due_at
+    
+    @staticmethod
+    def compute_focus_score(status: str, pause_count: int, scheduled_duration: int) -> float:
+        """Focus score formula shared by per-session reads and rollups"""
+        pause_count = pause_count or 0
+        
         # Base completion ratio
-        completion_ratio = 1.0 if session.status == 'completed' else 0.5
+        completion_ratio = 1.0 if status == 'completed' else 0.5
         
         # Interruption penalty
-        interruption_penalty = min(session.pause_count / session.scheduled_duration, 1.0) if session.scheduled_duration > 0 else 0
+        interruption_penalty = min(pause_count / scheduled_duration, 1.0) if scheduled_duration > 0 else 0
         
         # Focus score formula
         focus_score = (1 - interruption_penalty) * completion_ratio * 100
         return round(max(0, min(100, focus_score)), 2)
     
     @staticmethod
-    def get_weekly_report(db: Session) -> dict:
+    def get_weekly_report(db: Session, owner_id: int = DEFAULT_USER_ID) -> dict:
         """Generate weekly productivity report"""
-        from sqlalchemy import func
-        
         week_ago = datetime.utcnow() - timedelta(days=7)
+        tiers = retention.session_tiers(db, owner_id, week_ago)
         
-        recent_sessions = db.query(SessionModel).filter(
-            SessionModel.created_at >= week_ago
-        ).all()
+        # One grouped pass per tier over the week's sessions: counts, durations and focus scores per status
+        totals = {}
+        for source, _ in tiers:
+            for status, *sums in db.query(
+                source.status,
+                func.count(source.id),
+                func.coalesce(func.sum(expressions.duration_minutes(source.start_time, source.end_time)), 0),
+                func.coalesce(func.sum(source.focus_score), 0.0),
+                func.coalesce(func.sum(expressions.ended_seconds(source.end_time, source.focused_seconds)), 0),
+                func.coalesce(func.sum(expressions.ended_seconds(source.end_time, source.paused_seconds)), 0)
+            ).filter(
+                source.owner_id == owner_id,
+                source.created_at >= week_ago
+            ).group_by(source.status):
+                totals[status] = [total + value for total, value in zip(totals.get(status, [0] * len(sums)), sums)]
+        status_rows = [(status, *totals[status]) for status in sorted(totals)]
         
-        if not recent_sessions:
+        if not status_rows:
             return {
                 "week_start": week_ago,
                 "total_sessions": 0,
                 "total_focus_time": 0,
+                "total_focused_time": 0,
+                "total_paused_time": 0,
                 "average_focus_score": 0.0,
                 "top_interruption_reason": None,
                 "focus_breakdown": {}
             }
         
-        total_focus_time = 0
-        focus_scores = []
-        interruption_reasons = []
+        # Interruption counts per reason among the week's sessions
+        reasons = Counter()
+        for source, interruptions in tiers:
+            reasons.update(dict(db.query(interruptions.reason, func.count(interruptions.id)).join(
+                source, interruptions.session_id == source.id
+            ).filter(
+                source.owner_id == owner_id,
+                source.created_at >= week_ago
+            ).group_by(interruptions.reason).all()))
         
-        for session in recent_sessions:
-            if session.start_time and session.end_time:
-                duration = (session.end_time - session.start_time).total_seconds() / 60
-                total_focus_time += int(duration)
-            
-            score = SessionService.calculate_focus_score(db, session.id)
-            focus_scores.append(score)
-            
-            # Collect interruption reasons
-            for interruption in session.interruptions:
-                interruption_reasons.append(interruption.reason)
-        
-        # Find top interruption reason
-        top_reason = None
-        if interruption_reasons:
-            from collections import Counter
-            top_reason = Counter(interruption_reasons).most_common(1)[0][0]
-        
-        # Focus breakdown by status
-        focus_breakdown = {}
-        for session in recent_sessions:
-            status = session.status
-            focus_breakdown[status] = focus_breakdown.get(status, 0) + 1
+        total_sessions = sum(row[1] for row in status_rows)
+        total_focus_time = sum(int(row[2]) for row in status_rows)
+        total_focus_score = sum(float(row[3]) for row in status_rows)
         
         return {
             "week_start": week_ago,
-            "total_sessions": len(recent_sessions),
+            "total_sessions": total_sessions,
             "total_focus_time": total_focus_time,
-            "average_focus_score": round(sum(focus_scores) / len(focus_scores), 2) if focus_scores else 0,
-            "top_interruption_reason": top_reason,
-            "focus_breakdown": focus_breakdown
+            "total_focused_time": sum(int(row[4]) for row in status_rows) // 60,
+            "total_paused_time": sum(int(row[5]) for row in status_rows) // 60,
+            "average_focus_score": round(total_focus_score / total_sessions, 2),
+            "top_interruption_reason": top_reason(reasons),
+            "focus_breakdown": {row[0]: row[1] for row in status_rows}
         }
+    
+    @staticmethod
+    def report_window(
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        days: Optional[int] = None,
+        period: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Tuple[datetime, datetime]:
+        """Resolve report parameters into a [start, end) window in naive UTC"""
+        now = now or datetime.utcnow()
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        
+        if period is not None:
+            if period not in REPORT_PERIODS:
+                raise ValueError(f"Unknown period: {period}")
+            if start or end or days:
+                raise ValueError("period cannot be combined with start, end or days")
+            today = now.date()
+            if period == "week":
+                first = today - timedelta(days=today.weekday())
+            elif period == "month":
+                first = today.replace(day=1)
+            elif period == "quarter":
+                first = today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1)
+            else:
+                first = today.replace(month=1, day=1)
+            return datetime.combine(first, time.min), now
+        
+        end = end or now
+        if days is not None:
+            if start:
+                raise ValueError("days cannot be combined with start")
+            start = end - timedelta(days=days)
+        if start is None:
+            raise ValueError("Provide start, days or period")
+        if start >= end:
+            raise ValueError("start must be before end")
+        return start, end
+    
+    @staticmethod
+    def get_range_report(
+        db: Session, start: datetime, end: datetime, bucket: str = "day", owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Productivity report over [start, end) grouped into day/week/month buckets.
+        
+        Whole days are read from the owner's daily rollups; only the partial days
+        at the edges of the window are aggregated from raw rows.
+        """
+        if bucket not in REPORT_BUCKETS:
+            raise ValueError(f"Unknown bucket: {bucket}")
+        status_rows, reason_rows = SessionService._report_rows(db, owner_id, start, end)
+        return SessionService._build_report(status_rows, reason_rows, start, end, bucket)
+    
+    @staticmethod
+    def get_team_report(
+        db: Session, start: datetime, end: datetime, bucket: str = "day", owner_id: int = DEFAULT_USER_ID
+    ) -> dict:
+        """Range report over every member of owner_id's workspace, with per-member totals.
+        
+        Reads each member's rollups, so the cost grows with the team's data only.
+        """
+        if bucket not in REPORT_BUCKETS:
+            raise ValueError(f"Unknown bucket: {bucket}")
+        workspace_id = db.query(User.workspace_id).filter(User.id == owner_id).scalar()
+        if workspace_id is None:
+            raise ValueError("User not found")
+        members = dict(db.query(User.id, User.name).filter(User.workspace_id == workspace_id).all())
+        
+        status_rows, reason_rows = SessionService._report_rows(
+            db, select(User.id).where(User.workspace_id == workspace_id), start, end
+        )
+        report = SessionService._build_report(status_rows, reason_rows, start, end, bucket)
+        
+        totals = {member_id: _ReportTotals() for member_id in members}
+        for member_id, _, status, count, *sums in status_rows:
+            if count and member_id in totals:
+                totals[member_id].add_status(status, count, *sums)
+        for member_id, _, reason, count in reason_rows:
+            if count and member_id in totals:
+                totals[member_id].reasons[reason] += count
+        
+        report["workspace_id"] = workspace_id
+        report["members"] = [
+            {"user_id": member_id, "name": members[member_id], **totals[member_id].as_dict()}
+            for member_id in sorted(members)
+        ]
+        return report
+    
+    @staticmethod
+    def _report_rows(db: Session, owners, start: datetime, end: datetime) -> Tuple[list, list]:
+        """(owner, day, status, count, minutes, pauses, score_sum, focused_seconds, paused_seconds)
+        and (owner, day, reason, count) rows for a window"""
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        
+        first_full = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        last_full = end.date()  # exclusive
+        
+        status_rows = []
+        reason_rows = []
+        
+        if first_full < last_full:
+            status_rows += db.query(
+                DailyRollup.owner_id, DailyRollup.day, DailyRollup.status, DailyRollup.session_count,
+                DailyRollup.focus_minutes, DailyRollup.pause_count, DailyRollup.focus_score_sum,
+                DailyRollup.focused_seconds, DailyRollup.paused_seconds
+            ).filter(
+                expressions.owned_by(DailyRollup.owner_id, owners), DailyRollup.day >= first_full, DailyRollup.day < last_full
+            ).all()
+            reason_rows += db.query(
+                DailyInterruptionRollup.owner_id, DailyInterruptionRollup.day, DailyInterruptionRollup.reason,
+                DailyInterruptionRollup.interruption_count
+            ).filter(
+                expressions.owned_by(DailyInterruptionRollup.owner_id, owners),
+                DailyInterruptionRollup.day >= first_full, DailyInterruptionRollup.day < last_full
+            ).all()
+            partial = [(start, datetime.combine(first_full, time.min)), (datetime.combine(last_full, time.min), end)]
+        else:
+            partial = [(start, end)]
+        
+        for raw_start, raw_end in partial:
+            if raw_start < raw_end:
+                rows, reasons = SessionService._aggregate_raw(db, owners, raw_start, raw_end)
+                status_rows += rows
+                reason_rows += reasons
+        return status_rows, reason_rows
+    
+    @staticmethod
+    def _build_report(status_rows: list, reason_rows: list, start: datetime, end: datetime, bucket: str) -> dict:
+        start, end = as_utc_naive(start), as_utc_naive(end)
+        
+        buckets = {}
+        for _, day, status, count, *sums in status_rows:
+            if not count:
+                continue
+            slot = buckets.setdefault(bucket_start(day, bucket), _ReportTotals())
+            slot.add_status(status, count, *sums)
+        for _, day, reason, count in reason_rows:
+            if count:
+                buckets.setdefault(bucket_start(day, bucket), _ReportTotals()).reasons[reason] += count
+        
+        overall = _ReportTotals()
+        for slot in buckets.values():
+            overall.merge(slot)
+        
+        return {
+            "start": start,
+            "end": end,
+            "bucket": bucket,
+            **overall.as_dict(),
+            "buckets": [
+                {"bucket_start": key, **buckets[key].as_dict()} for key in sorted(buckets)
+            ]
+        }
+    
+    @staticmethod
+    def _aggregate_raw(db: Session, owners, start: datetime, end: datetime) -> Tuple[list, list]:
+        """Rollup-shaped aggregates straight from raw rows for a window within one day, archive included when it reaches it"""
+        day = start.date()
+        status_rows = []
+        reason_rows = []
+        for source, interruptions in retention.session_tiers(db, owners, start):
+            window = and_(expressions.owned_by(source.owner_id, owners), source.created_at >= start, source.created_at < end)
+            
+            status_rows += [(owner, day, status, *sums) for owner, status, *sums in db.query(
+                source.owner_id,
+                source.status,
+                func.count(source.id),
+                func.coalesce(func.sum(expressions.duration_minutes(source.start_time, source.end_time)), 0),
+                func.coalesce(func.sum(source.pause_count), 0),
+                func.coalesce(func.sum(source.focus_score), 0.0),
+                func.coalesce(func.sum(expressions.ended_seconds(source.end_time, source.focused_seconds)), 0),
+                func.coalesce(func.sum(expressions.ended_seconds(source.end_time, source.paused_seconds)), 0)
+            ).filter(window).group_by(source.owner_id, source.status)]
+            
+            reason_rows += [(owner, day, reason, count) for owner, reason, count in db.query(
+                source.owner_id, interruptions.reason, func.count(interruptions.id)
+            ).join(source, interruptions.session_id == source.id).filter(window).group_by(
+                source.owner_id, interruptions.reason
+            )]
+        
+        return status_rows, reason_rows
+    
+    @staticmethod
+    def rebuild_rollups(db: Session) -> None:
+        """Recompute the daily rollups from raw sessions and interruptions"""
+        rollups.rebuild(db)
+        data_version.bump(db, *db.scalars(select(User.id)))
+        db.commit()
 
+class _ReportTotals:
+    """Running totals for one report bucket"""
+    
+    def __init__(self):
+        self.sessions = 0
+        self.focus_minutes = 0
+        self.pauses = 0
+        self.focus_score_sum = 0.0
+        self.focused_seconds = 0
+        self.paused_seconds = 0
+        self.breakdown = Counter()
+        self.reasons = Counter()
+    
+    def add_status(self, status, count, minutes, pauses, score_sum, focused_seconds=0, paused_seconds=0):
+        self.sessions += count
+        self.focus_minutes += int(minutes)
+        self.pauses += int(pauses)
+        self.focus_score_sum += float(score_sum)
+        self.focused_seconds += int(focused_seconds)
+        self.paused_seconds += int(paused_seconds)
+        self.breakdown[status] += count
+    
+    def merge(self, other: "_ReportTotals"):
+        self.sessions += other.sessions
+        self.focus_minutes += other.focus_minutes
+        self.pauses += other.pauses
+        self.focus_score_sum += other.focus_score_sum
+        self.focused_seconds += other.focused_seconds
+        self.paused_seconds += other.paused_seconds
+        self.breakdown.update(other.breakdown)
+        self.reasons.update(other.reasons)
+    
+    def as_dict(self) -> dict:
+        return {
+            "total_sessions": self.sessions,
+            "total_focus_time": self.focus_minutes,
+            "total_focused_time": self.focused_seconds // 60,
+            "total_paused_time": self.paused_seconds // 60,
+            "total_pauses": self.pauses,
+            "average_focus_score": round(self.focus_score_sum / self.sessions, 2) if self.sessions else 0.0,
+            "top_interruption_reason": top_reason(self.reasons),
+            "focus_breakdown": dict(self.breakdown)
+        }
@@ -0,0 +1,49 @@
+"""Background expiry of sessions nobody completes.
+
+A session left active or paused is closed by the sweeper once its due_at
+passes, with the outcome complete_session would have given it at that moment.
+Sweeps run on a worker thread so the event loop keeps serving requests.
+Several processes may sweep the same database: every UPDATE re-checks the
+status it expects, so a session is closed at most once.
+"""
+import asyncio
+import logging
+from collections import Counter
+from typing import Callable
+from sqlalchemy.orm import Session
+from app import metrics
+from app.services.session_service import SessionService
+
+logger = logging.getLogger("app.sweeper")
+
+SESSIONS_EXPIRED = metrics.REGISTRY.register(metrics.Counter(
+    "sessions_expired_total", "Sessions closed by the background sweeper, by new status", ("status",)
+))
+SWEEP_DURATION = metrics.REGISTRY.register(metrics.Histogram(
+    "session_sweep_duration_seconds", "Time taken by one background sweep"
+))
+
+def sweep_once(session_factory: Callable[[], Session], batch_size: int) -> Counter:
+    """Expire every due session using a fresh database session"""
+    db = session_factory()
+    try:
+        return SessionService.expire_sessions(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+async def run(session_factory: Callable[[], Session], interval: float, batch_size: int) -> None:
+    """Sweep immediately, then every interval seconds until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        try:
+            expired = await asyncio.to_thread(sweep_once, session_factory, batch_size)
+        except Exception:
+            logger.exception("session_sweep_failed")
+        else:
+            SWEEP_DURATION.observe(loop.time() - started)
+            for status, count in expired.items():
+                SESSIONS_EXPIRED.inc(count, status=status)
+            if expired:
+                logger.info("sessions_expired", extra={"expired": dict(expired)})
+        await asyncio.sleep(interval)
@@ -0,0 +1,93 @@
+"""Append-only log of session lifecycle transitions.
+
+Every transition appends one session_timeline row holding the session's
+running totals of focused and paused seconds. The same totals are stored on
+the session row by the transition's own UPDATE, so a session's true focus
+time is a column read and reports sum it without touching interruptions.
+
+Time since the last transition (state_changed_at) belongs to the state the
+session is in: focused while active, paused while paused or abandoned (an
+abandoned session can still be resumed, and resuming it counts that time as
+paused). Completed, interrupted and overdue sessions accrue nothing.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import TimelineEvent
+
+def elapsed_seconds(start: datetime, end: datetime) -> int:
+    """Whole seconds from start to end, rounded like expressions.seconds_between, never negative"""
+    return max(0, round((end - start).total_seconds()))
+
+def entry(session, kind: str, occurred_at: datetime, reason: Optional[str] = None) -> dict:
+    """Timeline row for a transition that just left session in its current state"""
+    return {
+        "session_id": session.id,
+        "kind": kind,
+        "status": session.status,
+        "occurred_at": occurred_at,
+        "reason": reason,
+        "focused_seconds": session.focused_seconds,
+        "paused_seconds": session.paused_seconds,
+    }
+
+def record(db: Session, entries: Iterable[dict]) -> None:
+    """Append timeline rows in one executemany INSERT"""
+    entries = list(entries)
+    if entries:
+        db.execute(insert(TimelineEvent), entries)
+
+def live_totals(
+    status: str, focused_seconds: int, paused_seconds: int, state_changed_at: Optional[datetime], now: datetime
+) -> Tuple[int, int]:
+    """Running totals including the segment still in progress at now"""
+    if state_changed_at is not None:
+        if status == 'active':
+            focused_seconds += elapsed_seconds(state_changed_at, now)
+        elif status in ('paused', 'abandoned'):
+            paused_seconds += elapsed_seconds(state_changed_at, now)
+    return focused_seconds, paused_seconds
+
+def replay(
+    status: str, start_time: Optional[datetime], end_time: Optional[datetime], interruptions: Iterable
+) -> Tuple[List[dict], int, int, Optional[datetime]]:
+    """Reconstruct the timeline of a session known only by its times and interruptions.
+    
+    interruptions are (reason, pause_time, resume_time) tuples. Returns
+    (entries without session_id, focused_seconds, paused_seconds, state_changed_at).
+    The last entry carries the session's recorded status.
+    """
+    if start_time is None:
+        return [], 0, 0, None
+    
+    entries = []
+    totals = {"active": 0, "paused": 0}
+    state, changed_at = "active", start_time
+    
+    def advance(kind, at, new_state, reason=None):
+        nonlocal state, changed_at
+        totals[state] += elapsed_seconds(changed_at, at)
+        state, changed_at = new_state, max(changed_at, at)
+        entries.append({
+            "kind": kind, "status": new_state, "occurred_at": at, "reason": reason,
+            "focused_seconds": totals["active"], "paused_seconds": totals["paused"],
+        })
+    
+    entries.append({
+        "kind": "start", "status": "active", "occurred_at": start_time, "reason": None,
+        "focused_seconds": 0, "paused_seconds": 0,
+    })
+    for reason, pause_time, resume_time in sorted(
+        (i for i in interruptions if i[1] is not None), key=lambda i: i[1]
+    ):
+        if state != "active":
+            break
+        advance("pause", pause_time, "paused", reason)
+        if resume_time is not None:
+            advance("resume", resume_time, "active")
+    if end_time is not None:
+        advance("complete", end_time, status)
+    
+    entries[-1]["status"] = status
+    return entries, totals["active"], totals["paused"], changed_at
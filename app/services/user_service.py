@@ -0,0 +1,47 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models import User, Workspace, DEFAULT_USER_ID
+from app.services import data_version
+from app import schemas
+
+class UserService:
+    
+    @staticmethod
+    def is_admin(user_id: int) -> bool:
+        """The default user administers the deployment: it creates workspaces and may add users to any of them"""
+        return user_id == DEFAULT_USER_ID
+    
+    @staticmethod
+    def create_workspace(
+        db: Session, workspace_data: schemas.WorkspaceCreate, acting_user_id: int = DEFAULT_USER_ID
+    ) -> Workspace:
+        """Create an empty workspace; only the administrator may"""
+        if not UserService.is_admin(acting_user_id):
+            raise PermissionError("Only the administrator can create workspaces")
+        workspace = Workspace(**workspace_data.model_dump())
+        db.add(workspace)
+        db.commit()
+        db.refresh(workspace)
+        return workspace
+    
+    @staticmethod
+    def create_user(db: Session, user_data: schemas.UserCreate, acting_user_id: int = DEFAULT_USER_ID) -> User:
+        """Add a user to an existing workspace; only its members and the administrator may"""
+        if not UserService.is_admin(acting_user_id):
+            acting_user = db.get(User, acting_user_id)
+            if acting_user is None or acting_user.workspace_id != user_data.workspace_id:
+                raise PermissionError("Only members of the workspace can add users to it")
+        if db.get(Workspace, user_data.workspace_id) is None:
+            raise ValueError("Workspace not found")
+        user = User(**user_data.model_dump())
+        db.add(user)
+        db.flush()
+        # A new member changes the workspace's team report, so its version must move
+        data_version.bump(db, user.id)
+        db.commit()
+        db.refresh(user)
+        return user
+    
+    @staticmethod
+    def get_user(db: Session, user_id: int) -> Optional[User]:
+        return db.get(User, user_id)
@@ -0,0 +1,171 @@
+"""Year-long analytics: Arrow compute vs the same statistics in a Python loop per row.
+
+Each statistic is timed end to end (query plus computation) and on rows that
+are already in memory, which isolates the computation from the shared cost of
+reading the rows.
+"""
+from collections import Counter, defaultdict
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from app.models import Session as SessionModel, Interruption, DEFAULT_USER_ID
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService, FOCUS_SCORE_BINS, FOCUS_SCORE_BIN_WIDTH, PERCENTILES
+
+# Seeded sessions span the year before the dataset was generated; cover all of them
+WINDOW = (datetime(2000, 1, 1), datetime(2100, 1, 1))
+
+def _percentile(ordered, fraction):
+    """Linear interpolation between closest ranks"""
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def loop_focus_score_bins(rows):
+    counts = [0] * FOCUS_SCORE_BINS
+    for score, *_ in rows:
+        if score is not None:
+            counts[max(0, min(int(score // FOCUS_SCORE_BIN_WIDTH), FOCUS_SCORE_BINS - 1))] += 1
+    return counts
+
+def loop_percentiles(rows):
+    columns = defaultdict(list)
+    for score, focused, paused, pauses in rows:
+        columns["focus_score"].append(score)
+        columns["focused_minutes"].append(focused / 60)
+        columns["paused_minutes"].append(paused / 60)
+        columns["pause_count"].append(pauses)
+    return {
+        name: [round(_percentile(sorted(values), percentile / 100), 2) for percentile in PERCENTILES]
+        for name, values in columns.items()
+    }
+
+def loop_heatmap(rows):
+    sessions = [[0] * 24 for _ in range(7)]
+    focused = [[0] * 24 for _ in range(7)]
+    for start_time, seconds in rows:
+        sessions[start_time.weekday()][start_time.hour] += 1
+        focused[start_time.weekday()][start_time.hour] += seconds
+    return sessions, [[seconds // 60 for seconds in row] for row in focused]
+
+def loop_longest_streak(rows):
+    days = sorted({created_at.date() for (created_at,) in rows})
+    longest = run = 0
+    for previous, day in zip([None] + days, days):
+        run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+    return longest
+
+def loop_interruption_trends(rows):
+    counts = Counter()
+    for pause_time, reason in rows:
+        counts[(pause_time.date().replace(day=1), reason)] += 1
+    return counts
+
+def _sessions(*columns):
+    return select(*columns).where(
+        SessionModel.owner_id == DEFAULT_USER_ID,
+        SessionModel.created_at >= WINDOW[0],
+        SessionModel.created_at < WINDOW[1]
+    )
+
+# name: (load into Arrow, ORM query of the same rows, Arrow computation, row loop)
+STATISTICS = {
+    "focus-scores": (
+        analytics_service.load_ended_sessions,
+        lambda db: db.execute(_sessions(
+            SessionModel.focus_score, SessionModel.focused_seconds, SessionModel.paused_seconds, SessionModel.pause_count
+        ).where(SessionModel.end_time.isnot(None))),
+        lambda table: [b["count"] for b in analytics_service.focus_score_distribution(table)["bins"]],
+        loop_focus_score_bins
+    ),
+    "percentiles": (
+        analytics_service.load_ended_sessions,
+        lambda db: db.execute(_sessions(
+            SessionModel.focus_score, SessionModel.focused_seconds, SessionModel.paused_seconds, SessionModel.pause_count
+        ).where(SessionModel.end_time.isnot(None))),
+        lambda table: {
+            name: values for name, values in analytics_service.percentiles(table).items()
+            if name in ("focus_score", "focused_minutes", "paused_minutes", "pause_count")
+        },
+        loop_percentiles
+    ),
+    "heatmap": (
+        analytics_service.load_started_sessions,
+        lambda db: (
+            (start_time, seconds if end_time is not None else 0)
+            for start_time, end_time, seconds in db.execute(_sessions(
+                SessionModel.start_time, SessionModel.end_time, SessionModel.focused_seconds
+            ).where(SessionModel.start_time.isnot(None)))
+        ),
+        lambda table: (lambda report: (report["sessions"], report["focused_minutes"]))(
+            analytics_service.hourly_heatmap(table)
+        ),
+        loop_heatmap
+    ),
+    "streaks": (
+        analytics_service.load_completed_sessions,
+        lambda db: db.execute(_sessions(SessionModel.created_at).where(SessionModel.status == 'completed')),
+        lambda table: analytics_service.streaks(table, WINDOW[1])["longest"],
+        loop_longest_streak
+    ),
+    "interruptions": (
+        analytics_service.load_interruptions,
+        lambda db: db.execute(select(Interruption.pause_time, Interruption.reason).join(
+            SessionModel, Interruption.session_id == SessionModel.id
+        ).where(
+            SessionModel.owner_id == DEFAULT_USER_ID,
+            Interruption.pause_time >= WINDOW[0],
+            Interruption.pause_time < WINDOW[1]
+        )),
+        lambda table: Counter({
+            (bucket["bucket_start"], reason): count
+            for bucket in analytics_service.interruption_trends(table, "month", top=1000)["buckets"]
+            for reason, count in bucket["counts"].items()
+        }),
+        loop_interruption_trends
+    ),
+}
+
+def _rows(table):
+    """The table's rows as Python tuples, as a row loop would receive them"""
+    return list(zip(*(table[name].to_pylist() for name in table.column_names)))
+
+@pytest.mark.parametrize("statistic", list(STATISTICS))
+def test_vectorized_matches_loop(db, dataset_size, statistic):
+    load, query, vectorized, loop = STATISTICS[statistic]
+    table = load(db, *WINDOW)
+    assert vectorized(table) == loop(query(db)) == loop(_rows(table))
+
+@pytest.mark.parametrize("statistic", list(STATISTICS))
+def test_analytics_end_to_end_vectorized(benchmark, db, dataset_size, statistic):
+    load, _, vectorized, _ = STATISTICS[statistic]
+    benchmark.group = f"analytics-{statistic}"
+    benchmark.pedantic(lambda: vectorized(load(db, *WINDOW)), rounds=3, iterations=1)
+
+@pytest.mark.parametrize("statistic", list(STATISTICS))
+def test_analytics_end_to_end_loop(benchmark, db, dataset_size, statistic):
+    _, query, _, loop = STATISTICS[statistic]
+    benchmark.group = f"analytics-{statistic}"
+    benchmark.pedantic(lambda: loop(query(db)), rounds=3, iterations=1)
+
+@pytest.mark.parametrize("statistic", list(STATISTICS))
+def test_analytics_compute_vectorized(benchmark, db, dataset_size, statistic):
+    load, _, vectorized, _ = STATISTICS[statistic]
+    table = load(db, *WINDOW)
+    benchmark.group = f"analytics-{statistic}"
+    benchmark.pedantic(vectorized, args=(table,), rounds=5, iterations=1)
+
+@pytest.mark.parametrize("statistic", list(STATISTICS))
+def test_analytics_compute_loop(benchmark, db, dataset_size, statistic):
+    load, _, _, loop = STATISTICS[statistic]
+    rows = _rows(load(db, *WINDOW))
+    benchmark.group = f"analytics-{statistic}"
+    benchmark.pedantic(loop, args=(rows,), rounds=5, iterations=1)
+
+def test_service_entry_points(db, dataset_size):
+    """The service methods wrap the same load and compute steps"""
+    assert AnalyticsService.get_streaks(db, *WINDOW)["longest"] == STATISTICS["streaks"][2](
+        analytics_service.load_completed_sessions(db, *WINDOW)
+    )
@@ -0,0 +1,68 @@
+"""HTTP-level benchmarks: the same operations through the FastAPI app"""
+import random
+from app.models import Session as SessionModel
+from app.services.response_cache import reports as report_cache
+
+def test_api_history(benchmark, client, dataset_size):
+    response = benchmark(client.get, "/sessions/history", params={"limit": 100})
+    assert response.status_code == 200
+
+def test_api_weekly_report(benchmark, client, dataset_size):
+    # Every round computes the report: the response cache is emptied before each one
+    response = benchmark.pedantic(
+        client.get, args=("/sessions/report/weekly",), setup=report_cache.clear, rounds=50, iterations=1
+    )
+    assert response.status_code == 200
+
+def test_api_weekly_report_cached(benchmark, client, dataset_size):
+    client.get("/sessions/report/weekly")
+    response = benchmark(client.get, "/sessions/report/weekly")
+    assert response.status_code == 200
+
+def test_api_range_report_year(benchmark, client, dataset_size):
+    response = benchmark.pedantic(
+        client.get, args=("/sessions/report",), kwargs={"params": {"days": 365, "bucket": "month"}},
+        setup=report_cache.clear, rounds=50, iterations=1
+    )
+    assert response.status_code == 200
+
+def test_api_export_csv(benchmark, client, dataset_size):
+    response = benchmark.pedantic(client.get, args=("/sessions/export/csv",), rounds=3, iterations=1)
+    assert response.status_code == 200
+
+def test_api_focus_score(benchmark, client, db, dataset_size):
+    ids = [row.id for row in db.query(SessionModel.id).limit(1000)]
+    rng = random.Random(7)
+    benchmark(lambda: client.get(f"/sessions/{rng.choice(ids)}/focus-score"))
+
+def test_api_create_session(benchmark, client, dataset_size):
+    response = benchmark(client.post, "/sessions/", json={"title": "Benchmark", "scheduled_duration": 45})
+    assert response.status_code == 201
+
+def test_api_start_session(benchmark, client, make_session, dataset_size):
+    benchmark.pedantic(
+        lambda session_id: client.patch(f"/sessions/{session_id}/start"),
+        setup=lambda: ((make_session("scheduled"),), {}), rounds=100
+    )
+
+def test_api_pause_session(benchmark, client, make_session, dataset_size):
+    benchmark.pedantic(
+        lambda session_id: client.patch(f"/sessions/{session_id}/pause", json={"reason": "Benchmark"}),
+        setup=lambda: ((make_session("active"),), {}), rounds=100
+    )
+
+def test_api_resume_session(benchmark, client, make_session, dataset_size):
+    benchmark.pedantic(
+        lambda session_id: client.patch(f"/sessions/{session_id}/resume"),
+        setup=lambda: ((make_session("paused"),), {}), rounds=100
+    )
+
+def test_api_complete_session(benchmark, client, make_session, dataset_size):
+    benchmark.pedantic(
+        lambda session_id: client.patch(f"/sessions/{session_id}/complete"),
+        setup=lambda: ((make_session("active"),), {}), rounds=100
+    )
+
+def test_api_search(benchmark, client, dataset_size):
+    response = benchmark(client.get, "/sessions/search", params={"q": "review phone"})
+    assert response.status_code == 200
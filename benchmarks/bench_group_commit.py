@@ -0,0 +1,103 @@
+"""Lifecycle transition throughput and latency with and without group commit.
+
+Each client takes its own scheduled sessions through start, pause, resume
+and complete as fast as the service answers, over the application's async
+engine and connection pool. A round reports transitions per second and
+per-transition latency percentiles in extra_info. Durability varies too:
+synchronous=NORMAL in WAL mode (the default) skips the fsync per commit,
+while FULL pays it.
+"""
+import asyncio
+import statistics
+import time
+from typing import Tuple
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.config import Settings, settings
+from app.database import build_async_engine
+from app.services import group_commit
+from app.services.async_session_service import AsyncSessionService
+from app.services.bulk_service import BulkService
+
+CONCURRENCY = (1, 8, 32, 128)
+SESSIONS_PER_CLIENT = 10
+TRANSITIONS_PER_CLIENT = 4 * SESSIONS_PER_CLIENT
+
+# mode: write batch window in milliseconds (0 commits every transition on its own)
+MODES = {"per-transition": 0.0, "group-commit": 2.0}
+
+# Each session goes through one full lifecycle
+STEPS = (
+    lambda db, session_id: AsyncSessionService.start_session(db, session_id),
+    lambda db, session_id: AsyncSessionService.pause_session(db, session_id, "Benchmark"),
+    lambda db, session_id: AsyncSessionService.resume_session(db, session_id),
+    lambda db, session_id: AsyncSessionService.complete_session(db, session_id),
+)
+
+def _schedule(db, clients: int) -> list:
+    """Fresh scheduled session ids, SESSIONS_PER_CLIENT for each client"""
+    items = [
+        (index, BulkService.parse_import_item({"title": "Benchmark", "scheduled_duration": 45}))
+        for index in range(clients * SESSIONS_PER_CLIENT)
+    ]
+    BulkService.import_sessions(db, items)
+    ids = [session_id for (session_id,) in db.execute(text(
+        "SELECT id FROM sessions WHERE status = 'scheduled' ORDER BY id DESC LIMIT :n"
+    ), {"n": len(items)})]
+    return [ids[client::clients] for client in range(clients)]
+
+async def _workload(database_url: str, synchronous: str, sessions_per_client: list) -> Tuple[list, int]:
+    """Latency in seconds of every successful transition, and the number that failed"""
+    engine = build_async_engine(database_url, Settings(sqlite_synchronous=synchronous))
+    AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    latencies = []
+    failed = 0
+
+    async def client(session_ids):
+        nonlocal failed
+        for session_id in session_ids:
+            for step in STEPS:
+                async with AsyncSessionLocal() as db:
+                    started = time.perf_counter()
+                    try:
+                        await step(db, session_id)
+                    except (OperationalError, ValueError):
+                        # "database is locked", and the steps after it that find the session in the wrong state
+                        failed += 1
+                        continue
+                    latencies.append(time.perf_counter() - started)
+
+    try:
+        await asyncio.gather(*(client(session_ids) for session_ids in sessions_per_client))
+    finally:
+        await group_commit.shutdown()
+        await engine.dispose()
+    return latencies, failed
+
+@pytest.mark.parametrize("synchronous", ["NORMAL", "FULL"])
+@pytest.mark.parametrize("concurrency", CONCURRENCY)
+@pytest.mark.parametrize("mode", list(MODES))
+def test_transition_throughput(benchmark, monkeypatch, database_url, db, dataset_size, mode, concurrency, synchronous):
+    monkeypatch.setattr(settings, "write_batch_window_ms", MODES[mode])
+    benchmark.group = f"transitions-{synchronous.lower()}-x{concurrency}"
+    outcome = {}
+
+    def run(sessions_per_client):
+        outcome["latencies"], outcome["failed"] = asyncio.run(
+            _workload(database_url, synchronous, sessions_per_client)
+        )
+
+    benchmark.pedantic(run, setup=lambda: ((_schedule(db, concurrency),), {}), rounds=3, iterations=1)
+    latencies = outcome["latencies"]
+    quantiles = statistics.quantiles(latencies, n=100)
+    benchmark.extra_info.update(
+        transitions_per_second=round(len(latencies) / benchmark.stats.stats.median),
+        failed=outcome["failed"],
+        p50_ms=round(quantiles[49] * 1000, 2),
+        p99_ms=round(quantiles[98] * 1000, 2),
+    )
+    assert len(latencies) + outcome["failed"] == concurrency * TRANSITIONS_PER_CLIENT
+    if mode == "group-commit":
+        assert outcome["failed"] == 0
@@ -0,0 +1,41 @@
+"""Loading a large history page: full ORM hydration vs the read-model rows"""
+import gc
+import tracemalloc
+import pytest
+from app.models import Session as SessionModel
+from app.services.session_service import SessionService
+
+def _bytes_per_row(load):
+    """Memory retained by the loaded rows, per row"""
+    gc.collect()
+    tracemalloc.start()
+    rows = load()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained // max(len(rows), 1)
+
+@pytest.mark.benchmark(group="history-load")
+def test_load_orm_objects(benchmark, db, dataset_size):
+    def load():
+        rows = db.query(SessionModel).order_by(SessionModel.created_at.desc(), SessionModel.id.desc()).all()
+        db.expunge_all()
+        return rows
+    benchmark.extra_info["bytes_per_row"] = _bytes_per_row(
+        lambda: db.query(SessionModel).order_by(SessionModel.created_at.desc(), SessionModel.id.desc()).all()
+    )
+    db.expunge_all()
+    benchmark.pedantic(load, rounds=3, iterations=1)
+
+@pytest.mark.benchmark(group="history-load")
+def test_load_read_model_rows(benchmark, db, dataset_size):
+    def load():
+        return SessionService.get_session_history_rows(db)[0]
+    benchmark.extra_info["bytes_per_row"] = _bytes_per_row(load)
+    benchmark.pedantic(load, rounds=3, iterations=1)
+
+@pytest.mark.benchmark(group="history-load")
+def test_load_dicts(benchmark, db, dataset_size):
+    def load():
+        return SessionService.get_session_history(db)
+    benchmark.extra_info["bytes_per_row"] = _bytes_per_row(load)
+    benchmark.pedantic(load, rounds=3, iterations=1)
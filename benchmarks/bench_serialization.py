@@ -0,0 +1,61 @@
+"""Encoding cost of large history and NDJSON export payloads.
+
+Each group times the previous path (Pydantic validation per row, stdlib json)
+against the fast path the endpoints use now (trusted rows, orjson).
+"""
+import json
+from typing import List
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app import schemas, serialization
+from app.services.export_service import ExportService, SESSION_EXPORT_FIELDS
+from app.services.session_service import SessionService
+
+HISTORY_ADAPTER = TypeAdapter(List[schemas.SessionHistory])
+
+@pytest.fixture
+def full_history(db):
+    return SessionService.get_session_history(db)
+
+@pytest.fixture
+def export_rows(db):
+    return list(ExportService.iter_session_rows(db))
+
+@pytest.mark.benchmark(group="history-encode")
+def test_history_validate_and_json(benchmark, full_history, dataset_size):
+    """Response-model validation followed by jsonable_encoder and json.dumps"""
+    def encode():
+        validated = HISTORY_ADAPTER.validate_python(full_history)
+        return json.dumps(jsonable_encoder(validated), separators=(",", ":")).encode()
+    benchmark.pedantic(encode, rounds=3, iterations=1)
+
+@pytest.mark.benchmark(group="history-encode")
+def test_history_validate_and_dump_json(benchmark, full_history, dataset_size):
+    """Response-model validation serialized by Pydantic's own encoder"""
+    benchmark.pedantic(lambda: HISTORY_ADAPTER.dump_json(HISTORY_ADAPTER.validate_python(full_history)), rounds=3, iterations=1)
+
+@pytest.mark.benchmark(group="history-encode")
+def test_history_fast_path(benchmark, full_history, dataset_size):
+    """Trusted rows straight to orjson"""
+    body = benchmark.pedantic(serialization.dumps, args=(full_history,), rounds=3, iterations=1)
+    assert json.loads(body) == json.loads(HISTORY_ADAPTER.dump_json(HISTORY_ADAPTER.validate_python(full_history)))
+
+@pytest.mark.benchmark(group="ndjson-encode")
+def test_ndjson_stdlib(benchmark, export_rows, dataset_size):
+    def encode():
+        return b"".join(
+            (json.dumps(dict(zip(SESSION_EXPORT_FIELDS, row)), default=str) + "\n").encode() for row in export_rows
+        )
+    benchmark.pedantic(encode, rounds=3, iterations=1)
+
+@pytest.mark.benchmark(group="ndjson-encode")
+def test_ndjson_fast_path(benchmark, export_rows, dataset_size):
+    def encode():
+        return b"".join(serialization.dumps_line(dict(zip(SESSION_EXPORT_FIELDS, row))) for row in export_rows)
+    benchmark.pedantic(encode, rounds=3, iterations=1)
+
+@pytest.mark.benchmark(group="history-endpoint")
+def test_api_history_full_page(benchmark, client, dataset_size):
+    response = benchmark.pedantic(client.get, args=("/sessions/history",), kwargs={"params": {"limit": 1000}}, rounds=20, iterations=1)
+    assert len(response.json()) == min(1000, dataset_size)
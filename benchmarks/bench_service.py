@@ -0,0 +1,69 @@
+"""Service-level benchmarks: SessionService and ExportService called directly"""
+import random
+from app.models import Session as SessionModel
+from app.services.export_service import ExportService
+from app.services.search_service import SearchService
+from app.services.session_service import SessionService
+
+def test_history_first_page(benchmark, db, dataset_size):
+    page, _ = benchmark(SessionService.get_session_history_page, db, limit=100)
+    assert len(page) == 100
+
+def test_history_deep_page(benchmark, db, dataset_size):
+    """A page far down the history costs the same as the first one"""
+    cursor = None
+    for _ in range(50):
+        _, cursor = SessionService.get_session_history_page(db, limit=100, cursor=cursor)
+    page, _ = benchmark(SessionService.get_session_history_page, db, limit=100, cursor=cursor)
+    assert len(page) == 100
+
+def test_history_filtered(benchmark, db, dataset_size):
+    benchmark(SessionService.get_session_history_page, db, limit=100, statuses=["abandoned"])
+
+def test_weekly_report(benchmark, db, dataset_size):
+    report = benchmark(SessionService.get_weekly_report, db)
+    assert report["total_sessions"] > 0
+
+def test_range_report_year(benchmark, db, dataset_size):
+    start, end = SessionService.report_window(days=365)
+    report = benchmark(SessionService.get_range_report, db, start, end, "month")
+    assert report["total_sessions"] > 0
+
+def test_export_csv(benchmark, db, dataset_size):
+    def export():
+        return sum(len(chunk) for chunk in ExportService.stream_csv(db))
+    assert benchmark.pedantic(export, rounds=3, iterations=1) > 0
+
+def test_focus_score(benchmark, db, dataset_size):
+    ids = [row.id for row in db.query(SessionModel.id).limit(1000)]
+    rng = random.Random(7)
+    benchmark(lambda: SessionService.calculate_focus_score(db, rng.choice(ids)))
+
+def test_create_session(benchmark, db, dataset_size):
+    from app import schemas
+    data = schemas.SessionCreate(title="Benchmark", scheduled_duration=45)
+    benchmark(SessionService.create_session, db, data)
+
+def test_start_session(benchmark, db, make_session, dataset_size):
+    benchmark.pedantic(
+        SessionService.start_session, setup=lambda: ((db, make_session("scheduled")), {}), rounds=200
+    )
+
+def test_pause_session(benchmark, db, make_session, dataset_size):
+    benchmark.pedantic(
+        SessionService.pause_session, setup=lambda: ((db, make_session("active"), "Benchmark"), {}), rounds=200
+    )
+
+def test_resume_session(benchmark, db, make_session, dataset_size):
+    benchmark.pedantic(
+        SessionService.resume_session, setup=lambda: ((db, make_session("paused")), {}), rounds=200
+    )
+
+def test_complete_session(benchmark, db, make_session, dataset_size):
+    benchmark.pedantic(
+        SessionService.complete_session, setup=lambda: ((db, make_session("active")), {}), rounds=200
+    )
+
+def test_search(benchmark, db, dataset_size):
+    hits, _ = benchmark(SearchService.search_sessions, db, "review phone", limit=20)
+    assert hits
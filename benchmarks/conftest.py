@@ -0,0 +1,112 @@
+import os
+import shutil
+import sys
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Settings
+from app.database import async_database_url, build_engine
+from app.services.session_service import SessionService
+from app import schemas
+from benchmarks import datagen
+
+def _dataset_sizes():
+    """Row counts to benchmark, e.g. BENCH_SIZES=10000,100000,1000000"""
+    return [int(size) for size in os.environ.get("BENCH_SIZES", "10000").split(",") if size.strip()]
+
+def pytest_generate_tests(metafunc):
+    if "dataset_size" in metafunc.fixturenames:
+        metafunc.parametrize("dataset_size", _dataset_sizes(), scope="session", ids=lambda size: f"{size}rows")
+
+@pytest.fixture(scope="session")
+def database_url(dataset_size, tmp_path_factory):
+    """Working copy of a seeded database; seeded files are cached in BENCH_DATA_DIR when set"""
+    cache_dir = os.environ.get("BENCH_DATA_DIR") or str(tmp_path_factory.getbasetemp())
+    os.makedirs(cache_dir, exist_ok=True)
+    seeded = os.path.join(cache_dir, f"bench_v{datagen.GENERATOR_VERSION}_{dataset_size}.db")
+    
+    if not os.path.exists(seeded):
+        building = seeded + ".partial"
+        if os.path.exists(building):
+            os.remove(building)
+        engine = build_engine(f"sqlite:///{building}", Settings(sqlite_journal_mode="DELETE"))
+        try:
+            datagen.seed(engine, dataset_size)
+        finally:
+            engine.dispose()
+        os.replace(building, seeded)
+    
+    working = tmp_path_factory.mktemp(f"bench_{dataset_size}") / "work.db"
+    shutil.copyfile(seeded, working)
+    return f"sqlite:///{working}"
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Datasets of different sizes share ids and versions, so cached values must not carry over"""
+    from app.services.focus_cache import focus_scores
+    from app.services.response_cache import reports
+    focus_scores.clear()
+    reports.clear()
+
+@pytest.fixture(scope="session")
+def engine(database_url):
+    """Engine configured the way the application configures it"""
+    engine = build_engine(database_url, Settings())
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client(engine, database_url):
+    """API client whose requests run against the seeded database"""
+    from fastapi.testclient import TestClient
+    from main import app
+    from app.routers.sessions import get_database, get_async_session_factory
+    
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    def override_get_database():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    app.dependency_overrides[get_database] = override_get_database
+    app.dependency_overrides[get_async_session_factory] = lambda: AsyncSessionLocal
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+
+@pytest.fixture
+def make_session(db):
+    """Factory for fresh sessions in a given lifecycle state"""
+    def make(status="scheduled"):
+        session_id = SessionService.create_session(
+            db, schemas.SessionCreate(title="Benchmark", scheduled_duration=45)
+        ).id
+        if status in ("active", "paused"):
+            SessionService.start_session(db, session_id)
+        if status == "paused":
+            SessionService.pause_session(db, session_id, "Benchmark")
+        return session_id
+    return make
@@ -0,0 +1,122 @@
+"""Synthetic data for benchmarks.
+
+Generates sessions spread over the past year with a realistic mix of
+statuses, schedules, pauses and interruption reasons, inserted with Core
+executemany in large batches so even a million rows seed in reasonable time.
+"""
+from datetime import datetime, timedelta
+import random
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Session as SessionModel, Interruption, TimelineEvent
+from app.services import rollups, timeline
+
+# Bump when the schema or distributions change so cached databases are regenerated
+GENERATOR_VERSION = 7
+
+STATUS_WEIGHTS = {
+    "completed": 55, "abandoned": 10, "interrupted": 8, "overdue": 12,
+    "active": 2, "paused": 1, "scheduled": 12,
+}
+SCHEDULED_DURATIONS = [25, 30, 45, 50, 60, 90, 120]
+INTERRUPTION_REASONS = {
+    "Phone call": 30, "Slack message": 25, "Email": 15, "Meeting": 10, "Coffee break": 8,
+    "Colleague question": 6, "Bathroom": 4, "Lunch": 2,
+}
+# Pauses per started session, weighted toward few interruptions
+PAUSE_WEIGHTS = [40, 28, 16, 9, 5, 2]
+
+BATCH_SIZE = 10000
+
+def _session_rows(count, rng, now):
+    statuses = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=count)
+    for status in statuses:
+        created_at = (now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))).replace(microsecond=0)
+        scheduled = rng.choice(SCHEDULED_DURATIONS)
+        row = {
+            "title": f"Focus block {rng.randint(1, 500)}",
+            "goal": rng.choice([None, "Ship the feature", "Write docs", "Review PRs", "Study"]),
+            "scheduled_duration": scheduled,
+            "status": status,
+            "created_at": created_at,
+            "start_time": None,
+            "end_time": None,
+            "pause_count": 0,
+            "focused_seconds": 0,
+            "paused_seconds": 0,
+            "state_changed_at": None,
+        }
+        if status == "scheduled":
+            yield row, [], []
+            continue
+
+        start = created_at + timedelta(minutes=rng.randint(0, 30))
+        pauses = rng.choices(range(len(PAUSE_WEIGHTS)), weights=PAUSE_WEIGHTS)[0]
+        if status == "interrupted":
+            pauses = max(pauses, 4)
+        elif status == "paused":
+            pauses = max(pauses, 1)
+        row["start_time"] = start
+        row["pause_count"] = pauses
+
+        if status == "overdue":
+            row["end_time"] = start + timedelta(minutes=scheduled * rng.uniform(1.15, 1.8))
+        elif status in ("completed", "abandoned"):
+            row["end_time"] = start + timedelta(minutes=scheduled * rng.uniform(0.6, 1.1))
+
+        reasons = rng.choices(list(INTERRUPTION_REASONS), weights=list(INTERRUPTION_REASONS.values()), k=pauses)
+        interruptions = []
+        for offset, reason in enumerate(reasons):
+            pause_time = start + timedelta(minutes=(offset + 1) * scheduled / (pauses + 1))
+            resumed = status != "abandoned" or offset < pauses - 1
+            interruptions.append({
+                "reason": reason,
+                "pause_time": pause_time,
+                "resume_time": pause_time + timedelta(minutes=rng.randint(1, 15)) if resumed else None,
+            })
+        entries, row["focused_seconds"], row["paused_seconds"], row["state_changed_at"] = timeline.replay(
+            status, row["start_time"], row["end_time"],
+            [(i["reason"], i["pause_time"], i["resume_time"]) for i in interruptions]
+        )
+        yield row, interruptions, entries
+
+def seed(engine, count, seed_value=42, now=None):
+    """Create the schema and insert count sessions with interruptions and rollups"""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed_value)
+    now = now or datetime.utcnow()
+    sessions_table = SessionModel.__table__
+    interruptions_table = Interruption.__table__
+    timeline_table = TimelineEvent.__table__
+
+    generated = _session_rows(count, rng, now)
+    with engine.begin() as conn:
+        while True:
+            batch = [item for _, item in zip(range(BATCH_SIZE), generated)]
+            if not batch:
+                break
+            ids = conn.execute(
+                sessions_table.insert().returning(sessions_table.c.id, sort_by_parameter_order=True),
+                [row for row, _, _ in batch]
+            ).scalars().all()
+            interruption_rows = [
+                dict(interruption, session_id=session_id)
+                for session_id, (_, interruptions, _) in zip(ids, batch)
+                for interruption in interruptions
+            ]
+            if interruption_rows:
+                conn.execute(interruptions_table.insert(), interruption_rows)
+            timeline_rows = [
+                dict(entry, session_id=session_id)
+                for session_id, (_, _, entries) in zip(ids, batch)
+                for entry in entries
+            ]
+            if timeline_rows:
+                conn.execute(timeline_table.insert(), timeline_rows)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        rollups.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
@@ -1,51 +1,99 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef, useCallback } from 'react';
 import SessionForm from './components/SessionForm';
 import SessionCard from './components/SessionCard';
 import SessionHistory from './components/SessionHistory';
 import Reports from './components/Reports';
+import { API_BASE_URL } from './api/client';
 import './App.css';
 
+// Pick the session the card controls. Priority: active > paused > scheduled (most recent)
+const pickCurrentSession = (list) => {
+  const active = list.find(s => s.status === 'active');
+  const paused = list.find(s => s.status === 'paused');
+  const scheduled = list
+    .filter(s => s.status === 'scheduled')
+    .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))[0];
+  return active || paused || scheduled || null;
+};
+
+// The history with one server-pushed change applied; the list passed in is left as it is
+const withDelta = (list, delta) => {
+  const { type, ...changes } = delta;
+  if (type === 'created') {
+    return [{ ...changes, actual_duration: null }, ...list.filter(s => s.id !== delta.id)];
+  }
+  return list.map(s => {
+    if (s.id !== delta.id) return s;
+    const updated = { ...s, ...changes };
+    updated.actual_duration = updated.start_time && updated.end_time
+      ? Math.floor((new Date(updated.end_time) - new Date(updated.start_time)) / 60000)
+      : null;
+    return updated;
+  });
+};
+
 function App() {
   const [sessions, setSessions] = useState([]);
   const [activeSession, setActiveSession] = useState(null);
   const [showHistory, setShowHistory] = useState(false);
   const [showReports, setShowReports] = useState(false);
 
+  const liveRef = useRef(false);
+
   useEffect(() => {
     loadSessions();
   }, []);
 
+  // Latest history, so a change applied right after another builds on it before React re-renders
+  const sessionsRef = useRef([]);
+
+  const showSessions = useCallback((list) => {
+    sessionsRef.current = list;
+    setSessions(list);
+    setActiveSession(pickCurrentSession(list));
+  }, []);
+
+  // Apply one server-pushed change to the loaded history
+  const applyDelta = useCallback((delta) => {
+    showSessions(withDelta(sessionsRef.current, delta));
+  }, [showSessions]);
+
+  // Live updates: the server pushes committed changes, so history is only refetched on resync
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return undefined;
+    const source = new EventSource(`${API_BASE_URL}/sessions/events`);
+    const onDelta = (message) => applyDelta(JSON.parse(message.data));
+    source.onopen = () => { liveRef.current = true; };
+    source.onerror = () => { liveRef.current = false; };
+    source.addEventListener('created', onDelta);
+    source.addEventListener('updated', onDelta);
+    source.addEventListener('imported', () => loadSessions());
+    source.addEventListener('resync', () => loadSessions());
+    return () => {
+      liveRef.current = false;
+      source.close();
+    };
+  }, [applyDelta]);
+
   const loadSessions = async () => {
     try {
       const client = (await import('./api/client')).default;
       const response = await client.get('/sessions/history');
       console.log('Loaded sessions:', response.data);
-      setSessions(response.data);
-      
-      // Find the most recent session that can be controlled (scheduled, active, or paused)
-      // Priority: active > paused > scheduled (most recent)
-      //sample
-      const active = response.data.find(s => s.status === 'active');
-      const paused = response.data.find(s => s.status === 'paused');
-      const scheduled = response.data
-        .filter(s => s.status === 'scheduled')
-        .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))[0];
-      
-      const currentSession = active || paused || scheduled || null;
-      console.log('Current session found:', currentSession);
-      setActiveSession(currentSession);
+      showSessions(response.data);
     } catch (error) {
       console.error('Failed to load sessions:', error);
       alert(`Failed to load sessions: ${error.message}. Make sure the backend is running on http://localhost:8000`);
     }
   };
 
+  // While the event stream is connected the change arrives as a delta; otherwise refetch
   const handleSessionCreated = (newSession) => {
-    loadSessions();
+    if (!liveRef.current) loadSessions();
   };
 
   const handleSessionUpdated = () => {
-    loadSessions();
+    if (!liveRef.current) loadSessions();
   };
 
   return (
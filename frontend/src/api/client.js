@@ -1,6 +1,6 @@
 import axios from "axios";
 
-const API_BASE_URL =
+export const API_BASE_URL =
   process.env.REACT_APP_API_URL || "https://worktracker-backend.onrender.com";
 
 console.log("🔥 Using API Base URL:", API_BASE_URL);
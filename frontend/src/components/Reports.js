@@ -23,9 +23,8 @@ function Reports() {
 
   const handleExportCSV = async () => {
     try {
-      const response = await client.get('/sessions/export/csv');
-      const blob = new Blob([response.data.csv_data], { type: 'text/csv' });
-      const url = window.URL.createObjectURL(blob);
+      const response = await client.get('/sessions/export/csv', { responseType: 'blob' });
+      const url = window.URL.createObjectURL(response.data);
       const a = document.createElement('a');
       a.href = url;
       a.download = `sessions_${new Date().toISOString().split('T')[0]}.csv`;
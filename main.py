@@ -1,14 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routers import sessions
+from fastapi.responses import PlainTextResponse
+from app import metrics
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.logging_config import configure_logging
+from app.routers import jobs, sessions, users
+from app.services import group_commit, retention, sweeper
+from app.services.jobs import manager as job_manager
 
+configure_logging()
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the session sweeper and archiver for as long as the app serves requests; stop the writers and job workers after"""
+    tasks = []
+    if settings.session_sweep_interval > 0:
+        tasks.append(asyncio.create_task(sweeper.run(
+            SessionLocal, settings.session_sweep_interval, settings.session_sweep_batch_size
+        )))
+    if settings.archive_after_days > 0:
+        tasks.append(asyncio.create_task(retention.run(
+            SessionLocal, settings.archive_interval, timedelta(days=settings.archive_after_days),
+            settings.archive_batch_size
+        )))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await group_commit.shutdown()
+    job_manager.shutdown()
+
 app = FastAPI(
     title="Deep Work Session Tracker API",
     description="Track your focused work sessions with interruption monitoring",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ============================
@@ -25,11 +57,23 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Per-route latency and query counts; outermost so it also times CORS handling
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Routers
 app.include_router(sessions.router)
+app.include_router(users.router)
+app.include_router(jobs.router)
 
 @app.get("/")
 async def root():
     return {"message": "Deep Work Session Tracker API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from fastapi.testclient import TestClient
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+# Tests drive sweeps themselves; the app's background sweeper would touch the default database
+os.environ.setdefault("SESSION_SWEEP_INTERVAL", "0")
+# Job results go to a scratch directory rather than the working tree
+os.environ.setdefault("JOB_CACHE_DIR", tempfile.mkdtemp(prefix="job_results_"))
+
+from app.models import Base
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Every test database reuses the same ids and versions, so cached values must not leak between tests"""
+    from app.services.focus_cache import focus_scores
+    from app.services.response_cache import reports
+    focus_scores.clear()
+    reports.clear()
+    yield
+    focus_scores.clear()
+    reports.clear()
+
+@pytest.fixture(scope="function")
+def database_url(tmp_path):
+    """URL of a throwaway SQLite file"""
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+@pytest.fixture(scope="function")
+def engine(database_url):
+    """Engine bound to the test database"""
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+@pytest.fixture(scope="function")
+def db(engine):
+    """Create a fresh database for each test"""
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture(scope="function")
+def client(engine, database_url):
+    """API client whose requests run against the test database"""
+    from main import app
+    from app import metrics
+    from app.database import async_database_url
+    from app.routers.sessions import get_database, get_async_session_factory
+    
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # TestClient runs each app in its own event loop, so never pool async connections across tests
+    async_engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    def override_get_database():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    app.dependency_overrides[get_database] = override_get_database
+    app.dependency_overrides[get_async_session_factory] = lambda: AsyncSessionLocal
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,128 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from app.models import Session as SessionModel
+from app.services.analytics_service import AnalyticsService
+from app.services.bulk_service import BulkService
+
+WINDOW = (datetime(2025, 1, 1), datetime(2025, 1, 21))
+
+def _session(status, start, minutes=None, interruptions=()):
+    """Import item started (and created) at start, ending minutes later"""
+    item = {
+        "title": status, "scheduled_duration": 45, "status": status, "created_at": start.isoformat(),
+        "interruptions": [
+            {
+                "reason": reason,
+                "pause_time": (start + timedelta(minutes=paused)).isoformat(),
+                "resume_time": (start + timedelta(minutes=resumed)).isoformat() if resumed is not None else None
+            }
+            for reason, paused, resumed in interruptions
+        ]
+    }
+    if status != "scheduled":
+        item["start_time"] = start.isoformat()
+    if minutes is not None:
+        item["end_time"] = (start + timedelta(minutes=minutes)).isoformat()
+    return item
+
+def _seed(db):
+    items = [
+        _session("completed", datetime(2025, 1, 6, 9, 10), 50, [("phone", 10, 15)]),
+        _session("completed", datetime(2025, 1, 7, 9, 30), 30),
+        _session("completed", datetime(2025, 1, 8, 14, 0), 60),
+        _session("abandoned", datetime(2025, 1, 10, 14, 5), 40, [("email", 20, None)]),
+        _session("completed", datetime(2025, 1, 20, 9, 45), 35, [("email", 5, 10), ("phone", 20, 25)]),
+        _session("scheduled", datetime(2025, 1, 20, 12, 0)),
+        _session("completed", datetime(2024, 12, 31, 9, 0), 30, [("chat", 5, 10)]),
+    ]
+    BulkService.import_sessions(db, [(index, BulkService.parse_import_item(item)) for index, item in enumerate(items)])
+
+def test_focus_score_distribution(db):
+    _seed(db)
+    report = AnalyticsService.get_focus_score_distribution(db, *WINDOW)
+    
+    scores = [
+        s.focus_score for s in db.query(SessionModel)
+        if s.end_time and WINDOW[0] <= s.created_at < WINDOW[1]
+    ]
+    expected = Counter(min(int(score // 10), 9) for score in scores)
+    assert report["count"] == 5
+    assert report["mean"] == round(sum(scores) / len(scores), 2)
+    assert [b["count"] for b in report["bins"]] == [expected.get(index, 0) for index in range(10)]
+    assert (report["bins"][0]["lower"], report["bins"][-1]["upper"]) == (0, 100)
+
+def test_percentiles_interpolate_linearly(db):
+    _seed(db)
+    report = AnalyticsService.get_percentiles(db, *WINDOW)
+    
+    # Focused minutes of the ended sessions: 20, 25, 30, 45, 60
+    assert report["count"] == 5
+    assert report["percentiles"] == [50, 75, 90, 95, 99]
+    assert report["focused_minutes"] == [30.0, 45.0, 54.0, 57.0, 59.4]
+    assert report["pause_count"][:2] == [1.0, 1.0]
+    
+    empty = AnalyticsService.get_percentiles(db, datetime(2020, 1, 1), datetime(2020, 2, 1))
+    assert empty["count"] == 0 and empty["focus_score"] == [None] * 5
+
+def test_hourly_heatmap(db):
+    _seed(db)
+    report = AnalyticsService.get_hourly_heatmap(db, *WINDOW)
+    
+    cells = {
+        (day, hour): (count, report["focused_minutes"][day][hour])
+        for day, row in enumerate(report["sessions"])
+        for hour, count in enumerate(row)
+        if count
+    }
+    # Monday 9:00 holds two sessions; the abandoned Friday session focused for its first 20 minutes
+    assert cells == {(0, 9): (2, 45 + 25), (1, 9): (1, 30), (2, 14): (1, 60), (4, 14): (1, 20)}
+
+def test_streaks(db):
+    _seed(db)
+    report = AnalyticsService.get_streaks(db, *WINDOW)
+    assert (report["active_days"], report["longest"], report["current"]) == (4, 3, 1)
+    assert (report["longest_start"], report["longest_end"]) == (date(2025, 1, 6), date(2025, 1, 8))
+    
+    later = AnalyticsService.get_streaks(db, WINDOW[0], datetime(2025, 2, 1))
+    assert later["current"] == 0
+    
+    empty = AnalyticsService.get_streaks(db, datetime(2020, 1, 1), datetime(2020, 2, 1))
+    assert (empty["active_days"], empty["longest"], empty["longest_start"]) == (0, 0, None)
+
+def test_interruption_trends(db):
+    _seed(db)
+    weekly = AnalyticsService.get_interruption_trends(db, *WINDOW, bucket="week")
+    assert weekly["total"] == 4
+    assert weekly["reasons"] == [{"reason": "email", "count": 2}, {"reason": "phone", "count": 2}]
+    assert [(b["bucket_start"], b["counts"]) for b in weekly["buckets"]] == [
+        (date(2025, 1, 6), {"phone": 1, "email": 1}),
+        (date(2025, 1, 20), {"email": 1, "phone": 1}),
+    ]
+    
+    monthly = AnalyticsService.get_interruption_trends(db, datetime(2024, 12, 1), WINDOW[1], top=1)
+    assert monthly["reasons"] == [{"reason": "email", "count": 2}]
+    assert [(b["bucket_start"], b["total"], b["counts"]) for b in monthly["buckets"]] == [
+        (date(2024, 12, 1), 1, {}),
+        (date(2025, 1, 1), 4, {"email": 2}),
+    ]
+
+def test_analytics_endpoints(client, db):
+    _seed(db)
+    window = {"start": WINDOW[0].isoformat(), "end": WINDOW[1].isoformat()}
+    
+    assert client.get("/sessions/analytics/focus-scores", params=window).json()["count"] == 5
+    assert client.get("/sessions/analytics/percentiles", params=window).json()["focused_minutes"][0] == 30.0
+    assert client.get("/sessions/analytics/heatmap", params=window).json()["sessions"][0][9] == 2
+    assert client.get("/sessions/analytics/streaks", params=window).json()["longest"] == 3
+    trends = client.get("/sessions/analytics/interruptions", params={**window, "bucket": "week", "top": 1}).json()
+    assert trends["reasons"] == [{"reason": "email", "count": 2}]
+    
+    # Without a window the analytics cover the last year
+    body = client.get("/sessions/analytics/streaks").json()
+    assert datetime.fromisoformat(body["end"]) - datetime.fromisoformat(body["start"]) == timedelta(days=365)
+    assert client.get("/sessions/analytics/heatmap", params={"days": 7, "start": window["start"]}).status_code == 400
+    
+    other = client.post("/users", json={"name": "other", "workspace_id": 1}).json()["id"]
+    response = client.get("/sessions/analytics/focus-scores", params=window, headers={"X-User-Id": str(other)})
+    assert response.json()["count"] == 0
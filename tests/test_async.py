@@ -0,0 +1,45 @@
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import async_database_url
+from app.services.async_session_service import AsyncSessionService
+from app import schemas
+
+def test_async_database_url():
+    """Sync URLs map onto their asyncio drivers"""
+    assert async_database_url("sqlite:///./deep_work.db") == "sqlite+aiosqlite:///./deep_work.db"
+    assert async_database_url("postgresql://u:p@db/work") == "postgresql+asyncpg://u:p@db/work"
+
+def test_async_lifecycle(engine, database_url):
+    """The async service drives a session through its lifecycle"""
+    async def scenario():
+        async_engine = create_async_engine(async_database_url(database_url))
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+        try:
+            async with AsyncSessionLocal() as db:
+                created = await AsyncSessionService.create_session(
+                    db, schemas.SessionCreate(title="Async", scheduled_duration=30)
+                )
+                await AsyncSessionService.start_session(db, created.id)
+                paused = await AsyncSessionService.pause_session(db, created.id, "phone")
+                await AsyncSessionService.resume_session(db, created.id)
+                completed = await AsyncSessionService.complete_session(db, created.id)
+                history, _ = await AsyncSessionService.get_session_history_page(db, limit=10)
+                return paused, completed, history
+        finally:
+            await async_engine.dispose()
+    
+    paused, completed, history = asyncio.run(scenario())
+    assert paused.pause_count == 1
+    assert completed.status == "completed"
+    assert [h["id"] for h in history] == [completed.id]
+
+def test_api_lifecycle(client):
+    """Lifecycle routes work end to end over the async session"""
+    created = client.post("/sessions/", json={"title": "API", "scheduled_duration": 25}).json()
+    assert client.patch(f"/sessions/{created['id']}/start").json()["status"] == "active"
+    paused = client.patch(f"/sessions/{created['id']}/pause", json={"reason": "door"}).json()
+    assert paused["pause_count"] == 1
+    assert client.patch(f"/sessions/{created['id']}/complete").json()["status"] == "abandoned"
+    assert client.patch(f"/sessions/{created['id']}/start").status_code == 400
+    assert client.get(f"/sessions/{created['id']}/focus-score").json()["focus_score"] == 48.0
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+import json
+
+from app.models import Session as SessionModel, Interruption, DailyRollup
+from app.services.bulk_service import BulkService
+from app.services.session_service import SessionService
+from app import schemas
+
+def _item(i):
+    start = datetime(2024, 6, 1, 9, 0) + timedelta(days=i % 30, minutes=i)
+    return {
+        "title": f"Imported {i}",
+        "scheduled_duration": 45,
+        "status": "completed",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=40)).isoformat(),
+        "created_at": start.isoformat(),
+        "interruptions": [{"reason": "phone", "pause_time": (start + timedelta(minutes=10)).isoformat()}] * (i % 3),
+    }
+
+def test_bulk_import_json_array(client, db):
+    """Valid items are inserted with their interruptions; invalid ones are reported"""
+    items = [_item(i) for i in range(30)]
+    items[4]["scheduled_duration"] = 0
+    items[7]["end_time"] = "2020-01-01T00:00:00"
+    
+    response = client.post("/sessions/bulk", json=items)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["inserted"] == 28
+    assert [e["index"] for e in body["errors"]] == [4, 7]
+    
+    assert db.query(SessionModel).count() == 28
+    assert db.query(Interruption).count() == sum(i % 3 for i in range(30) if i not in (4, 7))
+    imported = db.query(SessionModel).filter(SessionModel.title == "Imported 5").one()
+    assert imported.pause_count == 2
+    assert imported.created_at == datetime(2024, 6, 6, 9, 5)
+
+def test_bulk_import_ndjson_updates_rollups(client, db):
+    """NDJSON streams are imported in chunks and rollups stay consistent"""
+    lines = "\n".join(json.dumps(_item(i)) for i in range(2500)) + "\nnot json\n"
+    response = client.post(
+        "/sessions/bulk", content=lines.encode(), headers={"Content-Type": "application/x-ndjson"}
+    )
+    body = response.json()
+    assert body["inserted"] == 2500
+    assert [e["index"] for e in body["errors"]] == [2500]
+    
+    incremental = sorted((r.day, r.status, r.session_count, r.pause_count) for r in db.query(DailyRollup))
+    SessionService.rebuild_rollups(db)
+    assert sorted((r.day, r.status, r.session_count, r.pause_count) for r in db.query(DailyRollup)) == incremental
+
+def test_batch_transition(client, db):
+    """Each session in the batch succeeds or reports its own error"""
+    ids = [SessionService.create_session(db, schemas.SessionCreate(title=f"B{i}", scheduled_duration=30)).id
+           for i in range(5)]
+    SessionService.start_session(db, ids[0])
+    
+    response = client.post("/sessions/bulk/transition", json={"action": "start", "session_ids": ids + [999]})
+    body = response.json()
+    assert body["updated"] == ids[1:]
+    assert [(e["session_id"], e["error"]) for e in body["errors"]] == [
+        (ids[0], "Cannot start session with status: active"),
+        (999, "Session not found"),
+    ]
+    
+    response = client.post("/sessions/bulk/transition", json={"action": "pause", "session_ids": ids})
+    assert response.status_code == 422
+
+def test_transition_sessions_chunks(db):
+    """Transitions are committed per chunk"""
+    ids = [SessionService.create_session(db, schemas.SessionCreate(title=f"C{i}", scheduled_duration=30)).id
+           for i in range(7)]
+    result = BulkService.transition_sessions(db, "start", ids, chunk_size=3)
+    assert result == {"updated": ids, "errors": []}
+    assert db.query(SessionModel).filter(SessionModel.status == "active").count() == 7
@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.bulk_service import BulkService
+from app.services.response_cache import ResponseCache
+from app.services.session_service import SessionService
+from app import schemas
+
+@contextmanager
+def _statements():
+    """Capture SQL run on any engine"""
+    captured = []
+    
+    def record(conn, cursor, statement, *args):
+        captured.append(statement)
+    
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+def _create(client, title="Test"):
+    return client.post("/sessions/", json={"title": title, "scheduled_duration": 30}).json()["id"]
+
+def test_history_revalidates_without_reading_sessions(client):
+    _create(client)
+    first = client.get("/sessions/history")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    
+    with _statements() as statements:
+        response = client.get("/sessions/history", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not [sql for sql in statements if "sessions" in sql]
+    
+    # Dates cannot tell apart writes within one second: only the ETag validates
+    assert "Last-Modified" not in first.headers
+    response = client.get("/sessions/history", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
+
+def test_writes_change_the_etag(client):
+    session_id = _create(client)
+    etag = client.get("/sessions/history").headers["ETag"]
+    
+    client.patch(f"/sessions/{session_id}/start")
+    response = client.get("/sessions/history", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["status"] == "active"
+
+def test_weekly_report_body_is_cached_per_version(client):
+    session_id = _create(client)
+    first = client.get("/sessions/report/weekly")
+    assert first.json()["total_sessions"] == 1
+    
+    with _statements() as statements:
+        second = client.get("/sessions/report/weekly")
+        revalidated = client.get("/sessions/report/weekly", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.content == first.content
+    assert revalidated.status_code == 304
+    assert all("data_version" in sql for sql in statements)
+    
+    client.patch(f"/sessions/{session_id}/start")
+    client.patch(f"/sessions/{session_id}/complete")
+    third = client.get("/sessions/report/weekly", headers={"If-None-Match": first.headers["ETag"]})
+    assert third.status_code == 200
+    assert third.json()["focus_breakdown"] == {"completed": 1}
+
+def test_range_report_and_export_support_conditional_get(client):
+    _create(client)
+    report = client.get("/sessions/report", params={"days": 7})
+    assert report.json()["total_sessions"] == 1
+    assert client.get(
+        "/sessions/report", params={"days": 7}, headers={"If-None-Match": report.headers["ETag"]}
+    ).status_code == 304
+    
+    export = client.get("/sessions/export/csv")
+    assert export.status_code == 200
+    assert client.get("/sessions/export/csv", headers={"If-None-Match": export.headers["ETag"]}).status_code == 304
+
+def test_version_bumps_once_per_write_transaction(db):
+    start = SessionService.get_data_version(db)
+    ids = [
+        SessionService.create_session(db, schemas.SessionCreate(title=f"S{i}", scheduled_duration=30)).id
+        for i in range(3)
+    ]
+    assert SessionService.get_data_version(db) == start + 3
+    
+    BulkService.transition_sessions(db, "start", ids)
+    assert SessionService.get_data_version(db) == start + 4
+    
+    # Rejected transitions write nothing
+    BulkService.transition_sessions(db, "resume", ids)
+    assert SessionService.get_data_version(db) == start + 4
+
+def test_versions_are_per_owner(client, db):
+    """A user's writes move their own ETags and their team's, never another workspace's"""
+    workspace = client.post("/workspaces", json={"name": "Other"}).json()["id"]
+    other = client.post("/users", json={"workspace_id": workspace, "name": "other"}).json()["id"]
+    mine = client.get("/sessions/history").headers["ETag"]
+    team = client.get("/sessions/report/team", params={"days": 7}).headers["ETag"]
+    
+    client.post("/sessions/", json={"title": "Theirs", "scheduled_duration": 30}, headers={"X-User-Id": str(other)})
+    assert client.get("/sessions/history", headers={"If-None-Match": mine}).status_code == 304
+    assert client.get("/sessions/report/team", params={"days": 7}, headers={"If-None-Match": team}).status_code == 304
+    
+    # A new member of the default workspace changes its team report
+    client.post("/users", json={"workspace_id": 1, "name": "teammate"})
+    assert client.get("/sessions/report/team", params={"days": 7}, headers={"If-None-Match": team}).status_code == 200
+    assert client.get("/sessions/history", headers={"If-None-Match": mine}).status_code == 304
+    
+    _create(client)
+    assert client.get("/sessions/history", headers={"If-None-Match": mine}).status_code == 200
+    assert SessionService.get_data_version(db, other) == 2
+
+def test_response_cache_bounds():
+    cache = ResponseCache(max_entries=2, max_bytes=10, ttl=60)
+    cache.put("a", 1, b"1234")
+    cache.put("b", 1, b"5678")
+    cache.put("c", 1, b"90")
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 1).body == b"5678"
+    
+    # Larger bodies push out older ones until the byte bound holds
+    cache.put("d", 1, b"123456789")
+    assert len(cache) == 1
+    
+    # A new data version misses even though the key is cached
+    assert cache.get("d", 2) is None
+    assert cache.put("e", 1, b"x" * 11).etag
+    assert cache.get("e", 1) is None
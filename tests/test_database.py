@@ -0,0 +1,45 @@
+import asyncio
+from sqlalchemy import text
+
+from app.config import Settings
+from app.database import build_async_engine, build_engine, engine_options
+
+def test_sqlite_pragmas_applied(tmp_path):
+    """File-backed SQLite connections come up tuned for concurrency"""
+    config = Settings(sqlite_busy_timeout_ms=1234, db_pool_size=3)
+    engine = build_engine(f"sqlite:///{tmp_path / 'tuned.db'}", config)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert engine.pool.size() == 3
+    finally:
+        engine.dispose()
+
+def test_async_sqlite_pragmas_applied(tmp_path):
+    """The asyncio engine gets the same connection tuning"""
+    async def journal_mode():
+        engine = build_async_engine(f"sqlite:///{tmp_path / 'tuned.db'}", Settings())
+        try:
+            async with engine.connect() as conn:
+                return (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        finally:
+            await engine.dispose()
+    
+    assert asyncio.run(journal_mode()) == "wal"
+
+def test_engine_options():
+    """Pool sizing and statement timeouts follow the settings"""
+    config = Settings(db_pool_size=20, db_max_overflow=5, db_statement_timeout_ms=1500)
+    
+    options = engine_options("postgresql://u:p@db/work", config)
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["connect_args"] == {"options": "-c statement_timeout=1500"}
+    
+    options = engine_options("postgresql+asyncpg://u:p@db/work", config)
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+    
+    # In-memory SQLite keeps its single-connection pool
+    assert "pool_size" not in engine_options("sqlite://", config)
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+import csv
+import gzip
+import io
+import json
+import pytest
+
+from app.models import Session as SessionModel
+from app.services import export_service
+from app.services.export_service import ExportService, SESSION_EXPORT_FIELDS
+
+def _seed(db, count):
+    base = datetime(2025, 5, 1, 8, 0, 0)
+    for i in range(count):
+        start = base + timedelta(hours=i)
+        db.add(SessionModel(
+            title=f"Session, {i}", goal="Write \"docs\"", scheduled_duration=30,
+            status="completed" if i % 2 else "abandoned", pause_count=i % 3,
+            start_time=start, end_time=start + timedelta(minutes=25, seconds=50), created_at=start
+        ))
+    db.commit()
+
+def test_stream_csv_chunks(db, monkeypatch):
+    """Large exports are yielded in several chunks that parse back to every row"""
+    monkeypatch.setattr(export_service, "EXPORT_CHUNK_SIZE", 512)
+    _seed(db, 50)
+    
+    chunks = list(ExportService.stream_csv(db))
+    assert len(chunks) > 1
+    
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert len(rows) == 50
+    assert rows[0]["title"] == "Session, 49"
+    assert rows[0]["actual_duration"] == "25"
+    assert list(rows[0]) == SESSION_EXPORT_FIELDS
+
+def test_export_csv_endpoint(client, db):
+    """The endpoint streams text/csv and honours filters and gzip"""
+    _seed(db, 10)
+    
+    response = client.get("/sessions/export/csv", params={"status": "completed"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(response.text.strip().splitlines()) == 1 + 5
+    
+    response = client.get("/sessions/export/csv", params={"gzip": True, "end": "2025-05-01T10:00:00"})
+    assert response.headers["content-type"] == "application/gzip"
+    assert len(gzip.decompress(response.content).decode().strip().splitlines()) == 1 + 2
+
+def test_export_ndjson_keeps_types(client, db):
+    """NDJSON rows carry ISO timestamps and integer columns"""
+    _seed(db, 3)
+    response = client.get("/sessions/export", params={"format": "ndjson"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+    assert rows[0]["actual_duration"] == 25
+    assert datetime.fromisoformat(rows[0]["start_time"]) == datetime(2025, 5, 1, 10, 0, 0)
+
+def test_export_columnar_formats(client, db, monkeypatch):
+    """Arrow and Parquet exports round-trip with native types, one batch at a time"""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    monkeypatch.setattr(export_service, "COLUMNAR_BATCH_SIZE", 4)
+    _seed(db, 10)
+    
+    response = client.get("/sessions/export", params={"format": "arrow"})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 10
+    assert table.schema.field("created_at").type == pa.timestamp("us")
+    
+    response = client.get("/sessions/export", params={"format": "parquet"})
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("actual_duration").to_pylist()[0] == 25
+
+def test_export_interruptions_dataset(client, db):
+    """Interruptions are exported as their own dataset"""
+    from app.models import Interruption
+    _seed(db, 2)
+    db.add(Interruption(session_id=1, reason="phone", pause_time=datetime(2025, 5, 1, 8, 10)))
+    db.commit()
+    
+    response = client.get("/sessions/export", params={"dataset": "interruptions"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["reason"] for r in rows] == ["phone"]
+    
+    assert client.get("/sessions/export", params={"format": "parquet", "gzip": True}).status_code == 400
@@ -0,0 +1,81 @@
+from sqlalchemy import event
+
+from app.models import Session as SessionModel
+from app.services.bulk_service import BulkService
+from app.services.focus_cache import FocusScoreCache, focus_scores
+from app.services.session_service import SessionService
+from app import schemas
+
+def _expected(session):
+    return SessionService.compute_focus_score(session.status, session.pause_count, session.scheduled_duration)
+
+def test_stored_score_follows_transitions(db):
+    """The stored column matches the formula after every transition"""
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Deep work", scheduled_duration=7))
+    assert session.focus_score == _expected(session)
+    
+    session = SessionService.start_session(db, session.id)
+    for reason in ["phone", "email", "chat"]:
+        session = SessionService.pause_session(db, session.id, reason)
+        assert session.focus_score == _expected(session)
+        session = SessionService.resume_session(db, session.id)
+    session = SessionService.complete_session(db, session.id)
+    
+    assert session.status == "completed"
+    assert session.focus_score == _expected(session) == 57.14
+
+def test_imported_and_raw_rows_get_scores(db):
+    """Rows inserted without the service still get a stored score"""
+    BulkService.import_sessions(db, [(0, schemas.SessionImport(
+        title="Imported", scheduled_duration=50, status="interrupted", pause_count=4
+    ))])
+    db.add(SessionModel(title="Raw", scheduled_duration=20, status="completed", pause_count=1))
+    db.commit()
+    
+    for session in db.query(SessionModel):
+        assert session.focus_score == _expected(session)
+
+def test_cached_read_runs_no_query(db, engine):
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Cached", scheduled_duration=30))
+    session_id = session.id
+    assert SessionService.calculate_focus_score(db, session_id) == 50.0
+    
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert SessionService.calculate_focus_score(db, session_id) == 50.0
+    assert statements == []
+
+def test_transitions_invalidate_cached_score(db):
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Fresh", scheduled_duration=10))
+    session_id = session.id
+    SessionService.start_session(db, session_id)
+    assert SessionService.calculate_focus_score(db, session_id) == 50.0
+    
+    SessionService.pause_session(db, session_id, "phone")
+    assert SessionService.calculate_focus_score(db, session_id) == 45.0
+    SessionService.resume_session(db, session_id)
+    SessionService.complete_session(db, session_id)
+    assert SessionService.calculate_focus_score(db, session_id) == 90.0
+
+def test_cache_is_bounded_and_skips_stale_puts():
+    cache = FocusScoreCache(maxsize=2, ttl=60)
+    for session_id in (1, 2, 3):
+        cache.put(session_id, float(session_id), cache.generation())
+    assert len(cache) == 2
+    assert cache.get(1) is None
+    assert cache.get(3) == 3.0
+    
+    # A read that began before an invalidation must not cache what it read
+    generation = cache.generation()
+    cache.invalidate(4)
+    cache.put(4, 40.0, generation)
+    assert cache.get(4) is None
+
+def test_focus_score_endpoint(client):
+    session_id = client.post("/sessions/", json={"title": "API", "scheduled_duration": 20}).json()["id"]
+    client.patch(f"/sessions/{session_id}/start")
+    client.patch(f"/sessions/{session_id}/pause", json={"reason": "door"})
+    
+    response = client.get(f"/sessions/{session_id}/focus-score")
+    assert response.json() == {"session_id": session_id, "focus_score": 47.5}
+    assert focus_scores.get(session_id) == 47.5
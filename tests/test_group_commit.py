@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import async_database_url
+from app.models import Interruption
+from app.services import group_commit
+from app.services.async_session_service import AsyncSessionService
+from app.services.session_service import SessionService
+from app import schemas
+
+@pytest.fixture
+def batching(monkeypatch):
+    monkeypatch.setattr(settings, "write_batch_window_ms", 50.0)
+
+def _started(db, count):
+    ids = [
+        SessionService.create_session(db, schemas.SessionCreate(title=f"s{i}", scheduled_duration=30)).id
+        for i in range(count)
+    ]
+    for session_id in ids:
+        SessionService.start_session(db, session_id)
+    return ids
+
+def _run_concurrently(database_url, calls):
+    """Submit calls in order from one event loop and gather their outcomes"""
+    async def scenario():
+        async_engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+        try:
+            async with AsyncSessionLocal() as db:
+                return await asyncio.gather(*(call(db) for call in calls), return_exceptions=True)
+        finally:
+            await group_commit.shutdown()
+            await async_engine.dispose()
+    
+    return asyncio.run(scenario())
+
+def test_transitions_share_one_commit(db, database_url, batching):
+    ids = _started(db, 4)
+    version = SessionService.get_data_version(db)
+    
+    results = _run_concurrently(database_url, [
+        *(lambda s, i=i: AsyncSessionService.pause_session(s, i, "phone") for i in ids),
+        lambda s: AsyncSessionService.resume_session(s, ids[0]),
+        lambda s: AsyncSessionService.pause_session(s, ids[1], "again"),
+        lambda s: AsyncSessionService.complete_session(s, 999),
+    ])
+    
+    # Each caller sees the session as its own transition left it
+    assert [r.status for r in results[:5]] == ["paused"] * 4 + ["active"]
+    assert results[0].pause_count == 1
+    assert str(results[5]) == "Cannot pause session with status: paused"
+    assert str(results[6]) == "Session not found"
+    
+    db.expire_all()
+    assert SessionService.get_data_version(db) == version + 1
+    assert db.query(Interruption).count() == 4
+    assert SessionService.get_session_detail(db, ids[0]).status == "active"
+
+def test_database_error_fails_the_whole_batch(db, database_url, batching):
+    ids = _started(db, 2)
+    
+    def broken(db, session_id, commit=True, owner_id=None):
+        SessionService.pause_session(db, session_id, "phone", commit=commit)
+        raise RuntimeError("disk full")
+    
+    results = _run_concurrently(database_url, [
+        lambda s: AsyncSessionService.pause_session(s, ids[0], "phone"),
+        lambda s: group_commit.committer_for(s, 0.05, 256).submit(broken, ids[1]),
+    ])
+    assert [str(r) for r in results] == ["disk full", "disk full"]
+    
+    db.expire_all()
+    assert {s["status"] for s in SessionService.get_session_history(db)} == {"active"}
+
+def test_api_transitions_with_batching(client, batching):
+    created = client.post("/sessions/", json={"title": "API", "scheduled_duration": 25}).json()
+    assert client.patch(f"/sessions/{created['id']}/start").json()["status"] == "active"
+    paused = client.patch(f"/sessions/{created['id']}/pause", json={"reason": "phone"})
+    assert (paused.json()["status"], paused.json()["pause_count"]) == ("paused", 1)
+    assert client.patch(f"/sessions/{created['id']}/pause", json={"reason": "phone"}).status_code == 400
+    assert client.patch(f"/sessions/{created['id']}/complete").json()["status"] == "abandoned"
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+import pytest
+
+from app.models import Session as SessionModel
+from app.services.session_service import SessionService
+from app import schemas
+
+def _seed(db, count, created_at=None):
+    """Insert sessions sharing one created_at so keyset ties are exercised"""
+    created_at = created_at or datetime(2025, 1, 1, 9, 0, 0)
+    for i in range(count):
+        db.add(SessionModel(title=f"Session {i}", scheduled_duration=30, created_at=created_at))
+    db.commit()
+
+def test_history_pages_cover_every_row_once(db):
+    """Walking the cursor visits each session exactly once, newest first"""
+    _seed(db, 5, datetime(2025, 1, 1, 9, 0, 0))
+    _seed(db, 4, datetime(2025, 1, 2, 9, 0, 0))
+    
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = SessionService.get_session_history_page(db, limit=2, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+    
+    assert len(seen) == 9
+    assert len({s["id"] for s in seen}) == 9
+    keys = [(s["created_at"], s["id"]) for s in seen]
+    assert keys == sorted(keys, reverse=True)
+
+def test_history_filters(db):
+    """Status and created_at range filters narrow the page"""
+    _seed(db, 2, datetime(2025, 1, 1, 9, 0, 0))
+    _seed(db, 3, datetime(2025, 2, 1, 9, 0, 0))
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Live", scheduled_duration=30))
+    SessionService.start_session(db, session.id)
+    
+    active = SessionService.get_session_history(db, statuses=["active"])
+    assert [s["id"] for s in active] == [session.id]
+    
+    january = SessionService.get_session_history(
+        db, start=datetime(2025, 1, 1), end=datetime(2025, 2, 1)
+    )
+    assert len(january) == 2
+
+def test_history_invalid_cursor(db):
+    """Garbage cursors are rejected"""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        SessionService.get_session_history_page(db, limit=10, cursor="not-a-cursor")
+
+def test_history_endpoint_paginates(client, db):
+    """The endpoint returns a page and exposes the next cursor as a header"""
+    _seed(db, 3)
+    
+    response = client.get("/sessions/history", params={"limit": 2})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+    
+    response = client.get("/sessions/history", params={"limit": 2, "cursor": cursor})
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" not in response.headers
+    
+    assert client.get("/sessions/history", params={"limit": 5000}).status_code == 422
+
+def test_history_endpoint_matches_response_schema(client, db):
+    """The unvalidated fast path emits exactly what the response model would"""
+    start = datetime(2025, 3, 1, 10, 0, 0, 250000)
+    db.add(SessionModel(
+        title="Done", goal="Ship", scheduled_duration=45, status="completed", pause_count=1,
+        start_time=start, end_time=start + timedelta(minutes=45), created_at=datetime(2025, 3, 1, 9, 0, 0)
+    ))
+    db.add(SessionModel(title="Planned", scheduled_duration=30, created_at=datetime(2025, 3, 2, 9, 0, 0)))
+    db.commit()
+    
+    body = client.get("/sessions/history").json()
+    expected = [
+        schemas.SessionHistory.model_validate(entry).model_dump(mode="json")
+        for entry in SessionService.get_session_history(db)
+    ]
+    assert body == expected
+    assert body[1]["actual_duration"] == 45
@@ -0,0 +1,94 @@
+import os
+import time
+from datetime import datetime, timedelta
+from app.services.bulk_service import BulkService
+from app.services.jobs import ResultCache
+
+def _seed(db, count=30):
+    start = datetime(2025, 1, 6, 9, 0)
+    items = [
+        {
+            "title": f"session {index}", "scheduled_duration": 30, "status": "completed",
+            "created_at": (start + timedelta(hours=index)).isoformat(),
+            "start_time": (start + timedelta(hours=index)).isoformat(),
+            "end_time": (start + timedelta(hours=index, minutes=25)).isoformat(),
+            "interruptions": [{
+                "reason": "phone",
+                "pause_time": (start + timedelta(hours=index, minutes=5)).isoformat(),
+                "resume_time": (start + timedelta(hours=index, minutes=8)).isoformat()
+            }]
+        }
+        for index in range(count)
+    ]
+    BulkService.import_sessions(db, [(index, BulkService.parse_import_item(item)) for index, item in enumerate(items)])
+
+def _wait(client, job, timeout=60):
+    """Poll a job until it leaves the queue"""
+    deadline = time.monotonic() + timeout
+    while job["state"] in ("queued", "running"):
+        assert time.monotonic() < deadline, job
+        time.sleep(0.05)
+        job = client.get(f"/jobs/{job['id']}").json()
+    return job
+
+def test_export_job_matches_streamed_export(client, db):
+    _seed(db)
+    response = client.post("/jobs", json={"kind": "export", "format": "csv", "dataset": "interruptions"})
+    assert response.status_code == 202
+    assert response.headers["location"] == f"/jobs/{response.json()['id']}"
+    
+    job = _wait(client, response.json())
+    assert (job["state"], job["cached"]) == ("done", False)
+    result = client.get(job["result_url"])
+    assert result.headers["content-disposition"] == 'attachment; filename="interruptions.csv"'
+    assert result.content == client.get("/sessions/export", params={"dataset": "interruptions"}).content
+    
+    # Unchanged data is answered from the stored result
+    again = client.post("/jobs", json={"kind": "export", "format": "csv", "dataset": "interruptions"}).json()
+    assert (again["state"], again["cached"]) == ("done", True)
+    assert client.get(again["result_url"]).content == result.content
+    
+    # Any write invalidates it
+    client.post("/sessions", json={"title": "new", "scheduled_duration": 25})
+    fresh = client.post("/jobs", json={"kind": "export", "format": "csv", "dataset": "interruptions"}).json()
+    assert fresh["cached"] is False
+
+def test_report_job_matches_report_endpoint(client, db):
+    _seed(db)
+    window = {"start": "2025-01-01T00:00:00", "end": "2025-02-01T00:00:00", "bucket": "week"}
+    job = _wait(client, client.post("/jobs", json={"kind": "report", **window}).json())
+    
+    assert job["state"] == "done"
+    result = client.get(job["result_url"])
+    assert result.headers["content-type"] == "application/json"
+    assert result.json() == client.get("/sessions/report", params=window).json()
+    assert result.json()["total_sessions"] == 30
+
+def test_jobs_are_validated_and_private(client, db):
+    assert client.post("/jobs", json={"kind": "export", "format": "parquet", "gzip": True}).status_code == 400
+    assert client.post("/jobs", json={"kind": "report", "days": 7, "period": "week"}).status_code == 400
+    assert client.post("/jobs", json={"kind": "import"}).status_code == 422
+    assert client.get("/jobs/unknown").status_code == 404
+    
+    job = _wait(client, client.post("/jobs", json={"kind": "report", "days": 7}).json())
+    other = client.post("/users", json={"name": "other", "workspace_id": 1}).json()["id"]
+    headers = {"X-User-Id": str(other)}
+    assert client.get(f"/jobs/{job['id']}", headers=headers).status_code == 404
+    assert client.get(job["result_url"], headers=headers).status_code == 404
+    assert client.get(job["result_url"]).status_code == 200
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2, max_bytes=250)
+    for age, name in enumerate(["a", "b", "c"]):
+        path = cache.path(f"{name}.result")
+        with open(path, "wb") as out:
+            out.write(b"x" * 100)
+        os.utime(path, (1000 + age, 1000 + age))
+    
+    assert cache.get("a.result") is not None  # touching "a" makes "b" the oldest
+    assert cache.prune() == 1
+    assert sorted(os.listdir(tmp_path)) == ["a.result", "c.result"]
+    
+    cache.max_bytes = 150
+    assert cache.prune() == 1
+    assert cache.get("c.result") is None and cache.get("a.result") is not None
@@ -0,0 +1,67 @@
+import json
+import logging
+from app import metrics
+from app.logging_config import JsonFormatter
+
+def _queries(route, method="GET"):
+    return metrics.REQUEST_QUERIES.count(method=method, route=route), metrics.REQUEST_QUERIES.sum(method=method, route=route)
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and end with +Inf, followed by _sum and _count"""
+    histogram = metrics.Histogram("test_seconds", "Test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, route="/x")
+    
+    assert histogram.samples() == [
+        'test_seconds_bucket{route="/x",le="0.1"} 1',
+        'test_seconds_bucket{route="/x",le="1"} 2',
+        'test_seconds_bucket{route="/x",le="+Inf"} 3',
+        'test_seconds_sum{route="/x"} 5.55',
+        'test_seconds_count{route="/x"} 3',
+    ]
+
+def test_metrics_endpoint_reports_route_templates(client):
+    """Requests are labelled by route template, not by the concrete path"""
+    session_id = client.post("/sessions/", json={"title": "Test", "scheduled_duration": 30}).json()["id"]
+    client.get(f"/sessions/{session_id}/focus-score")
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_requests_total{method="GET",route="/sessions/{session_id}/focus-score",status="200"}' in body
+    assert f"/sessions/{session_id}/focus-score" not in body
+    assert 'db_queries_total{engine="async"}' in body
+    assert 'db_pool_checkout_seconds_count{engine="async"}' in body
+
+def test_weekly_report_query_count_is_constant(client):
+    """The weekly report issues the same number of statements however many sessions exist"""
+    def report_queries():
+        before_count, before_sum = _queries("/sessions/report/weekly")
+        assert client.get("/sessions/report/weekly").status_code == 200
+        after_count, after_sum = _queries("/sessions/report/weekly")
+        assert after_count == before_count + 1
+        return after_sum - before_sum
+    
+    client.post("/sessions/", json={"title": "Test", "scheduled_duration": 30})
+    few = report_queries()
+    
+    for _ in range(10):
+        session_id = client.post("/sessions/", json={"title": "Test", "scheduled_duration": 30}).json()["id"]
+        client.patch(f"/sessions/{session_id}/start")
+        client.patch(f"/sessions/{session_id}/pause", json={"reason": "Phone"})
+    
+    assert few > 0
+    assert report_queries() == few
+
+def test_json_log_lines_carry_extra_fields():
+    record = logging.LogRecord("app.sessions", logging.INFO, __file__, 1, "session_paused", (), None)
+    record.session_id = 7
+    record.pause_count = 2
+    
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["event"] == "session_paused"
+    assert entry["level"] == "INFO"
+    assert entry["session_id"] == 7
+    assert entry["pause_count"] == 2
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+def _alembic(database_url, *args):
+    """Run an alembic command against database_url; env.py reads the URL from the environment"""
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=ROOT, env=dict(os.environ, DATABASE_URL=database_url),
+        capture_output=True, text=True, check=True
+    )
+
+def test_focus_score_downgrade_keeps_status_check(database_url):
+    """Rebuilding sessions to drop focus_score keeps the status CHECK constraint"""
+    _alembic(database_url, "upgrade", "2d7c4e9b1f60")
+    downgrade = _alembic(database_url, "downgrade", "8b3e5f0a1c27")
+    assert "CHECK constraint" not in downgrade.stderr
+    
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO sessions (title, scheduled_duration, status) VALUES ('Ok', 30, 'active')"))
+        with pytest.raises(IntegrityError), engine.begin() as connection:
+            connection.execute(text("INSERT INTO sessions (title, scheduled_duration, status) VALUES ('Bad', 30, 'bogus')"))
+    finally:
+        engine.dispose()
+
+def test_session_owner_foreign_key_on_sqlite(database_url):
+    """SQLite gets the sessions.owner_id foreign key the model declares, and loses it again on downgrade"""
+    _alembic(database_url, "upgrade", "5b2d8f4a7e31")
+    engine = create_engine(database_url)
+    try:
+        foreign_keys = inspect(engine).get_foreign_keys("sessions")
+        assert [(fk["constrained_columns"], fk["referred_table"]) for fk in foreign_keys] == [(["owner_id"], "users")]
+        
+        _alembic(database_url, "downgrade", "3e8a6d1f9b42")
+        inspector = inspect(engine)
+        assert inspector.get_foreign_keys("sessions") == []
+        assert "owner_id" not in [column["name"] for column in inspector.get_columns("sessions")]
+        assert inspector.get_check_constraints("sessions")
+    finally:
+        engine.dispose()
+
+def test_ids_taken_from_the_archive_move_past_it(database_url):
+    """Live interruption and timeline rows that reused an archived id are renumbered, and ids only go up after"""
+    _alembic(database_url, "upgrade", "b4d1e8f3a6c2")
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            for statement in (
+                "INSERT INTO sessions (id, owner_id, title, scheduled_duration, status) VALUES (2, 1, 'Live', 30, 'paused')",
+                "INSERT INTO sessions_archive (id, owner_id, title, scheduled_duration, status, focused_seconds, paused_seconds) "
+                "VALUES (1, 1, 'Old', 30, 'completed', 0, 0)",
+                "INSERT INTO interruptions_archive (id, session_id, owner_id, reason) VALUES (1, 1, 1, 'old'), (2, 1, 1, 'old')",
+                "INSERT INTO interruptions (id, session_id, reason) VALUES (1, 2, 'first'), (3, 2, 'second')",
+            ):
+                connection.execute(text(statement))
+        
+        _alembic(database_url, "upgrade", "head")
+        with engine.begin() as connection:
+            connection.execute(text("DELETE FROM interruptions WHERE reason = 'second'"))
+            connection.execute(text("INSERT INTO interruptions (session_id, reason) VALUES (2, 'third')"))
+            rows = connection.execute(text("SELECT id, reason FROM interruptions ORDER BY id")).all()
+            reasons = connection.execute(text("SELECT reasons FROM session_search WHERE rowid = 2")).scalar()
+        assert [reason for _, reason in rows] == ["first", "third"]
+        assert rows[0][0] > 2 and rows[1][0] > 3
+        assert reasons.split() == ["first", "third"]
+    finally:
+        engine.dispose()
+
+def test_models_match_migrations(database_url):
+    """Autogenerate finds nothing to change against a fully migrated database"""
+    _alembic(database_url, "upgrade", "head")
+    check = _alembic(database_url, "check")
+    assert "No new upgrade operations detected" in check.stdout + check.stderr
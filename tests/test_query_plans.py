@@ -0,0 +1,171 @@
+"""The hot read and write paths must use index searches, not table scans"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import random
+import shutil
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Session as SessionModel, Interruption, User, Workspace
+from app.services.session_service import SessionService
+
+@pytest.fixture(scope="module")
+def template(tmp_path_factory):
+    """Two months of sessions from twenty users in two workspaces, analyzed like a migrated database"""
+    path = tmp_path_factory.mktemp("plans") / "template.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        paused_id = _seed(db)
+    finally:
+        db.close()
+        engine.dispose()
+    return path, paused_id
+
+@pytest.fixture
+def database_url(template, tmp_path):
+    """Each test gets its own copy of the seeded database"""
+    shutil.copy(template[0], tmp_path / "test.db")
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+@pytest.fixture
+def seeded(template, db):
+    """Id of the seeded user's live, paused session"""
+    return template[1]
+
+def _seed(db) -> int:
+    rng = random.Random(3)
+    now = datetime.utcnow()
+    db.execute(Workspace.__table__.insert(), [{"id": 2, "name": "Other"}])
+    db.execute(User.__table__.insert(), [
+        {"id": user_id, "workspace_id": 1 if user_id <= 5 else 2, "name": f"U{user_id}"} for user_id in range(2, 21)
+    ])
+    
+    sessions = []
+    for i in range(6000):
+        created_at = now - timedelta(days=60 * i / 6000)
+        status = rng.choice(["completed", "completed", "abandoned", "interrupted", "overdue"])
+        sessions.append({
+            "owner_id": rng.randint(1, 20), "title": f"S{i}", "scheduled_duration": 30, "status": status,
+            "pause_count": 1, "start_time": created_at, "end_time": created_at + timedelta(minutes=30),
+            "created_at": created_at
+        })
+    db.execute(SessionModel.__table__.insert(), sessions)
+    ids = db.execute(text("SELECT id FROM sessions")).scalars().all()
+    db.execute(Interruption.__table__.insert(), [
+        {"session_id": session_id, "reason": rng.choice(["phone", "email", "chat"]),
+         "pause_time": now, "resume_time": now}
+        for session_id in ids
+    ])
+    SessionService.rebuild_rollups(db)
+    
+    # One live, paused session for the write paths
+    paused = SessionModel(title="Live", scheduled_duration=30, status="active", pause_count=0, start_time=now)
+    db.add(paused)
+    db.commit()
+    SessionService.pause_session(db, paused.id, "phone")
+    
+    db.execute(text("ANALYZE"))
+    db.commit()
+    return paused.id
+
+# Tables that grow with usage; small lookup tables like users may be scanned
+SCANNED_TABLES = tuple(f"SCAN {table}" for table in (
+    "sessions", "interruptions", "daily_rollups", "daily_interruption_rollups"
+))
+
+@contextmanager
+def _captured(engine):
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def _plans(engine, statements):
+    with engine.connect() as conn:
+        return [
+            (statement, [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)])
+            for statement, parameters in statements
+        ]
+
+def _assert_no_scans(engine, statements):
+    assert statements
+    for statement, plan in _plans(engine, statements):
+        scans = [step for step in plan if step.startswith(SCANNED_TABLES)]
+        assert not scans, f"{statement}\n{plan}"
+
+def test_weekly_report_uses_indexes(seeded, db, engine):
+    with _captured(engine) as statements:
+        SessionService.get_weekly_report(db)
+    _assert_no_scans(engine, statements)
+
+def test_history_pages_use_indexes(seeded, db, engine):
+    _, cursor = SessionService.get_session_history_page(db, limit=50)
+    with _captured(engine) as statements:
+        SessionService.get_session_history_page(db, limit=50, cursor=cursor)
+        SessionService.get_session_history_page(db, limit=50, statuses=["abandoned"])
+    
+    for statement, plan in _plans(engine, statements):
+        if "sessions_archive" in statement:
+            # The archive horizon probe is one lookup in the archive's owner index
+            assert any("COVERING INDEX ix_sessions_archive" in step for step in plan), plan
+            continue
+        # Keyset pages walk an index in order: no table scan and no sort
+        assert any("USING INDEX ix_sessions" in step for step in plan), plan
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+def test_range_report_edges_use_indexes(seeded, db, engine):
+    now = datetime.utcnow()
+    with _captured(engine) as statements:
+        SessionService.get_range_report(db, now - timedelta(days=10, hours=6), now)
+    _assert_no_scans(engine, statements)
+
+def test_team_report_searches_member_rollups(seeded, db, engine):
+    now = datetime.utcnow()
+    with _captured(engine) as statements:
+        SessionService.get_team_report(db, now - timedelta(days=30, hours=6), now)
+    _assert_no_scans(engine, statements)
+
+def test_resume_finds_open_interruption_by_index(seeded, db, engine):
+    with _captured(engine) as statements:
+        SessionService.resume_session(db, seeded)
+    _assert_no_scans(engine, statements)
+    
+    closing = [plan for statement, plan in _plans(engine, statements) if statement.startswith("UPDATE interruptions")]
+    assert closing and any("ix_interruptions" in step for step in closing[0])
+    assert not any("TEMP B-TREE" in step for step in closing[0])
+
+def test_interruption_relationship_loads_use_index(seeded, db, engine):
+    with _captured(engine) as statements:
+        SessionService.get_session_detail(db, seeded)
+        db.get(SessionModel, 1).interruptions
+    _assert_no_scans(engine, statements)
+
+def test_sweep_searches_due_index(seeded, db, engine):
+    with _captured(engine) as statements:
+        SessionService.expire_sessions(db, now=datetime.utcnow() + timedelta(days=1))
+    _assert_no_scans(engine, statements)
+    
+    sweeps = [plan for statement, plan in _plans(engine, statements) if statement.startswith("UPDATE sessions")]
+    assert sweeps and all(any("ix_sessions_status_due_at" in step for step in plan) for plan in sweeps)
+
+def test_search_reads_the_full_text_index(seeded, db, engine):
+    from app.services.search_service import SearchService
+    
+    with _captured(engine) as statements:
+        SearchService.search_sessions(db, "phone", limit=20)
+    _assert_no_scans(engine, statements)
+    
+    # Matches come from the FTS5 index and are joined to sessions by primary key
+    (plan,) = [plan for _, plan in _plans(engine, statements)]
+    assert any("session_search VIRTUAL TABLE" in step for step in plan), plan
+    assert any("SEARCH sessions USING INTEGER PRIMARY KEY" in step for step in plan), plan
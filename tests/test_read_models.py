@@ -0,0 +1,47 @@
+from sqlalchemy import event
+
+from app.services.read_models import SessionRow
+from app.services.session_service import SessionService
+from app import schemas
+
+def _paused_twice(db):
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Detail", scheduled_duration=40))
+    SessionService.start_session(db, session.id)
+    for reason in ("phone", "email"):
+        SessionService.pause_session(db, session.id, reason)
+        SessionService.resume_session(db, session.id)
+    return session.id
+
+def test_history_rows_are_plain_slots_objects(db):
+    _paused_twice(db)
+    rows, _ = SessionService.get_session_history_rows(db, limit=10)
+    
+    assert type(rows[0]) is SessionRow
+    assert not hasattr(rows[0], "__dict__")
+    assert rows[0].pause_count == 2
+    assert len(db.identity_map) == 0
+
+def test_session_detail_loads_interruptions_eagerly(db, engine):
+    session_id = _paused_twice(db)
+    db.expire_all()
+    
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = SessionService.get_session_detail(db, session_id)
+    reasons = [interruption.reason for interruption in session.interruptions]
+    
+    assert sorted(reasons) == ["email", "phone"]
+    assert len(statements) == 2
+
+def test_session_detail_endpoint(client):
+    session_id = client.post("/sessions/", json={"title": "API", "scheduled_duration": 20}).json()["id"]
+    client.patch(f"/sessions/{session_id}/start")
+    client.patch(f"/sessions/{session_id}/pause", json={"reason": "door"})
+    
+    body = client.get(f"/sessions/{session_id}").json()
+    assert body["status"] == "paused"
+    assert body["focus_score"] == 47.5
+    assert [i["reason"] for i in body["interruptions"]] == ["door"]
+    assert body["interruptions"][0]["resume_time"] is None
+    
+    assert client.get("/sessions/999").status_code == 404
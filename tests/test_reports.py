@@ -0,0 +1,90 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from app.models import Session as SessionModel, Interruption
+from app.services.session_service import SessionService
+
+def _seed_week(db):
+    """Sessions in every terminal status with interruptions, plus one outside the window"""
+    now = datetime.utcnow()
+    specs = [
+        ("completed", 0, 25, 60, ["phone"]),
+        ("completed", 2, 30, 45, ["phone", "email"]),
+        ("abandoned", 1, 50, 20, ["meeting"]),
+        ("interrupted", 4, 60, 90, ["email", "email", "phone", "chat"]),
+        ("active", 0, 30, None, []),
+        ("overdue", 1, 7, 15, ["phone"]),
+    ]
+    for status, pauses, scheduled, minutes, reasons in specs:
+        start = now - timedelta(hours=2)
+        session = SessionModel(
+            title=status, scheduled_duration=scheduled, status=status, pause_count=pauses,
+            start_time=start, end_time=start + timedelta(minutes=minutes, seconds=40) if minutes else None,
+            created_at=now - timedelta(days=1)
+        )
+        session.interruptions = [Interruption(reason=r, pause_time=start) for r in reasons]
+        db.add(session)
+    db.add(SessionModel(title="old", scheduled_duration=30, status="completed", pause_count=0,
+                        created_at=now - timedelta(days=30)))
+    db.commit()
+
+def _reference_report(db):
+    """Row-by-row computation the aggregate query must reproduce"""
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    sessions = db.query(SessionModel).filter(SessionModel.created_at >= week_ago).all()
+    focus_time = sum(
+        int((s.end_time - s.start_time).total_seconds() / 60) for s in sessions if s.start_time and s.end_time
+    )
+    scores = [SessionService.calculate_focus_score(db, s.id) for s in sessions]
+    reasons = Counter(i.reason for s in sessions for i in s.interruptions)
+    return {
+        "total_sessions": len(sessions),
+        "total_focus_time": focus_time,
+        "average_focus_score": round(sum(scores) / len(scores), 2),
+        "top_interruption_reason": reasons.most_common(1)[0][0],
+        "focus_breakdown": dict(Counter(s.status for s in sessions)),
+    }
+
+def test_weekly_report_matches_row_by_row(db):
+    """Set-based aggregation gives the same figures as the per-session loop"""
+    _seed_week(db)
+    report = SessionService.get_weekly_report(db)
+    expected = _reference_report(db)
+    
+    for key, value in expected.items():
+        assert report[key] == value, key
+
+def test_reports_break_top_reason_ties_alike(db):
+    """Weekly and range reports pick the same reason when two are equally frequent"""
+    now = datetime.utcnow()
+    for reasons in (["meeting", "phone"], ["chat", "phone", "meeting"]):
+        session = SessionModel(
+            title="Tied", scheduled_duration=30, status="completed", pause_count=len(reasons),
+            start_time=now - timedelta(hours=2), end_time=now - timedelta(hours=1), created_at=now - timedelta(days=1)
+        )
+        session.interruptions = [Interruption(reason=r, pause_time=now - timedelta(hours=2)) for r in reasons]
+        db.add(session)
+    db.commit()
+    SessionService.rebuild_rollups(db)
+    
+    weekly = SessionService.get_weekly_report(db)
+    ranged = SessionService.get_range_report(db, now - timedelta(days=7), now + timedelta(minutes=1))
+    assert weekly["top_interruption_reason"] == ranged["top_interruption_reason"] == "meeting"
+
+def test_weekly_report_constant_queries(db, engine):
+    """Report cost does not grow with the number of sessions"""
+    _seed_week(db)
+    _seed_week(db)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    
+    SessionService.get_weekly_report(db)
+    # The archive horizon lookup, then the status and reason passes over the live tier
+    assert len(statements) == 3
+
+def test_weekly_report_empty(db):
+    """No sessions yields an empty report"""
+    report = SessionService.get_weekly_report(db)
+    assert report["total_sessions"] == 0
+    assert report["top_interruption_reason"] is None
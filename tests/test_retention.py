@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, update
+
+from app.models import Session as SessionModel, Interruption, ArchivedSession, ArchivedInterruption, TimelineEvent
+from app.services import focus_cache, retention
+from app.services.analytics_service import AnalyticsService
+from app.services.export_service import ExportService
+from app.services.session_service import SessionService
+from app import schemas
+from tests.test_rollups import _rollup_state, _seed_history
+
+CUTOFF = datetime(2025, 3, 21)
+# Seeded interruptions are paused at insert time, so the analytics window runs up to the present
+ANALYTICS_END = datetime.utcnow() + timedelta(days=1)
+
+def _export(db, dataset="sessions", start=None):
+    request = schemas.ExportRequest(format="ndjson", dataset=dataset, start=start)
+    chunks, _, _ = ExportService.open_export(db, request)
+    return b"".join(chunks)
+
+def _all_pages(db, limit, **filters):
+    rows, cursor = SessionService.get_session_history_page(db, limit=limit, **filters)
+    while cursor:
+        page, cursor = SessionService.get_session_history_page(db, limit=limit, cursor=cursor, **filters)
+        rows += page
+    return rows
+
+def _snapshot(db):
+    return {
+        "history": SessionService.get_session_history_page(db)[0],
+        "pages": _all_pages(db, 7),
+        "completed": _all_pages(db, 5, statuses=["completed"], start=datetime(2025, 3, 10)),
+        "sessions": _export(db),
+        "interruptions": _export(db, "interruptions"),
+        "report": SessionService.get_range_report(db, datetime(2025, 3, 2, 6), datetime(2025, 4, 9, 18), bucket="week"),
+        "edges": SessionService.get_range_report(db, datetime(2025, 3, 14, 3), datetime(2025, 3, 14, 21)),
+        "analytics": _analytics(db, datetime(2025, 3, 1), ANALYTICS_END),
+    }
+
+def _analytics(db, start, end):
+    return [
+        AnalyticsService.get_focus_score_distribution(db, start, end),
+        AnalyticsService.get_percentiles(db, start, end),
+        AnalyticsService.get_hourly_heatmap(db, start, end),
+        AnalyticsService.get_streaks(db, start, end),
+        AnalyticsService.get_interruption_trends(db, start, end, bucket="week"),
+    ]
+
+def test_archive_moves_closed_sessions_in_batches(db):
+    """Old closed sessions leave the live tables in batches; every read over them is unchanged"""
+    _seed_history(db)
+    before = _snapshot(db)
+    rollups = _rollup_state(db)
+    eligible = db.query(SessionModel).filter(
+        SessionModel.created_at < CUTOFF, SessionModel.status.in_(retention.ARCHIVABLE_STATUSES)
+    ).count()
+    live_interruptions = db.query(Interruption).count()
+    
+    assert retention.archive_sessions(db, CUTOFF, batch_size=7) == eligible
+    assert db.query(ArchivedSession).count() == eligible
+    assert db.query(SessionModel).filter(SessionModel.created_at < CUTOFF).all() == (
+        db.query(SessionModel).filter(SessionModel.created_at < CUTOFF, SessionModel.status == 'scheduled').all()
+    )
+    assert db.query(Interruption).count() + db.query(ArchivedInterruption).count() == live_interruptions
+    assert db.query(Interruption).count() < live_interruptions
+    
+    assert _snapshot(db) == before
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == rollups
+    
+    # Nothing left to move, and a range after the newest archived session never reads the archive
+    assert retention.archive_sessions(db, CUTOFF, batch_size=7) == 0
+    assert retention.sessions_span_archive(db, 1, datetime(2025, 3, 10))
+    assert not retention.sessions_span_archive(db, 1, CUTOFF)
+    assert not retention.sessions_span_archive(db, 2, None)
+
+def test_weekly_report_reads_the_archive(db):
+    """Sessions archived within the last week still count in the weekly report"""
+    for title, reasons in (("Calls", ["phone", "phone"]), ("Mail", ["email"]), ("Quiet", [])):
+        session_id = SessionService.create_session(db, schemas.SessionCreate(title=title, scheduled_duration=30)).id
+        SessionService.start_session(db, session_id)
+        for reason in reasons:
+            SessionService.pause_session(db, session_id, reason)
+            SessionService.resume_session(db, session_id)
+        SessionService.complete_session(db, session_id)
+    SessionService.create_session(db, schemas.SessionCreate(title="Keeps the highest id", scheduled_duration=30))
+    before = SessionService.get_weekly_report(db)
+    assert (before["total_sessions"], before["top_interruption_reason"]) == (4, "phone")
+    
+    assert retention.archive_sessions(db, datetime.utcnow() + timedelta(minutes=1)) == 3
+    after = SessionService.get_weekly_report(db)
+    assert {**after, "week_start": None} == {**before, "week_start": None}
+
+def test_newest_session_is_never_archived(db):
+    """The highest id stays live so SQLite cannot hand it out again"""
+    _seed_history(db)
+    newest = db.query(func.max(SessionModel.id)).scalar()
+    db.execute(update(SessionModel).values(status="completed"))
+    db.commit()
+    
+    archived = retention.archive_sessions(db, datetime(2030, 1, 1), batch_size=50)
+    assert archived == newest - 1
+    assert [session.id for session in db.query(SessionModel)] == [newest]
+    
+    created = SessionService.create_session(db, schemas.SessionCreate(title="Next", scheduled_duration=30))
+    assert created.id == newest + 1
+
+def test_archived_session_detail_and_timeline(db):
+    """Reads of a single session fall back to the archive"""
+    session_id = SessionService.create_session(db, schemas.SessionCreate(title="Old", scheduled_duration=30)).id
+    SessionService.start_session(db, session_id)
+    SessionService.pause_session(db, session_id, "phone")
+    SessionService.resume_session(db, session_id)
+    SessionService.complete_session(db, session_id)
+    before = SessionService.get_session_timeline(db, session_id)
+    score = SessionService.calculate_focus_score(db, session_id)
+    SessionService.create_session(db, schemas.SessionCreate(title="Keeps the highest id", scheduled_duration=30))
+    focus_cache.focus_scores.clear()
+    
+    assert retention.archive_sessions(db, datetime.utcnow() + timedelta(minutes=1)) == 1
+    assert db.query(SessionModel).filter(SessionModel.id == session_id).count() == 0
+    assert db.query(TimelineEvent).count() == 0
+    
+    detail = schemas.SessionDetail.model_validate(SessionService.get_session_detail(db, session_id))
+    assert (detail.title, detail.status) == ("Old", "completed")
+    assert [i.reason for i in detail.interruptions] == ["phone"]
+    
+    timeline = SessionService.get_session_timeline(db, session_id)
+    assert [event.kind for event in timeline["events"]] == ["start", "pause", "resume", "complete"]
+    assert (timeline["focused_seconds"], timeline["paused_seconds"]) == (before["focused_seconds"], before["paused_seconds"])
+    assert SessionService.calculate_focus_score(db, session_id) == score
+    
+    assert SessionService.get_session_detail(db, session_id, owner_id=2) is None
+    assert SessionService.get_session_timeline(db, session_id + 5) is None
+
+def test_archive_leaves_sessions_that_can_still_change(db):
+    """Scheduled, active and paused sessions stay live however old they are"""
+    ids = []
+    for title in ("Scheduled", "Active", "Paused", "Done", "Last"):
+        ids.append(SessionService.create_session(db, schemas.SessionCreate(title=title, scheduled_duration=30)).id)
+    SessionService.start_session(db, ids[1])
+    SessionService.start_session(db, ids[2])
+    SessionService.pause_session(db, ids[2], "chat")
+    SessionService.start_session(db, ids[3])
+    SessionService.complete_session(db, ids[3])
+    
+    assert retention.archive_sessions(db, datetime.utcnow() + timedelta(minutes=1)) == 1
+    assert [s.id for s in db.query(SessionModel).order_by(SessionModel.id)] == [ids[0], ids[1], ids[2], ids[4]]
+    assert SessionService.resume_session(db, ids[2]).status == "active"
+
+def test_archive_again_after_ids_were_freed(db):
+    """Interruption and timeline ids that left with an archived session are never handed out again"""
+    def paused_and_completed(title):
+        session_id = SessionService.create_session(db, schemas.SessionCreate(title=title, scheduled_duration=30)).id
+        SessionService.start_session(db, session_id)
+        SessionService.pause_session(db, session_id, "phone")
+        SessionService.resume_session(db, session_id)
+        SessionService.complete_session(db, session_id)
+        return session_id
+    
+    first = paused_and_completed("First")
+    SessionService.create_session(db, schemas.SessionCreate(title="Keeps the highest id", scheduled_duration=30))
+    assert retention.archive_sessions(db, datetime.utcnow() + timedelta(minutes=1)) == 1
+    
+    # The archived rows held the highest interruption and timeline ids when they left
+    second = paused_and_completed("Second")
+    SessionService.create_session(db, schemas.SessionCreate(title="Keeps the highest id", scheduled_duration=30))
+    assert retention.archive_sessions(db, datetime.utcnow() + timedelta(minutes=1)) == 1
+    assert db.query(ArchivedInterruption).count() == 2
+    assert [i.reason for i in SessionService.get_session_detail(db, first).interruptions] == ["phone"]
+    assert len(SessionService.get_session_timeline(db, second)["events"]) == 4
@@ -0,0 +1,112 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+import pytest
+
+from app.models import Session as SessionModel, Interruption, DailyRollup, DailyInterruptionRollup
+from app.services.session_service import SessionService
+from app import schemas
+
+def _rollup_state(db):
+    rows = {
+        (r.day, r.status): (
+            r.session_count, r.focus_minutes, r.pause_count, round(r.focus_score_sum, 6), r.focused_seconds, r.paused_seconds
+        )
+        for r in db.query(DailyRollup).all() if r.session_count
+    }
+    reasons = {(r.day, r.reason): r.interruption_count for r in db.query(DailyInterruptionRollup).all()}
+    return rows, reasons
+
+def _seed_history(db):
+    """Sessions spread over 40 days at varied times of day"""
+    base = datetime(2025, 3, 1, 0, 0, 0)
+    statuses = ["completed", "abandoned", "interrupted", "overdue", "scheduled"]
+    for i in range(120):
+        created = base + timedelta(hours=8 * i + (i % 5))
+        start = created + timedelta(minutes=5)
+        session = SessionModel(
+            title=f"S{i}", scheduled_duration=20 + i % 40, status=statuses[i % 5], pause_count=i % 4,
+            start_time=start, end_time=start + timedelta(minutes=i % 70, seconds=30), created_at=created
+        )
+        session.interruptions = [Interruption(reason=["phone", "email", "chat"][(i + k) % 3]) for k in range(i % 4)]
+        db.add(session)
+    db.commit()
+    SessionService.rebuild_rollups(db)
+
+def _reference(db, start, end):
+    sessions = db.query(SessionModel).filter(SessionModel.created_at >= start, SessionModel.created_at < end).all()
+    scores = [SessionService.calculate_focus_score(db, s.id) for s in sessions]
+    return {
+        "total_sessions": len(sessions),
+        "total_focus_time": sum(int((s.end_time - s.start_time).total_seconds() / 60) for s in sessions if s.end_time),
+        "total_pauses": sum(s.pause_count for s in sessions),
+        "average_focus_score": round(sum(scores) / len(scores), 2),
+        "focus_breakdown": dict(Counter(s.status for s in sessions)),
+        "reasons": Counter(i.reason for s in sessions for i in s.interruptions),
+    }
+
+def test_transitions_keep_rollups_in_sync(db):
+    """Incremental maintenance matches a full rebuild"""
+    for i in range(4):
+        session = SessionService.create_session(db, schemas.SessionCreate(title=f"T{i}", scheduled_duration=30))
+        SessionService.start_session(db, session.id)
+        for k in range(i):
+            SessionService.pause_session(db, session.id, f"reason {k}")
+            if k < i - 1:
+                SessionService.resume_session(db, session.id)
+        if i != 3:
+            SessionService.complete_session(db, session.id)
+    
+    incremental = _rollup_state(db)
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == incremental
+    assert sum(count for count, *_ in incremental[0].values()) == 4
+
+@pytest.mark.parametrize("start,end", [
+    (datetime(2025, 3, 2, 13, 30), datetime(2025, 3, 29, 6, 15)),
+    (datetime(2025, 3, 5, 0, 0), datetime(2025, 3, 12, 0, 0)),
+    (datetime(2025, 3, 7, 2, 0), datetime(2025, 3, 7, 22, 0)),
+])
+def test_range_report_matches_raw_rows(db, start, end):
+    """Rollups plus partial-day raw reads reproduce the raw aggregate"""
+    _seed_history(db)
+    report = SessionService.get_range_report(db, start, end)
+    expected = _reference(db, start, end)
+    
+    reasons = expected.pop("reasons")
+    for key, value in expected.items():
+        assert report[key] == value, key
+    assert reasons[report["top_interruption_reason"]] == max(reasons.values())
+    assert sum(b["total_sessions"] for b in report["buckets"]) == expected["total_sessions"]
+
+def test_range_report_buckets(db):
+    """Week and month buckets start on Monday and the 1st"""
+    _seed_history(db)
+    weekly = SessionService.get_range_report(db, datetime(2025, 3, 1), datetime(2025, 4, 10), bucket="week")
+    assert all(b["bucket_start"].weekday() == 0 for b in weekly["buckets"])
+    
+    monthly = SessionService.get_range_report(db, datetime(2025, 3, 1), datetime(2025, 4, 10), bucket="month")
+    assert [b["bucket_start"] for b in monthly["buckets"]] == [date(2025, 3, 1), date(2025, 4, 1)]
+    assert monthly["total_sessions"] == weekly["total_sessions"] == 120
+
+def test_report_window():
+    """Periods resolve to calendar-to-date windows"""
+    now = datetime(2025, 8, 14, 15, 0)
+    assert SessionService.report_window(period="quarter", now=now) == (datetime(2025, 7, 1), now)
+    assert SessionService.report_window(period="week", now=now) == (datetime(2025, 8, 11), now)
+    assert SessionService.report_window(days=30, now=now) == (now - timedelta(days=30), now)
+    with pytest.raises(ValueError):
+        SessionService.report_window(now=now)
+    with pytest.raises(ValueError, match="Unknown period"):
+        SessionService.report_window(period="decade", days=30, now=now)
+
+def test_range_report_endpoint(client, db):
+    """The endpoint serves rolling windows and validates parameters"""
+    _seed_history(db)
+    response = client.get("/sessions/report", params={
+        "start": "2025-03-01T00:00:00Z", "end": "2025-03-15T00:00:00Z", "bucket": "week"
+    })
+    assert response.status_code == 200
+    assert response.json()["total_sessions"] == 42
+    
+    assert client.get("/sessions/report", params={"days": 90}).status_code == 200
+    assert client.get("/sessions/report").status_code == 400
@@ -0,0 +1,104 @@
+from datetime import datetime
+import pytest
+
+from app.models import Session as SessionModel, Interruption
+from app.services.search_service import SearchService, search_terms
+from app.services.session_service import SessionService
+from app import schemas
+
+def _create(db, title, goal=None):
+    return SessionService.create_session(db, schemas.SessionCreate(title=title, goal=goal, scheduled_duration=30))
+
+def _titles(hits):
+    return [hit.title for hit in hits]
+
+def test_search_ranks_titles_above_goals_and_reasons(db):
+    by_reason = _create(db, "Inbox zero")
+    SessionService.start_session(db, by_reason.id)
+    SessionService.pause_session(db, by_reason.id, "Design review")
+    _create(db, "Refactor parser", goal="Prepare the design doc")
+    _create(db, "Design system tokens")
+    _create(db, "Unrelated")
+    
+    hits, cursor = SearchService.search_sessions(db, "design")
+    assert _titles(hits) == ["Design system tokens", "Refactor parser", "Inbox zero"]
+    assert hits[0].score > hits[1].score > hits[2].score
+    assert cursor is None
+
+def test_every_word_must_match_as_a_prefix(db):
+    _create(db, "Write release notes", goal="Changelog for 2.0")
+    _create(db, "Write tests")
+    
+    assert _titles(SearchService.search_sessions(db, "writ rel")[0]) == ["Write release notes"]
+    assert _titles(SearchService.search_sessions(db, "CHANGE")[0]) == ["Write release notes"]
+    assert SearchService.search_sessions(db, "write missing")[0] == []
+
+def test_query_syntax_is_treated_as_words(db):
+    _create(db, "Fix OR-mapping bug")
+    
+    assert search_terms('"fix" NEAR(bug) -or*') == ["fix", "near", "bug", "or"]
+    assert _titles(SearchService.search_sessions(db, 'fix "bug')[0]) == ["Fix OR-mapping bug"]
+    with pytest.raises(ValueError, match="at least one word"):
+        SearchService.search_sessions(db, '"*- ()')
+
+def test_index_follows_every_write_path(db):
+    """Triggers keep the index in step with ORM edits, Core inserts and deletes"""
+    session = _create(db, "Plan sprint")
+    SessionService.start_session(db, session.id)
+    SessionService.pause_session(db, session.id, "Fire drill")
+    assert _titles(SearchService.search_sessions(db, "fire")[0]) == ["Plan sprint"]
+    
+    session.title = "Plan quarter"
+    db.commit()
+    assert SearchService.search_sessions(db, "sprint")[0] == []
+    assert _titles(SearchService.search_sessions(db, "quarter drill")[0]) == ["Plan quarter"]
+    
+    db.execute(Interruption.__table__.insert(), [{"session_id": session.id, "reason": "Standup"}])
+    db.query(Interruption).filter(Interruption.reason == "Fire drill").delete()
+    db.commit()
+    assert SearchService.search_sessions(db, "fire")[0] == []
+    assert _titles(SearchService.search_sessions(db, "standup")[0]) == ["Plan quarter"]
+    
+    db.delete(session)
+    db.commit()
+    assert SearchService.search_sessions(db, "plan")[0] == []
+
+def test_search_pages_cover_every_hit_once(db):
+    db.add_all(SessionModel(
+        title="Reading" if i % 3 else "Reading group reading", scheduled_duration=30,
+        created_at=datetime(2025, 1, 1, 9, 0, 0)
+    ) for i in range(7))
+    db.commit()
+    
+    seen, cursor = [], None
+    while True:
+        hits, cursor = SearchService.search_sessions(db, "reading", limit=2, cursor=cursor)
+        seen.extend(hits)
+        if cursor is None:
+            break
+    
+    assert len(seen) == 7
+    assert len({hit.id for hit in seen}) == 7
+    keys = [(hit.score, hit.id) for hit in seen]
+    assert keys == sorted(keys, reverse=True)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        SearchService.search_sessions(db, "reading", cursor="not-a-cursor")
+
+def test_search_endpoint(client):
+    for title in ("Team retro", "Retro notes", "Budget"):
+        client.post("/sessions/", json={"title": title, "scheduled_duration": 30})
+    
+    response = client.get("/sessions/search", params={"q": "retro", "limit": 1})
+    assert response.status_code == 200
+    first = response.json()
+    assert len(first) == 1 and "score" in first[0]
+    
+    rest = client.get("/sessions/search", params={"q": "retro", "cursor": response.headers["X-Next-Cursor"]})
+    assert {hit["title"] for hit in first + rest.json()} == {"Team retro", "Retro notes"}
+    assert "X-Next-Cursor" not in rest.headers
+    
+    assert client.get("/sessions/search", params={"q": "!!"}).status_code == 400
+    
+    # Other users never see these sessions
+    other = client.post("/users", json={"name": "other", "workspace_id": 1}).json()["id"]
+    assert client.get("/sessions/search", params={"q": "retro"}, headers={"X-User-Id": str(other)}).json() == []
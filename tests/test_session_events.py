@@ -0,0 +1,140 @@
+import asyncio
+import json
+import threading
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import async_database_url
+from app.models import User
+from app.routers.sessions import _sse_stream, get_async_session_factory
+from app.services.session_events import SessionEventHub, hub
+from app.services.session_service import SessionService
+from app import schemas
+
+def test_hub_delivers_from_other_threads():
+    async def scenario():
+        events = SessionEventHub(history_size=10, queue_size=10)
+        subscription = events.subscribe()
+        publisher = threading.Thread(target=events.publish, args=([{"type": "updated", "id": 1}],))
+        publisher.start()
+        publisher.join()
+        return await subscription.get(timeout=1)
+    
+    assert asyncio.run(scenario()) == (1, {"type": "updated", "id": 1})
+
+def test_slow_subscriber_gets_one_resync():
+    async def scenario():
+        events = SessionEventHub(history_size=10, queue_size=2)
+        subscription = events.subscribe()
+        events.publish([{"type": "updated", "id": i} for i in range(5)])
+        await asyncio.sleep(0)
+        received = []
+        while (item := await subscription.get(timeout=0.05)) is not None:
+            received.append(item)
+        return received
+    
+    # The backlog collapses into a resync carrying the latest id, never more than queue_size items
+    assert asyncio.run(scenario()) == [(5, {"type": "resync"})]
+
+def test_reconnect_replays_missed_events():
+    async def scenario():
+        events = SessionEventHub(history_size=3, queue_size=10)
+        events.publish([{"type": "updated", "id": i} for i in range(5)])
+        recent = events.subscribe(last_event_id=3)
+        stale = events.subscribe(last_event_id=1)
+        return (
+            [await recent.get(timeout=0.05), await recent.get(timeout=0.05)],
+            await stale.get(timeout=0.05)
+        )
+    
+    replayed, stale = asyncio.run(scenario())
+    assert replayed == [(4, {"type": "updated", "id": 3}), (5, {"type": "updated", "id": 4})]
+    assert stale[1] == {"type": "resync"}
+
+def test_transitions_publish_after_commit(db):
+    async def scenario():
+        subscription = hub.subscribe()
+        try:
+            session = SessionService.create_session(db, schemas.SessionCreate(title="Live", scheduled_duration=25))
+            created = await subscription.get(timeout=1)
+            
+            # Rolled-back changes are never announced
+            SessionService.start_session(db, session.id, commit=False)
+            db.rollback()
+            assert await subscription.get(timeout=0.05) is None
+            
+            SessionService.start_session(db, session.id)
+            SessionService.pause_session(db, session.id, "phone")
+            return created, await subscription.get(timeout=1), await subscription.get(timeout=1)
+        finally:
+            hub.unsubscribe(subscription)
+    
+    (_, created), (_, started), (_, paused) = asyncio.run(scenario())
+    assert created["type"] == "created"
+    assert created["title"] == "Live"
+    assert started["type"] == "updated"
+    assert started["status"] == "active"
+    assert started["start_time"] is not None
+    assert paused["status"] == "paused"
+    assert paused["pause_count"] == 1
+    assert set(paused) == {"type", "id", "owner_id", "status", "pause_count", "start_time", "end_time", "focus_score"}
+
+def test_sse_frames():
+    async def scenario():
+        subscription = hub.subscribe()
+        stream = _sse_stream(subscription)
+        try:
+            first = await stream.__anext__()
+            hub.publish([{"type": "updated", "id": 9, "status": "active"}])
+            return first, await stream.__anext__()
+        finally:
+            await stream.aclose()
+    
+    first, frame = asyncio.run(scenario())
+    assert first == b"retry: 3000\n\n"
+    lines = frame.decode().split("\n")
+    assert lines[0].startswith("id: ")
+    assert lines[1] == "event: updated"
+    assert json.loads(lines[2].removeprefix("data: ")) == {"type": "updated", "id": 9, "status": "active"}
+    assert hub.subscriber_count == 0
+
+def test_event_stream_holds_no_connection(db, database_url):
+    """A subscriber's stream stays open without keeping a pooled connection checked out"""
+    from main import app
+    
+    viewer = User(workspace_id=1, name="viewer")
+    db.add(viewer)
+    db.commit()
+    
+    async def scenario():
+        # A pooled engine, unlike the client fixture's, so checkouts can be counted
+        async_engine = create_async_engine(async_database_url(database_url))
+        app.dependency_overrides[get_async_session_factory] = lambda: async_sessionmaker(async_engine)
+        requested, disconnected, sent = [], asyncio.Event(), asyncio.Queue()
+        
+        async def receive():
+            if not requested:
+                requested.append(True)
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": "/sessions/events", "raw_path": b"/sessions/events", "root_path": "", "query_string": b"",
+            "headers": [(b"x-user-id", str(viewer.id).encode())], "client": ("test", 1), "server": ("test", 80),
+        }
+        stream = asyncio.create_task(app(scope, receive, sent.put))
+        try:
+            start, first = await sent.get(), await sent.get()
+            return start["status"], first["body"], async_engine.sync_engine.pool.checkedout()
+        finally:
+            disconnected.set()
+            await stream
+            app.dependency_overrides.clear()
+            await async_engine.dispose()
+    
+    status, first, checked_out = asyncio.run(scenario())
+    assert (status, first) == (200, b"retry: 3000\n\n")
+    assert checked_out == 0
+    assert hub.subscriber_count == 0
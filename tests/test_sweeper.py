@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models import Session as SessionModel
+from app.services import sweeper
+from app.services.session_events import hub
+from app.services.session_service import SessionService
+from app import schemas
+from tests.test_rollups import _rollup_state
+
+def _started(db, scheduled_duration=30):
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Work", scheduled_duration=scheduled_duration))
+    return SessionService.start_session(db, session.id)
+
+def test_transitions_maintain_due_at(db):
+    session = _started(db)
+    deadline = session.start_time + timedelta(minutes=33)
+    assert abs(session.due_at - deadline) < timedelta(milliseconds=1)
+    
+    paused = SessionService.pause_session(db, session.id, "phone")
+    assert abs(paused.due_at - min(deadline, datetime.utcnow() + timedelta(minutes=settings.session_pause_timeout))) < timedelta(seconds=1)
+    
+    resumed = SessionService.resume_session(db, session.id)
+    assert abs(resumed.due_at - deadline) < timedelta(milliseconds=1)
+    
+    assert SessionService.complete_session(db, session.id).due_at is None
+    
+    for _ in range(4):
+        interrupted = _started(db)
+    for _ in range(3):
+        SessionService.pause_session(db, interrupted.id, "chat")
+        SessionService.resume_session(db, interrupted.id)
+    assert SessionService.pause_session(db, interrupted.id, "chat").status == 'interrupted'
+    assert db.get(SessionModel, interrupted.id).due_at is None
+
+def test_expire_applies_completion_rules(db):
+    overrun = _started(db)
+    idle = _started(db, scheduled_duration=240)
+    SessionService.pause_session(db, idle.id, "meeting")
+    fresh = _started(db, scheduled_duration=240)
+    scheduled = SessionService.create_session(db, schemas.SessionCreate(title="Later", scheduled_duration=30))
+    
+    now = datetime.utcnow() + timedelta(minutes=settings.session_pause_timeout + 5)
+    assert SessionService.expire_sessions(db, now=now) == {"overdue": 1, "abandoned": 1}
+    
+    db.expire_all()
+    assert db.get(SessionModel, overrun.id).status == 'overdue'
+    abandoned = db.get(SessionModel, idle.id)
+    assert (abandoned.status, abandoned.end_time, abandoned.due_at) == ('abandoned', now, None)
+    assert abandoned.focus_score == SessionService.compute_focus_score('abandoned', 1, 240)
+    assert db.get(SessionModel, fresh.id).status == 'active'
+    assert db.get(SessionModel, scheduled.id).status == 'scheduled'
+    
+    # Nothing left to do, and an abandoned session can still be resumed
+    assert SessionService.expire_sessions(db, now=now) == {}
+    assert SessionService.resume_session(db, idle.id).status == 'active'
+
+def test_expire_batches_keep_rollups_and_versions_in_sync(db):
+    for _ in range(7):
+        _started(db)
+    version = SessionService.get_data_version(db)
+    
+    expired = SessionService.expire_sessions(db, now=datetime.utcnow() + timedelta(hours=1), batch_size=3)
+    assert expired == {"overdue": 7}
+    # Three batches of at most three rows, one commit and version each
+    assert SessionService.get_data_version(db) == version + 3
+    
+    incremental = _rollup_state(db)
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == incremental
+
+def test_expire_publishes_deltas(db):
+    session = _started(db)
+    
+    async def scenario():
+        subscription = hub.subscribe()
+        try:
+            SessionService.expire_sessions(db, now=datetime.utcnow() + timedelta(hours=1))
+            return await subscription.get(timeout=1)
+        finally:
+            hub.unsubscribe(subscription)
+    
+    _, delta = asyncio.run(scenario())
+    assert (delta["type"], delta["id"], delta["status"]) == ("updated", session.id, "overdue")
+
+def test_imported_live_sessions_are_due(db):
+    from app.services.bulk_service import BulkService
+    
+    start = datetime(2025, 3, 1, 9, 0)
+    items = [
+        (0, BulkService.parse_import_item({"title": "A", "scheduled_duration": 60, "status": "active", "start_time": start.isoformat()})),
+        (1, BulkService.parse_import_item({
+            "title": "P", "scheduled_duration": 60, "status": "paused", "start_time": start.isoformat(),
+            "interruptions": [{"reason": "phone", "pause_time": (start + timedelta(minutes=5)).isoformat()}]
+        })),
+    ]
+    BulkService.import_sessions(db, items)
+    
+    assert [s.due_at for s in db.query(SessionModel).order_by(SessionModel.id)] == [
+        start + timedelta(minutes=66),
+        start + timedelta(minutes=5 + settings.session_pause_timeout),
+    ]
+    assert SessionService.expire_sessions(db, now=start + timedelta(minutes=40)) == {"abandoned": 1}
+    assert SessionService.expire_sessions(db, now=start + timedelta(hours=2)) == {"overdue": 1}
+
+def test_background_sweeper_runs_until_cancelled(db, engine):
+    session = _started(db)
+    # Due now, but still within its schedule: the sweep completes it normally
+    session.due_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    async def scenario():
+        task = asyncio.create_task(sweeper.run(SessionLocal, interval=0.01, batch_size=10))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            db.expire_all()
+            if db.get(SessionModel, session.id).status != 'active':
+                break
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return task.cancelled()
+    
+    assert asyncio.run(scenario())
+    assert db.get(SessionModel, session.id).status == 'completed'
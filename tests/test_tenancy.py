@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import DEFAULT_USER_ID
+from app.services.session_events import SessionEventHub
+from app.services.session_service import SessionService
+from app.services.user_service import UserService
+from app import schemas
+from tests.test_rollups import _rollup_state
+
+def _user(client, name, workspace_id):
+    return client.post("/users", json={"name": name, "workspace_id": workspace_id}).json()["id"]
+
+def _as(user_id):
+    return {"X-User-Id": str(user_id)}
+
+def _session(client, user_id, title="Work"):
+    response = client.post("/sessions/", json={"title": title, "scheduled_duration": 30}, headers=_as(user_id))
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def test_users_only_see_their_own_sessions(client):
+    team = client.post("/workspaces", json={"name": "Team"}).json()["id"]
+    alice, bob = _user(client, "alice", team), _user(client, "bob", team)
+    mine = _session(client, alice, "Alice's")
+    theirs = _session(client, bob, "Bob's")
+    
+    assert [s["title"] for s in client.get("/sessions/history", headers=_as(alice)).json()] == ["Alice's"]
+    assert client.get("/sessions/history").json() == []
+    assert client.get(f"/sessions/{theirs}", headers=_as(alice)).status_code == 404
+    assert client.get(f"/sessions/{mine}", headers=_as(alice)).status_code == 200
+    
+    rejected = client.patch(f"/sessions/{theirs}/start", headers=_as(alice))
+    assert (rejected.status_code, rejected.json()["detail"]) == (400, "Session not found")
+    batch = client.post("/sessions/bulk/transition", json={"action": "start", "session_ids": [mine, theirs]}, headers=_as(alice))
+    assert batch.json()["updated"] == [mine]
+    
+    export = client.get("/sessions/export", params={"format": "ndjson"}, headers=_as(bob)).text
+    assert "Bob's" in export and "Alice's" not in export
+    assert client.get("/sessions/report/weekly", headers=_as(bob)).json()["total_sessions"] == 1
+
+def test_unknown_user_is_rejected(client):
+    assert client.get("/sessions/history", headers=_as(999)).status_code == 401
+    assert client.get("/users/me").json()["id"] == DEFAULT_USER_ID
+
+def test_only_members_add_users_to_a_workspace(client):
+    team = client.post("/workspaces", json={"name": "Team"}).json()["id"]
+    other = client.post("/workspaces", json={"name": "Other"}).json()["id"]
+    alice, outsider = _user(client, "alice", team), _user(client, "outsider", other)
+    
+    teammate = client.post("/users", json={"name": "bob", "workspace_id": team}, headers=_as(alice))
+    assert (teammate.status_code, teammate.json()["workspace_id"]) == (201, team)
+    joined = client.post("/users", json={"name": "mallory", "workspace_id": team}, headers=_as(outsider))
+    assert joined.status_code == 403
+    assert client.post("/users", json={"name": "x", "workspace_id": 999}, headers=_as(alice)).status_code == 403
+    assert client.post("/workspaces", json={"name": "Mine"}, headers=_as(alice)).status_code == 403
+    
+    members = client.get("/sessions/report/team", params={"days": 7}, headers=_as(alice)).json()["members"]
+    assert [member["name"] for member in members] == ["alice", "bob"]
+
+def test_history_etags_differ_per_user(client):
+    team = client.post("/workspaces", json={"name": "Team"}).json()["id"]
+    alice = _user(client, "alice", team)
+    etag = client.get("/sessions/history").headers["ETag"]
+    
+    response = client.get("/sessions/history", headers={**_as(alice), "If-None-Match": etag})
+    assert response.status_code == 200
+    assert "X-User-Id" in response.headers["Vary"]
+
+def test_team_report_reads_member_rollups(db):
+    team = UserService.create_workspace(db, schemas.WorkspaceCreate(name="Team"))
+    other = UserService.create_workspace(db, schemas.WorkspaceCreate(name="Other"))
+    alice = UserService.create_user(db, schemas.UserCreate(name="alice", workspace_id=team.id)).id
+    bob = UserService.create_user(db, schemas.UserCreate(name="bob", workspace_id=team.id)).id
+    carol = UserService.create_user(db, schemas.UserCreate(name="carol", workspace_id=other.id)).id
+    
+    for owner, count in ((alice, 2), (bob, 1), (carol, 4)):
+        for _ in range(count):
+            session = SessionService.create_session(db, schemas.SessionCreate(title="W", scheduled_duration=30), owner)
+            SessionService.start_session(db, session.id, owner_id=owner)
+            SessionService.pause_session(db, session.id, f"by {owner}", owner_id=owner)
+            SessionService.complete_session(db, session.id, owner_id=owner)
+    
+    incremental = _rollup_state(db)
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == incremental
+    
+    end = datetime.utcnow() + timedelta(days=1)
+    start = end - timedelta(days=3)
+    report = SessionService.get_team_report(db, start, end, owner_id=bob)
+    assert report["workspace_id"] == team.id
+    assert report["total_sessions"] == 3
+    assert [(m["name"], m["total_sessions"], m["total_pauses"]) for m in report["members"]] == [
+        ("alice", 2, 2), ("bob", 1, 1)
+    ]
+    assert report["top_interruption_reason"] == f"by {alice}"
+    
+    assert SessionService.get_range_report(db, start, end, owner_id=carol)["total_sessions"] == 4
+    assert SessionService.get_range_report(db, start, end)["total_sessions"] == 0
+
+def test_focus_score_cache_is_owner_scoped(db):
+    session = SessionService.create_session(db, schemas.SessionCreate(title="W", scheduled_duration=20))
+    assert SessionService.calculate_focus_score(db, session.id) == 50.0
+    assert SessionService.calculate_focus_score(db, session.id, owner_id=DEFAULT_USER_ID + 1) == 0.0
+
+def test_event_subscriptions_are_owner_scoped():
+    async def scenario():
+        events = SessionEventHub(history_size=10, queue_size=10)
+        subscription = events.subscribe(owner_id=2)
+        events.publish([{"type": "updated", "id": 1, "owner_id": 1}, {"type": "updated", "id": 2, "owner_id": 2}])
+        events.publish([{"type": "resync"}])
+        received = []
+        while (item := await subscription.get(timeout=0.05)) is not None:
+            received.append(item)
+        replayed = events.subscribe(last_event_id=0, owner_id=1)
+        return received, await replayed.get(timeout=0.05), await replayed.get(timeout=0.05)
+    
+    received, first, second = asyncio.run(scenario())
+    assert received == [(2, {"type": "updated", "id": 2, "owner_id": 2}), (3, {"type": "resync"})]
+    assert (first[0], second[0]) == (1, 3)
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from sqlalchemy import update
+
+from app.models import Session as SessionModel, TimelineEvent
+from app.services import retention, timeline
+from app.services.bulk_service import BulkService
+from app.services.session_service import SessionService
+from app import schemas
+from tests.test_rollups import _rollup_state
+
+def _create(db, scheduled_duration=30):
+    return SessionService.create_session(db, schemas.SessionCreate(title="Work", scheduled_duration=scheduled_duration))
+
+def _backdate(db, session_id, seconds):
+    """Pretend the session entered its current state seconds ago"""
+    changed_at = db.query(SessionModel.state_changed_at).filter(SessionModel.id == session_id).scalar()
+    db.execute(update(SessionModel).where(SessionModel.id == session_id).values(
+        state_changed_at=changed_at - timedelta(seconds=seconds)
+    ))
+    db.commit()
+
+def _events(db, session_id):
+    return [
+        (e.kind, e.status, e.reason, e.focused_seconds, e.paused_seconds)
+        for e in db.query(TimelineEvent).filter(TimelineEvent.session_id == session_id).order_by(TimelineEvent.id)
+    ]
+
+def test_transitions_keep_running_totals(db):
+    session = _create(db)
+    SessionService.start_session(db, session.id)
+    _backdate(db, session.id, 600)
+    SessionService.pause_session(db, session.id, "phone")
+    _backdate(db, session.id, 120)
+    SessionService.resume_session(db, session.id)
+    _backdate(db, session.id, 300)
+    done = SessionService.complete_session(db, session.id)
+    
+    assert (done.focused_seconds, done.paused_seconds) == (900, 120)
+    assert _events(db, session.id) == [
+        ("start", "active", None, 0, 0),
+        ("pause", "paused", "phone", 600, 0),
+        ("resume", "active", None, 600, 120),
+        ("complete", "completed", None, 900, 120),
+    ]
+
+def test_abandon_and_resume_count_paused_time(db):
+    session = _create(db)
+    SessionService.start_session(db, session.id)
+    _backdate(db, session.id, 60)
+    SessionService.pause_session(db, session.id, "lunch")
+    _backdate(db, session.id, 1800)
+    abandoned = SessionService.complete_session(db, session.id)
+    assert (abandoned.status, abandoned.focused_seconds, abandoned.paused_seconds) == ("abandoned", 60, 1800)
+    
+    _backdate(db, session.id, 600)
+    resumed = SessionService.resume_session(db, session.id)
+    assert (resumed.status, resumed.paused_seconds) == ("active", 2400)
+    
+    # The rollups drop the abandoned totals again, exactly as a rebuild computes them
+    incremental = _rollup_state(db)
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == incremental
+
+def test_timeline_of_session_abandoned_while_paused(db):
+    """An abandoned session keeps accruing paused time until it is resumed, and stops once archived"""
+    session_id = _create(db).id
+    SessionService.start_session(db, session_id)
+    _backdate(db, session_id, 60)
+    SessionService.pause_session(db, session_id, "lunch")
+    _backdate(db, session_id, 300)
+    SessionService.complete_session(db, session_id)
+    _backdate(db, session_id, 600)
+    
+    abandoned = SessionService.get_session_timeline(db, session_id)
+    assert abandoned["status"] == "abandoned"
+    assert abandoned["focused_seconds"] == 60 and 900 <= abandoned["paused_seconds"] < 910
+    assert [event.kind for event in abandoned["events"]] == ["start", "pause", "complete"]
+    
+    # The archive holds the totals as of the abandon, however long ago that was
+    _create(db)
+    assert retention.archive_sessions(db, datetime.utcnow() + timedelta(minutes=1)) == 1
+    archived = SessionService.get_session_timeline(db, session_id, now=datetime.utcnow() + timedelta(days=30))
+    assert (archived["status"], archived["focused_seconds"], archived["paused_seconds"]) == ("abandoned", 60, 300)
+
+def test_reports_sum_focused_time_from_rollups(db):
+    for focused, paused in ((1500, 300), (2700, 0)):
+        session = _create(db)
+        SessionService.start_session(db, session.id)
+        _backdate(db, session.id, focused)
+        SessionService.pause_session(db, session.id, "phone")
+        _backdate(db, session.id, paused)
+        SessionService.resume_session(db, session.id)
+        SessionService.complete_session(db, session.id)
+    live = _create(db)
+    SessionService.start_session(db, live.id)
+    _backdate(db, live.id, 900)
+    
+    now = datetime.utcnow()
+    report = SessionService.get_range_report(db, now - timedelta(days=2), now + timedelta(minutes=1))
+    assert (report["total_focused_time"], report["total_paused_time"]) == (70, 5)
+    weekly = SessionService.get_weekly_report(db)
+    assert (weekly["total_focused_time"], weekly["total_paused_time"]) == (70, 5)
+    
+    incremental = _rollup_state(db)
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == incremental
+
+def test_expired_sessions_are_logged(db):
+    session = _create(db)
+    SessionService.start_session(db, session.id)
+    _backdate(db, session.id, 3600)
+    SessionService.expire_sessions(db, now=datetime.utcnow() + timedelta(hours=1))
+    
+    kind, status, _, focused, _ = _events(db, session.id)[-1]
+    assert (kind, status) == ("expire", "overdue")
+    assert focused == db.get(SessionModel, session.id).focused_seconds >= 3600 + 3600
+
+def test_import_replays_history():
+    start = datetime(2025, 5, 1, 9, 0, 0)
+    events, focused, paused, changed_at = timeline.replay("abandoned", start, start + timedelta(minutes=50), [
+        ("email", start + timedelta(minutes=40), None),
+        ("phone", start + timedelta(minutes=10), start + timedelta(minutes=15)),
+    ])
+    assert [(e["kind"], e["status"], e["focused_seconds"], e["paused_seconds"]) for e in events] == [
+        ("start", "active", 0, 0),
+        ("pause", "paused", 600, 0),
+        ("resume", "active", 600, 300),
+        ("pause", "paused", 2100, 300),
+        ("complete", "abandoned", 2100, 900),
+    ]
+    assert (focused, paused, changed_at) == (2100, 900, start + timedelta(minutes=50))
+
+def test_bulk_import_writes_timeline(db):
+    start = datetime(2025, 5, 1, 9, 0, 0)
+    item = BulkService.parse_import_item({
+        "title": "Imported", "scheduled_duration": 60, "status": "completed",
+        "start_time": start.isoformat(), "end_time": (start + timedelta(minutes=45)).isoformat(),
+        "interruptions": [{
+            "reason": "phone", "pause_time": (start + timedelta(minutes=5)).isoformat(),
+            "resume_time": (start + timedelta(minutes=10)).isoformat()
+        }]
+    })
+    BulkService.import_sessions(db, [(0, item)])
+    
+    session = db.query(SessionModel).one()
+    assert (session.focused_seconds, session.paused_seconds) == (2400, 300)
+    assert [kind for kind, *_ in _events(db, session.id)] == ["start", "pause", "resume", "complete"]
+    
+    incremental = _rollup_state(db)
+    SessionService.rebuild_rollups(db)
+    assert _rollup_state(db) == incremental
+
+def test_timeline_endpoint(client, db):
+    session_id = client.post("/sessions/", json={"title": "Live", "scheduled_duration": 30}).json()["id"]
+    client.patch(f"/sessions/{session_id}/start")
+    _backdate(db, session_id, 120)
+    
+    body = client.get(f"/sessions/{session_id}/timeline").json()
+    assert [event["kind"] for event in body["events"]] == ["start"]
+    # The stored total is only advanced by transitions; the endpoint adds the running segment
+    assert body["status"] == "active" and 120 <= body["focused_seconds"] < 130
+    assert client.get("/sessions/history").json()[0]["focused_seconds"] == 0
+    
+    assert client.get("/sessions/999/timeline").status_code == 404
+    other = client.post("/users", json={"name": "other", "workspace_id": 1}).json()["id"]
+    assert client.get(f"/sessions/{session_id}/timeline", headers={"X-User-Id": str(other)}).status_code == 404
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Session as SessionModel, Interruption
+from app.services.session_service import SessionService
+from app import schemas
+
+def _active_session(db):
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Race", scheduled_duration=60))
+    return SessionService.start_session(db, session.id)
+
+def test_transition_is_single_session_statement(db, engine):
+    """Each transition touches the sessions row with exactly one UPDATE and no SELECT"""
+    session_id = _active_session(db).id
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    
+    SessionService.pause_session(db, session_id, "phone")
+    SessionService.resume_session(db, session_id)
+    SessionService.complete_session(db, session_id)
+    
+    on_sessions = [sql for sql in statements if sql.split()[0] in ("SELECT", "UPDATE") and " sessions" in sql.split("WHERE")[0]]
+    assert len(on_sessions) == 3
+    assert all(sql.startswith("UPDATE sessions") and "RETURNING" in sql for sql in on_sessions)
+
+def test_concurrent_pauses_count_once(engine, db):
+    """Two simultaneous pauses of one session cannot both succeed"""
+    session_id = _active_session(db).id
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    barrier = threading.Barrier(2)
+    
+    def pause(reason):
+        worker_db = SessionLocal()
+        try:
+            barrier.wait()
+            SessionService.pause_session(worker_db, session_id, reason)
+            return "ok"
+        except ValueError as e:
+            return str(e)
+        finally:
+            worker_db.close()
+    
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(pause, ["first", "second"]))
+    
+    assert sorted(results) == ["Cannot pause session with status: paused", "ok"]
+    db.expire_all()
+    assert db.get(SessionModel, session_id).pause_count == 1
+    assert db.query(Interruption).count() == 1
+
+def test_resume_abandoned_session(db):
+    """Resuming an abandoned session reopens it and clears its end time"""
+    session = _active_session(db)
+    SessionService.pause_session(db, session.id, "lunch")
+    abandoned = SessionService.complete_session(db, session.id)
+    assert abandoned.status == "abandoned"
+    
+    resumed = SessionService.resume_session(db, session.id)
+    assert resumed.status == "active"
+    assert resumed.end_time is None
+    assert db.query(Interruption).filter(Interruption.resume_time.is_(None)).count() == 0
+
+def test_transition_errors(db):
+    """Missing sessions and wrong states are reported as before"""
+    with pytest.raises(ValueError, match="Session not found"):
+        SessionService.complete_session(db, 12345)
+    
+    session = SessionService.create_session(db, schemas.SessionCreate(title="Idle", scheduled_duration=10))
+    with pytest.raises(ValueError, match="Cannot resume session with status: scheduled"):
+        SessionService.resume_session(db, session.id)
+    with pytest.raises(ValueError, match="Cannot complete session with status: scheduled"):
+        SessionService.complete_session(db, session.id)